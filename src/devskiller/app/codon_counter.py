@@ -0,0 +1,153 @@
+"""
+Vectorized codon counting with NumPy.
+
+Every base has a 2-bit code, so each codon has an index from 0 to 63,
+`16 * first + 4 * second + third`, and `np.bincount` counts all of them at once.
+The three bytes of each codon are read as one integer straight from the buffer and
+a lookup table turns it into the codon index. Codons with other bytes than upper
+case A, C, G and T get 64 instead, they're not counted, just like codons missing
+from `codon.tsv`.
+
+`CodonHistogram` also records the position of the first occurrence of every codon.
+`CodonCounter` uses it to order the report by the first occurrence of each amino
+acid, exactly like the dict built codon by codon in
+`DNAAnalyser.get_amino_acids_report`. Histograms of consecutive parts of a sequence
+can be merged with `+=`.
+
+Example:
+
+```python
+counter = CodonCounter({"AAA": "Lysine", "GGG": "Glycine"})
+histogram = CodonHistogram()
+histogram.add(np.frombuffer(b"AAAGGGAAA", dtype=np.uint8))
+counter.report(histogram)  # {"Lysine": 2, "Glycine": 1}
+```
+"""
+
+import functools
+import typing
+
+import numpy as np
+
+BASES = "ACGT"
+CODONS = tuple(a + b + c for a in BASES for b in BASES for c in BASES)
+
+# Codons counted per `np.bincount` call, it keeps the temporary arrays at a few MB.
+BLOCK_CODONS = 1 << 20
+
+_INVALID = 64
+_NOT_SEEN = np.iinfo(np.int64).max
+
+
+def _codon_key(codon: bytes) -> int:
+    return codon[0] | codon[1] << 8 | codon[2] << 16
+
+
+@functools.lru_cache(maxsize=None)
+def _codon_table() -> np.ndarray:
+    # Indexed by the 3 bytes of a codon read as a little endian integer, a single
+    # lookup validates the bases and combines their 2-bit codes. Only the entries of
+    # the 64 valid codons are ever touched on clean input, so it stays in cache.
+    # Built on first use, it takes 16 MiB that short sequences never need.
+    table = np.full(1 << 24, _INVALID, dtype=np.uint8)
+    for index, codon in enumerate(CODONS):
+        table[_codon_key(codon.encode("ascii"))] = index
+    return table
+
+
+def codon_indices(bases: np.ndarray) -> np.ndarray:
+    """
+    Returns the index of every codon of `bases`, a contiguous uint8 array whose
+    length is a multiple of 3. Codons with other bytes than A, C, G and T get 64.
+    """
+    count = len(bases) // 3
+    keys = np.empty(count, dtype=np.uint32)
+    if count > 1:
+        # Reads 4 bytes at every codon but the last, the 4th byte is the first base
+        # of the next codon and is masked out.
+        words = np.ndarray((count - 1,), dtype="<u4", buffer=bases, strides=(3,))
+        np.bitwise_and(words, 0xFFFFFF, out=keys[:-1])
+    if count:
+        keys[-1] = _codon_key(bases[-3:].tobytes())
+    return np.take(_codon_table(), keys)
+
+
+class CodonHistogram:
+    """Counts of the 64 codons and the position of the first occurrence of each."""
+
+    def __init__(self) -> None:
+        self.counts = np.zeros(len(CODONS), dtype=np.int64)
+        self.first = np.full(len(CODONS), _NOT_SEEN, dtype=np.int64)
+        # Codons added so far, including the invalid ones.
+        self.codons = 0
+
+    def add(self, bases: np.ndarray) -> None:
+        """
+        Counts the codons of `bases`, which continue the bases added before. The
+        length of `bases` must be a multiple of 3.
+        """
+        for start in range(0, len(bases), BLOCK_CODONS * 3):
+            self._add_indices(codon_indices(bases[start : start + BLOCK_CODONS * 3]))
+
+    def __iadd__(self, other: "CodonHistogram") -> "CodonHistogram":
+        """Merges the histogram of the codons that follow the ones of this histogram."""
+        self.first = np.where(
+            self.first == _NOT_SEEN,
+            np.where(other.first == _NOT_SEEN, _NOT_SEEN, other.first + self.codons),
+            self.first,
+        )
+        self.counts += other.counts
+        self.codons += other.codons
+        return self
+
+    def _add_indices(self, indices: np.ndarray) -> None:
+        counts = np.bincount(indices, minlength=len(CODONS))[: len(CODONS)]
+        new = set(np.flatnonzero((counts > 0) & (self.first == _NOT_SEEN)).tolist())
+        # Codons almost always show up early, so look for them in growing windows
+        # instead of scanning the whole block once per codon.
+        start, size = 0, 4096
+        while new:
+            window = indices[start : start + size]
+            values, positions = np.unique(window, return_index=True)
+            for index, position in zip(values.tolist(), positions.tolist()):
+                if index in new:
+                    self.first[index] = self.codons + start + position
+                    new.discard(index)
+            start, size = start + size, size * 2
+        self.counts += counts
+        self.codons += len(indices)
+
+
+class CodonCounter:
+    """Turns codon histograms into amino acid reports, for one codon mapping."""
+
+    def __init__(self, mapping: typing.Mapping[str, str]) -> None:
+        """Raises `ValueError` if the mapping has codons made of other letters than ACGT."""
+        indices = {codon: index for index, codon in enumerate(CODONS)}
+        self._amino_acids: typing.List[typing.Optional[str]] = [None] * len(CODONS)
+        for codon, amino_acid in mapping.items():
+            if codon not in indices:
+                raise ValueError(f"Codon {codon!r} can't be counted with NumPy")
+            self._amino_acids[indices[codon]] = amino_acid or None
+
+    def count(self, bases: np.ndarray) -> typing.Dict[str, int]:
+        """Returns the amino acid report of `bases`, whose length is a multiple of 3."""
+        histogram = CodonHistogram()
+        histogram.add(bases)
+        return self.report(histogram)
+
+    def report(self, histogram: CodonHistogram) -> typing.Dict[str, int]:
+        """Returns the amino acids of `histogram`, in the order they first occurred."""
+        counts: typing.Dict[str, int] = {}
+        first: typing.Dict[str, int] = {}
+        for index in np.flatnonzero(histogram.counts).tolist():
+            amino_acid = self._amino_acids[index]
+            if amino_acid is None:
+                continue
+            counts[amino_acid] = counts.get(amino_acid, 0) + int(histogram.counts[index])
+            position = int(histogram.first[index])
+            first[amino_acid] = min(first.get(amino_acid, position), position)
+        return {
+            amino_acid: counts[amino_acid]
+            for amino_acid in sorted(first, key=first.get)
+        }
@@ -1,36 +1,242 @@
+import mmap
+import os
+import threading
 import typing
 
+import numpy as np
+
+from app import fasta
+from app.codon_counter import CodonCounter, CodonHistogram
+from app.parallel_counting import count_codons_parallel
+
+TRIM_WARNING = "Warning: The dna_sequence length is not a multiple of 3!"
+
+
+class _CodonMapping(typing.NamedTuple):
+    mtime_ns: int
+    size: int
+    mapping: dict
+    # None if the mapping has codons the NumPy engine can't count.
+    counter: typing.Optional[CodonCounter]
+
 
 class DNAAnalyser:
     REPORT_MAPPING_FILENAME = "codon.tsv"
+    # Shorter sequences are counted in plain Python, NumPy doesn't pay off for them.
+    VECTORIZED_MIN_LENGTH = 3_000
+    # Bytes read at a time by `report_from_file`, which bounds its memory use.
+    READ_CHUNK_SIZE = 1 << 20
+    # Bytes of a mapped file scanned at a time by `report_from_mapped_file`.
+    MAPPED_WINDOW_SIZE = 1 << 20
+
+    # Parsed mappings shared by all instances, keyed by the absolute path of the
+    # file and stored with the (mtime, size) they were read at.
+    _mapping_cache: typing.Dict[str, _CodonMapping] = {}
+    _mapping_lock = threading.Lock()
+
+    def __init__(self, workers: int = 1) -> None:
+        """
+        `workers` is the number of processes `get_amino_acids_report` counts the codons
+        of long sequences with.
+        """
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.workers = workers
+
+    @classmethod
+    def reload(cls, path: typing.Optional[str] = None) -> dict:
+        """Re-reads the codon mapping file, even if it didn't change, and returns the mapping."""
+        path = os.path.abspath(path or cls.REPORT_MAPPING_FILENAME)
+        with cls._mapping_lock:
+            return cls._load_codon_mapping(path, os.stat(path)).mapping
 
     def _read_codon_mapping(self) -> dict:
-        """Reads the codon mapping file and returns a dictionary with codons as keys and amino acids as values."""
+        """
+        Returns a dictionary with codons as keys and amino acids as values, reading the
+        codon mapping file only if it changed since it was last read.
+        """
+        return self._cached_codon_mapping().mapping
+
+    def _cached_codon_mapping(self) -> _CodonMapping:
+        path = os.path.abspath(self.REPORT_MAPPING_FILENAME)
+        stat = os.stat(path)
+        cached = self._mapping_cache.get(path)
+        if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            return cached
+
+        with self._mapping_lock:
+            cached = self._mapping_cache.get(path)
+            if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+                return cached
+            return self._load_codon_mapping(path, stat)
+
+    @classmethod
+    def _load_codon_mapping(cls, path: str, stat: os.stat_result) -> _CodonMapping:
         mapping = {}
-        with open(self.REPORT_MAPPING_FILENAME, "r") as file:
+        with open(path, "r") as file:
             for line in file:
                 codon, amino_acid = line.strip().split()
                 mapping[codon] = amino_acid
-        return mapping
+        try:
+            counter: typing.Optional[CodonCounter] = CodonCounter(mapping)
+        except ValueError:
+            counter = None
+        cached = cls._mapping_cache[path] = _CodonMapping(
+            stat.st_mtime_ns, stat.st_size, mapping, counter
+        )
+        return cached
 
     def get_amino_acids_report(self, dna_sequence: str) -> typing.Dict[str, int]:
         """
         Returns a dictionary with amino acids as keys and their count as values.
         """
         report = {}
-        mapping = self._read_codon_mapping()
+        cached = self._cached_codon_mapping()
+        mapping = cached.mapping
 
         # check if the dna sequence's length is a multiple of 3
-        if len(dna_sequence) % 3 != 0:
-            print("Warning: The dna_sequence length is not a multiple of 3!")
+        remainder = len(dna_sequence) % 3
+        if remainder != 0:
+            print(TRIM_WARNING)
+
+        vectorized = len(dna_sequence) >= self.VECTORIZED_MIN_LENGTH
+        if cached.counter is not None and vectorized:
+            try:
+                bases = np.frombuffer(dna_sequence.encode("ascii"), dtype=np.uint8)
+            except UnicodeEncodeError:
+                pass
+            else:
+                bases = bases[: len(bases) - remainder]
+                if self.workers > 1:
+                    histogram = count_codons_parallel(bases, self.workers)
+                    return cached.counter.report(histogram)
+                return cached.counter.count(bases)
+
+        if remainder != 0:
             dna_sequence = dna_sequence[
-                : -(len(dna_sequence) % 3)
+                :-remainder
             ]  # trim the sequence to make it a multiple of 3
 
+        self._count_codons(mapping, dna_sequence, report)
+        return report
+
+    def report_from_file(self, path: str) -> typing.Dict[str, int]:
+        """
+        Returns the amino acids report of a plain text or FASTA file, which is read in
+        chunks of `READ_CHUNK_SIZE` bytes. Line breaks and headers are skipped and each
+        record is read from its first base, trailing bases are trimmed like in
+        `get_amino_acids_report`.
+        """
+        report: typing.Dict[str, int] = {}
+        cached = self._cached_codon_mapping()
+        histogram = CodonHistogram()
+
+        # Bases of an incomplete codon, carried over to the next chunk.
+        pending = b""
+        with open(path, "rb") as file:
+            for bases in fasta.read_bases(file, self.READ_CHUNK_SIZE):
+                if bases is None:
+                    if pending:
+                        print(TRIM_WARNING)
+                        pending = b""
+                    continue
+
+                bases = pending + bases
+                end = len(bases) - len(bases) % 3
+                pending = bases[end:]
+                bases = np.frombuffer(bases, dtype=np.uint8, count=end)
+                self._count_bases(cached, bases, histogram, report)
+
+        if cached.counter is not None:
+            return cached.counter.report(histogram)
+        return report
+
+    def report_from_mapped_file(self, path: str) -> typing.Dict[str, int]:
+        """
+        Returns the same report as `report_from_file`, counting the codons straight
+        from a memory mapping of the file, so files larger than the memory can be read.
+
+        The file is read in windows of `MAPPED_WINDOW_SIZE` bytes. Only windows
+        without line breaks are counted in place; the others, which is every window
+        of a FASTA file wrapped into lines, are compacted into a copy without the
+        line breaks first. The copies are at most one window, so memory use stays
+        bounded, but the bases of wrapped files are copied once on the way.
+        """
+        report: typing.Dict[str, int] = {}
+        cached = self._cached_codon_mapping()
+        histogram = CodonHistogram()
+        if os.path.getsize(path) == 0:
+            return report
+
+        with open(path, "rb") as file, mmap.mmap(
+            file.fileno(), 0, access=mmap.ACCESS_READ
+        ) as mapped:
+            if hasattr(mapped, "madvise"):
+                mapped.madvise(mmap.MADV_SEQUENTIAL)
+            buffer = np.frombuffer(mapped, dtype=np.uint8)
+            try:
+                for start, end in fasta.record_spans(mapped):
+                    self._count_mapped_record(
+                        buffer[start:end], cached, histogram, report
+                    )
+            finally:
+                # The mapping can't be closed while NumPy still holds a view of it.
+                del buffer
+
+        if cached.counter is not None:
+            return cached.counter.report(histogram)
+        return report
+
+    def _count_mapped_record(
+        self,
+        record: np.ndarray,
+        cached: _CodonMapping,
+        histogram: CodonHistogram,
+        report: typing.Dict[str, int],
+    ) -> None:
+        # Bases of an incomplete codon, carried over to the next window.
+        pending = np.empty(0, dtype=np.uint8)
+        for start in range(0, len(record), self.MAPPED_WINDOW_SIZE):
+            window = record[start : start + self.MAPPED_WINDOW_SIZE]
+            keep = window != ord("\n")
+            keep &= window != ord("\r")
+            # Windows without line breaks are counted in place, the others are
+            # compacted into a copy without them.
+            bases = window if keep.all() else window[keep]
+
+            if len(pending):
+                missing = 3 - len(pending)
+                pending = np.concatenate([pending, bases[:missing]])
+                bases = bases[missing:]
+                if len(pending) < 3:
+                    continue
+                self._count_bases(cached, pending, histogram, report)
+
+            end = len(bases) - len(bases) % 3
+            self._count_bases(cached, bases[:end], histogram, report)
+            pending = bases[end:].copy()
+
+        if len(pending):
+            print(TRIM_WARNING)
+
+    def _count_bases(
+        self,
+        cached: _CodonMapping,
+        bases: np.ndarray,
+        histogram: CodonHistogram,
+        report: typing.Dict[str, int],
+    ) -> None:
+        if cached.counter is not None:
+            histogram.add(bases)
+        else:
+            self._count_codons(cached.mapping, bases.tobytes().decode("latin-1"), report)
+
+    @staticmethod
+    def _count_codons(
+        mapping: dict, dna_sequence: str, report: typing.Dict[str, int]
+    ) -> None:
         for i in range(0, len(dna_sequence), 3):
             codon = dna_sequence[i : i + 3]
             amino_acid = mapping.get(codon)
             if amino_acid:
                 report[amino_acid] = report.get(amino_acid, 0) + 1
-
-        return report
@@ -0,0 +1,79 @@
+"""
+Chunked reading of plain text and FASTA files.
+
+`read_bases` reads a file `chunk_size` bytes at a time and yields its bases without
+line breaks or FASTA headers, so a whole chromosome never has to fit in memory. A
+header is a line starting with `>`, it ends the current record and starts a new one.
+Every record, including the bases before the first header of a plain text file, is
+followed by a None, so readers can reset their reading frame.
+
+`record_spans` finds the same records in a memory mapped file, without reading the
+bases, for callers that mask the line breaks themselves.
+
+Example:
+
+```python
+with open("chr1.fa", "rb") as file:
+    for bases in read_bases(file, 1 << 20):
+        if bases is None:
+            ...  # end of a record
+        else:
+            ...  # bytes such as b"ACGTTGCA"
+```
+"""
+
+import mmap
+import typing
+
+_LINE_BREAKS = b"\r\n"
+
+
+def read_bases(
+    file: typing.BinaryIO, chunk_size: int
+) -> typing.Iterator[typing.Optional[bytes]]:
+    """Yields the bases of `file` in chunks of at most `chunk_size`, None after each record."""
+    in_header = False
+    while True:
+        chunk = file.read(chunk_size)
+        if not chunk:
+            break
+
+        # Positions rather than slices, a chunk full of short records isn't copied
+        # once per record.
+        position = 0
+        while position < len(chunk):
+            if in_header:
+                end = chunk.find(b"\n", position)
+                if end < 0:
+                    break
+                in_header = False
+                position = end + 1
+                continue
+
+            start = chunk.find(b">", position)
+            if start < 0:
+                start = len(chunk)
+            if start > position:
+                bases = chunk[position:start].translate(None, _LINE_BREAKS)
+                if bases:
+                    yield bases
+            if start < len(chunk):
+                yield None
+                in_header = True
+                start += 1
+            position = start
+
+    yield None
+
+
+def record_spans(mapped: mmap.mmap) -> typing.Iterator[typing.Tuple[int, int]]:
+    """Yields the start and end offsets of every record of `mapped`, without its header."""
+    position = 0
+    while position < len(mapped):
+        header = mapped.find(b">", position)
+        if header < 0:
+            header = len(mapped)
+        if header > position:
+            yield position, header
+        end = mapped.find(b"\n", header)
+        position = len(mapped) if end < 0 else end + 1
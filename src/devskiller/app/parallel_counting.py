@@ -0,0 +1,88 @@
+"""
+Codon counting is CPU bound and keeps a single core busy. `count_codons_parallel()`
+splits a long sequence into codon-aligned shards and counts them in a
+`ProcessPoolExecutor`.
+
+The bases are copied once into shared memory, which every worker maps in the pool
+initializer, so shards are passed around as offsets instead of being pickled. Each
+worker sends back the `CodonHistogram` of its shard, a few hundred bytes, and the
+histograms are merged in input order. The first occurrences, and so the order of
+the report, are therefore the same as when counting serially.
+
+Example:
+
+```python
+histogram = count_codons_parallel(np.frombuffer(b"AAAGGG...", dtype=np.uint8), 8)
+```
+"""
+
+import concurrent.futures
+import typing
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from app.codon_counter import CodonHistogram
+
+# Counting a million bases takes a few milliseconds, less than starting a worker
+# process, so each worker gets at least that many and short sequences are counted
+# in the calling process.
+MIN_SHARD_SIZE = 1_000_000
+SHARDS_PER_WORKER = 4
+
+# The shared block holding the bases, mapped once per worker process.
+_worker_memory: typing.Optional[shared_memory.SharedMemory] = None
+
+
+def _init_worker(name: str) -> None:
+    global _worker_memory
+    try:
+        _worker_memory = shared_memory.SharedMemory(name, track=False)
+    except TypeError:
+        # `track` is new in Python 3.13. Older versions register the block with the
+        # resource tracker on attach too; pool workers inherit the tracker of the
+        # process that created the block, so it's still unlinked only once.
+        _worker_memory = shared_memory.SharedMemory(name)
+
+
+def _count_shard(start: int, end: int) -> CodonHistogram:
+    bases = np.frombuffer(
+        _worker_memory.buf, dtype=np.uint8, count=end - start, offset=start
+    )
+    histogram = CodonHistogram()
+    histogram.add(bases)
+    return histogram
+
+
+def _shards(length: int, count: int) -> typing.Tuple[typing.List[int], typing.List[int]]:
+    # Rounded up to whole codons, so that no codon is split between two shards.
+    size = -(-length // count // 3) * 3 or 3
+    starts = list(range(0, length, size))
+    return starts, [min(start + size, length) for start in starts]
+
+
+def count_codons_parallel(bases: np.ndarray, workers: int) -> CodonHistogram:
+    """
+    Returns the histogram of `bases`, a uint8 array whose length is a multiple of 3,
+    counted by up to `workers` processes.
+    """
+    workers = min(workers, len(bases) // MIN_SHARD_SIZE)
+    histogram = CodonHistogram()
+    if workers <= 1:
+        histogram.add(bases)
+        return histogram
+
+    memory = shared_memory.SharedMemory(create=True, size=len(bases))
+    try:
+        memory.buf[: len(bases)] = bases
+        with concurrent.futures.ProcessPoolExecutor(
+            workers, initializer=_init_worker, initargs=(memory.name,)
+        ) as pool:
+            for shard in pool.map(
+                _count_shard, *_shards(len(bases), workers * SHARDS_PER_WORKER)
+            ):
+                histogram += shard
+    finally:
+        memory.close()
+        memory.unlink()
+    return histogram
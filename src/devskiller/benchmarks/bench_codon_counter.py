@@ -0,0 +1,41 @@
+"""
+`get_amino_acids_report` on a random sequence, 100 MB by default, with the NumPy
+codon counter against the plain Python loop it replaces for long sequences.
+
+Run from the `devskiller` directory, optionally with the size in MB:
+
+    python -m benchmarks.bench_codon_counter [size_mb]
+"""
+
+import random
+import sys
+import time
+from unittest import mock
+
+from app.dna_analyser import DNAAnalyser
+
+
+def run(size_mb: int):
+    random.seed(42)
+    sequence = "".join(random.choices("ACGT", k=size_mb * 1_000_000))
+    analyser = DNAAnalyser()
+
+    started = time.perf_counter()
+    vectorized = analyser.get_amino_acids_report(sequence)
+    numpy_elapsed = time.perf_counter() - started
+
+    with mock.patch.object(DNAAnalyser, "VECTORIZED_MIN_LENGTH", len(sequence) + 1):
+        started = time.perf_counter()
+        expected = analyser.get_amino_acids_report(sequence)
+        python_elapsed = time.perf_counter() - started
+
+    assert list(vectorized.items()) == list(expected.items())
+    print(f"Python  {python_elapsed:7.3f}s  {size_mb / python_elapsed:8.1f} MB/s")
+    print(
+        f"NumPy   {numpy_elapsed:7.3f}s  {size_mb / numpy_elapsed:8.1f} MB/s"
+        f"  ({python_elapsed / numpy_elapsed:.0f}x)"
+    )
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100)
@@ -0,0 +1,60 @@
+"""
+`report_from_mapped_file` against the streaming `report_from_file` on a FASTA file
+of random bases with 60 or 80 columns, 500 MB by default. Each reader runs twice,
+the first run warms the page cache.
+
+Run from the `devskiller` directory, optionally with the size in MB and the width:
+
+    python -m benchmarks.bench_mapped_file [size_mb] [line_width]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+from app.dna_analyser import DNAAnalyser
+
+LINE_COUNT = 10_000
+
+
+def _write_fasta(path: str, size_mb: int, line_width: int) -> None:
+    random.seed(42)
+    lines = [
+        "".join(random.choices("ACGT", k=line_width)) + "\n" for _ in range(LINE_COUNT)
+    ]
+    block = "".join(lines).encode("ascii")
+    with open(path, "wb") as file:
+        file.write(b">chr1 random\n")
+        for _ in range(size_mb * 1_000_000 // len(block) + 1):
+            file.write(block)
+
+
+def run(size_mb: int, line_width: int):
+    analyser = DNAAnalyser()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bench.fa")
+        _write_fasta(path, size_mb, line_width)
+        size_mb = os.path.getsize(path) / 1_000_000
+
+        reports = []
+        for name, report in (
+            ("report_from_file", analyser.report_from_file),
+            ("report_from_mapped_file", analyser.report_from_mapped_file),
+        ):
+            for _ in range(2):
+                started = time.perf_counter()
+                result = report(path)
+                elapsed = time.perf_counter() - started
+            reports.append(list(result.items()))
+            print(f"{name:<24} {elapsed:7.3f}s  {size_mb / elapsed:8.1f} MB/s")
+
+        assert reports[0] == reports[1]
+
+
+if __name__ == "__main__":
+    run(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 500,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 60,
+    )
@@ -0,0 +1,48 @@
+"""
+Scaling of `get_amino_acids_report` with the number of worker processes, from 1 to
+the number of cores by default, on a random sequence of 500 MB. The speedup is
+bounded by the number of cores and by copying the sequence into shared memory, which
+happens in the calling process.
+
+Run from the `devskiller` directory, optionally with the largest worker count and
+the size in MB:
+
+    python -m benchmarks.bench_parallel_report [max_workers] [size_mb]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+from app.dna_analyser import DNAAnalyser
+
+
+def run(max_workers: int, size_mb: int):
+    bases = np.frombuffer(b"ACGT", dtype=np.uint8)
+    sequence = (
+        bases[np.random.default_rng(42).integers(0, 4, size_mb * 1_000_000)]
+        .tobytes()
+        .decode("ascii")
+    )
+
+    baseline = None
+    expected = None
+    for workers in range(1, max_workers + 1):
+        analyser = DNAAnalyser(workers=workers)
+        started = time.perf_counter()
+        report = analyser.get_amino_acids_report(sequence)
+        elapsed = time.perf_counter() - started
+
+        if baseline is None:
+            baseline, expected = elapsed, list(report.items())
+        assert list(report.items()) == expected
+        print(f"{workers:>2} workers  {elapsed:6.2f}s  {baseline / elapsed:5.2f}x")
+
+
+if __name__ == "__main__":
+    run(
+        int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count() or 1,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 500,
+    )
@@ -0,0 +1,110 @@
+import random
+import subprocess
+import sys
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from app.dna_analyser import DNAAnalyser
+
+
+class TestCodonCounter(unittest.TestCase):
+    """Vectorized codon counting testing class"""
+
+    def test_matches_python_report(self):
+        """Test the report is identical, in order too, to the Python loop"""
+        random.seed(7)
+        for length in (3_000, 3_001, 3_002, 100_000):
+            sequence = "".join(random.choices("ACGTNacgt", k=length))
+            with mock.patch("builtins.print"):
+                result = self._sut.get_amino_acids_report(sequence)
+
+            assert list(result.items()) == list(self._python_report(sequence).items())
+
+    def test_first_occurrence_order(self):
+        """Test amino acids are reported in the order they first occurred"""
+        sequence = "GGG" * 2_000 + "TTT" + "AAA" * 2_000 + "TTC"
+
+        result = self._sut.get_amino_acids_report(sequence)
+
+        assert list(result.items()) == [
+            ("Glycine", 2_000),
+            ("Phenylalanine", 2),
+            ("Lysine", 2_000),
+        ]
+
+    def test_trim_warning(self):
+        """Test the trailing bases are trimmed with a warning"""
+        with mock.patch("builtins.print") as printed:
+            result = self._sut.get_amino_acids_report("AAA" * 1_000 + "GG")
+
+        printed.assert_called_once_with(
+            "Warning: The dna_sequence length is not a multiple of 3!"
+        )
+        assert result == {"Lysine": 1_000}
+
+    def test_blocks(self):
+        """Test codons are counted the same across blocks"""
+        from app import codon_counter
+
+        random.seed(11)
+        sequence = "".join(random.choices("ACGTN", k=30_000))
+
+        with mock.patch.object(codon_counter, "BLOCK_CODONS", 1_000):
+            result = self._sut.get_amino_acids_report(sequence)
+
+        assert list(result.items()) == list(self._python_report(sequence).items())
+
+    def test_merge_histograms(self):
+        """Test merged histograms match the histogram of the whole sequence"""
+        from app.codon_counter import CodonCounter, CodonHistogram
+
+        random.seed(13)
+        bases = np.frombuffer(
+            "".join(random.choices("ACGTN", k=9_000)).encode(), dtype=np.uint8
+        )
+        counter = CodonCounter(self._sut._read_codon_mapping())
+        merged = CodonHistogram()
+        for start in range(0, len(bases), 3_000):
+            part = CodonHistogram()
+            part.add(bases[start : start + 3_000])
+            merged += part
+
+        assert list(counter.report(merged).items()) == list(
+            counter.count(bases).items()
+        )
+
+    def test_non_ascii(self):
+        """Test sequences with non ASCII characters fall back to the Python loop"""
+        sequence = "AAA" * 1_000 + "ĄAA"
+
+        assert self._sut.get_amino_acids_report(sequence) == {"Lysine": 1_000}
+
+    def test_unsupported_mapping(self):
+        """Test the counter refuses codons made of other letters than ACGT"""
+        from app.codon_counter import CodonCounter
+
+        with self.assertRaises(ValueError):
+            CodonCounter({"AAN": "Unknown"})
+
+    def test_lookup_table_built_on_first_use(self):
+        """Test short sequences never build the lookup table"""
+        script = (
+            "from app import codon_counter\n"
+            "from app.dna_analyser import DNAAnalyser\n"
+            "DNAAnalyser().get_amino_acids_report('AAACCC')\n"
+            "assert codon_counter._codon_table.cache_info().currsize == 0\n"
+        )
+
+        subprocess.run([sys.executable, "-c", script], check=True)
+
+    def _python_report(self, sequence):
+        with mock.patch("builtins.print"):
+            with mock.patch.object(
+                DNAAnalyser, "VECTORIZED_MIN_LENGTH", len(sequence) + 1
+            ):
+                return self._sut.get_amino_acids_report(sequence)
+
+    def setUp(self):
+        self._sut = DNAAnalyser()
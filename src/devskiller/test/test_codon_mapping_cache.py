@@ -0,0 +1,93 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from app.dna_analyser import DNAAnalyser
+
+
+class TestCodonMappingCache(unittest.TestCase):
+    """Codon mapping cache testing class"""
+
+    def test_reads_file_once(self):
+        """Test the mapping is parsed once while the file doesn't change"""
+        with mock.patch("builtins.open", wraps=open) as opened:
+            for _ in range(3):
+                result = self._sut.get_amino_acids_report("AAACCC")
+
+        assert result == {"Lysine": 1, "Proline": 1}
+        assert opened.call_count == 1
+
+    def test_shared_between_instances(self):
+        """Test the cache is shared by all instances"""
+        self._sut.get_amino_acids_report("AAA")
+
+        with mock.patch("builtins.open", wraps=open) as opened:
+            result = self._Analyser().get_amino_acids_report("AAA")
+
+        assert result == {"Lysine": 1}
+        assert opened.call_count == 0
+
+    def test_reloads_changed_file(self):
+        """Test the mapping is read again when the file changes"""
+        assert self._sut.get_amino_acids_report("AAA") == {"Lysine": 1}
+
+        with open(self._path, "a") as file:
+            file.write("XYZ\tUnknown\n")
+
+        assert self._sut.get_amino_acids_report("AAAXYZ") == {"Lysine": 1, "Unknown": 1}
+
+    def test_reloads_same_size_file(self):
+        """Test a rewrite of the same size is noticed through the modification time"""
+        self._sut.get_amino_acids_report("AAA")
+        with open(self._path) as file:
+            content = file.read()
+        with open(self._path, "w") as file:
+            file.write(content.replace("AAA\tLysine", "AAA\tLysinf"))
+        stat = os.stat(self._path)
+        os.utime(self._path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+
+        assert self._sut.get_amino_acids_report("AAA") == {"Lysinf": 1}
+
+    def test_reload(self):
+        """Test an explicit reload re-reads the file"""
+        self._sut.get_amino_acids_report("AAA")
+
+        with mock.patch("builtins.open", wraps=open) as opened:
+            mapping = self._Analyser.reload()
+
+        assert mapping["AAA"] == "Lysine"
+        assert opened.call_count == 1
+
+    def test_threads(self):
+        """Test concurrent reports share one read of the file"""
+        results = []
+        barrier = threading.Barrier(8)
+
+        def report():
+            barrier.wait()
+            results.append(self._Analyser().get_amino_acids_report("AAACCC"))
+
+        with mock.patch("builtins.open", wraps=open) as opened:
+            threads = [threading.Thread(target=report) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert results == [{"Lysine": 1, "Proline": 1}] * 8
+        assert opened.call_count == 1
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self._path = os.path.join(directory, "codon.tsv")
+        shutil.copyfile(DNAAnalyser.REPORT_MAPPING_FILENAME, self._path)
+
+        class Analyser(DNAAnalyser):
+            REPORT_MAPPING_FILENAME = self._path
+
+        self._Analyser = Analyser
+        self._sut = Analyser()
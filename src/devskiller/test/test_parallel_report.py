@@ -0,0 +1,75 @@
+import random
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from app.dna_analyser import TRIM_WARNING, DNAAnalyser
+
+
+class TestParallelReport(unittest.TestCase):
+    """Multi-process report testing class"""
+
+    def test_matches_serial_report(self):
+        """Test the report is identical, in order too, to the serial report"""
+        random.seed(23)
+        for length in (30_000, 30_001, 30_002):
+            sequence = "".join(random.choices("ACGTN", k=length))
+
+            with mock.patch("builtins.print") as printed:
+                result = self._sut.get_amino_acids_report(sequence)
+                expected = DNAAnalyser().get_amino_acids_report(sequence)
+
+            assert list(result.items()) == list(expected.items())
+            assert printed.call_args_list == [mock.call(TRIM_WARNING)] * (
+                2 if length % 3 else 0
+            )
+
+    def test_first_occurrence_in_later_shard(self):
+        """Test amino acids first seen in a later shard keep their place"""
+        sequence = "GGG" * 5_000 + "TTT" + "AAA" * 5_000
+
+        result = self._sut.get_amino_acids_report(sequence)
+
+        assert list(result.items()) == [
+            ("Glycine", 5_000),
+            ("Phenylalanine", 1),
+            ("Lysine", 5_000),
+        ]
+
+    def test_codon_aligned_shards(self):
+        """Test shards never split a codon"""
+        from app.parallel_counting import _shards
+
+        starts, ends = _shards(30_003, 12)
+
+        assert starts[0] == 0 and ends[-1] == 30_003
+        assert starts[1:] == ends[:-1]
+        assert all(start % 3 == 0 for start in starts)
+
+    def test_short_sequence_in_process(self):
+        """Test sequences too short to share between workers are counted in process"""
+        from app import parallel_counting
+
+        bases = np.frombuffer(b"AAA" * 10, dtype=np.uint8)
+        with mock.patch.object(parallel_counting, "MIN_SHARD_SIZE", 100):
+            with mock.patch.object(
+                parallel_counting.concurrent.futures, "ProcessPoolExecutor"
+            ) as pool:
+                histogram = parallel_counting.count_codons_parallel(bases, 4)
+
+        pool.assert_not_called()
+        assert histogram.counts.sum() == 10
+
+    def test_invalid_workers(self):
+        """Test at least one worker is required"""
+        with self.assertRaises(ValueError):
+            DNAAnalyser(workers=0)
+
+    def setUp(self):
+        from app import parallel_counting
+
+        patcher = mock.patch.object(parallel_counting, "MIN_SHARD_SIZE", 1_000)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self._sut = DNAAnalyser(workers=3)
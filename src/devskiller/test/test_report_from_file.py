@@ -0,0 +1,91 @@
+import os
+import random
+import tempfile
+import tracemalloc
+import unittest
+from unittest import mock
+
+from app.dna_analyser import TRIM_WARNING, DNAAnalyser
+
+
+class TestReportFromFile(unittest.TestCase):
+    """Streaming file report testing class"""
+
+    def test_plain_text(self):
+        """Test a plain text file gives the same report as the sequence"""
+        random.seed(3)
+        sequence = "".join(random.choices("ACGTN", k=10_000))
+        path = self._write(sequence + "\n")
+
+        with mock.patch("builtins.print"):
+            expected = self._sut.get_amino_acids_report(sequence)
+            result = self._sut.report_from_file(path)
+
+        assert list(result.items()) == list(expected.items())
+
+    def test_codons_across_chunks(self):
+        """Test codons and line breaks split between chunks are carried over"""
+        random.seed(5)
+        sequence = "".join(random.choices("ACGT", k=3_000))
+        lines = [sequence[i : i + 61] for i in range(0, len(sequence), 61)]
+        path = self._write("\r\n".join(lines) + "\r\n")
+
+        with mock.patch.object(DNAAnalyser, "READ_CHUNK_SIZE", 7):
+            result = self._sut.report_from_file(path)
+
+        assert list(result.items()) == list(
+            self._sut.get_amino_acids_report(sequence).items()
+        )
+
+    def test_fasta_records(self):
+        """Test headers are skipped and each record starts a new reading frame"""
+        path = self._write(
+            ">first record\nAAAG\nGGAA\n>second record\nTTTAAA\n>third\nCC\n"
+        )
+
+        with mock.patch("builtins.print") as printed:
+            with mock.patch.object(DNAAnalyser, "READ_CHUNK_SIZE", 5):
+                result = self._sut.report_from_file(path)
+
+        assert list(result.items()) == [
+            ("Lysine", 2),
+            ("Glycine", 1),
+            ("Phenylalanine", 1),
+        ]
+        assert printed.call_args_list == [mock.call(TRIM_WARNING)] * 2
+
+    def test_fallback_mapping(self):
+        """Test mappings the NumPy engine can't count are counted in Python"""
+
+        class Analyser(DNAAnalyser):
+            REPORT_MAPPING_FILENAME = self._write("AAA\tLysine\nNNN\tUnknown\n")
+
+        path = self._write(">record\nAAANN\nNAAA\n")
+
+        assert Analyser().report_from_file(path) == {"Lysine": 2, "Unknown": 1}
+
+    def test_memory(self):
+        """Test peak memory is bounded by the chunk size, not the file size"""
+        random.seed(9)
+        line = "".join(random.choices("ACGT", k=80)) + "\n"
+        path = self._write(">chr\n" + line * 40_000)
+        self._sut.report_from_file(path)
+
+        tracemalloc.start()
+        self.addCleanup(tracemalloc.stop)
+        with mock.patch.object(DNAAnalyser, "READ_CHUNK_SIZE", 1 << 16):
+            self._sut.report_from_file(path)
+        _, peak = tracemalloc.get_traced_memory()
+
+        assert os.path.getsize(path) > 3_000_000
+        assert peak < 1_000_000
+
+    def _write(self, content):
+        file = tempfile.NamedTemporaryFile("w", suffix=".fa", delete=False)
+        self.addCleanup(os.remove, file.name)
+        with file:
+            file.write(content)
+        return file.name
+
+    def setUp(self):
+        self._sut = DNAAnalyser()
@@ -0,0 +1,83 @@
+import os
+import random
+import tempfile
+import unittest
+from unittest import mock
+
+from app.dna_analyser import TRIM_WARNING, DNAAnalyser
+
+
+class TestReportFromMappedFile(unittest.TestCase):
+    """Memory mapped file report testing class"""
+
+    def test_matches_streaming_report(self):
+        """Test the report matches the streaming reader on a FASTA file"""
+        random.seed(17)
+        records = []
+        for number in range(5):
+            sequence = "".join(random.choices("ACGTN", k=random.randrange(1, 5_000)))
+            lines = [sequence[i : i + 80] for i in range(0, len(sequence), 80)]
+            records.append(f">record {number}\n" + "\n".join(lines) + "\n")
+        path = self._write("".join(records))
+
+        with mock.patch("builtins.print"):
+            expected = self._sut.report_from_file(path)
+            with mock.patch.object(DNAAnalyser, "MAPPED_WINDOW_SIZE", 1_000):
+                result = self._sut.report_from_mapped_file(path)
+
+        assert list(result.items()) == list(expected.items())
+
+    def test_codons_across_windows(self):
+        """Test codons split between windows by line breaks are carried over"""
+        random.seed(19)
+        sequence = "".join(random.choices("ACGT", k=3_000))
+        lines = [sequence[i : i + 61] for i in range(0, len(sequence), 61)]
+        path = self._write("\r\n".join(lines))
+
+        for window_size in (1, 2, 7, 64):
+            with mock.patch.object(DNAAnalyser, "MAPPED_WINDOW_SIZE", window_size):
+                result = self._sut.report_from_mapped_file(path)
+
+            assert list(result.items()) == list(
+                self._sut.get_amino_acids_report(sequence).items()
+            )
+
+    def test_fasta_records(self):
+        """Test headers are skipped and each record starts a new reading frame"""
+        path = self._write(
+            ">first record\nAAAG\nGGAA\n>second record\nTTTAAA\n>third\nCC"
+        )
+
+        with mock.patch("builtins.print") as printed:
+            result = self._sut.report_from_mapped_file(path)
+
+        assert list(result.items()) == [
+            ("Lysine", 2),
+            ("Glycine", 1),
+            ("Phenylalanine", 1),
+        ]
+        assert printed.call_args_list == [mock.call(TRIM_WARNING)] * 2
+
+    def test_fallback_mapping(self):
+        """Test mappings the NumPy engine can't count are counted in Python"""
+
+        class Analyser(DNAAnalyser):
+            REPORT_MAPPING_FILENAME = self._write("AAA\tLysine\nNNN\tUnknown\n")
+
+        path = self._write(">record\nAAANN\nNAAA\n")
+
+        assert Analyser().report_from_mapped_file(path) == {"Lysine": 2, "Unknown": 1}
+
+    def test_empty_file(self):
+        """Test an empty file gives an empty report"""
+        assert self._sut.report_from_mapped_file(self._write("")) == {}
+
+    def _write(self, content):
+        file = tempfile.NamedTemporaryFile("w", suffix=".fa", delete=False)
+        self.addCleanup(os.remove, file.name)
+        with file:
+            file.write(content)
+        return file.name
+
+    def setUp(self):
+        self._sut = DNAAnalyser()
@@ -0,0 +1,139 @@
+"""
+In production the rates come from a remote pricing service rather than from the
+static `app.rates.RATES`. A burst of concurrent conversions of the same pair would
+then send a burst of identical requests to that service.
+
+`AsyncExchangeRateService.aquotation()` makes sure there is at most one request in
+flight per currency pair: the first caller starts the fetch, every caller arriving
+while it runs awaits that same fetch. A fetched quotation is cached for `ttl` seconds.
+Failures are not cached, they are raised to everybody waiting for that fetch, and the
+next call tries again. A caller that gets cancelled doesn't cancel the fetch for the
+others.
+
+The remote service is anything implementing `QuotationSource`. `HttpQuotationSource`
+talks to an HTTP endpoint answering `GET /quotation?origin=EUR&target=PLN` with
+`{"rate": "4.5500"}`, using nothing but asyncio streams.
+
+Example:
+
+```python
+service = AsyncExchangeRateService(HttpQuotationSource("pricing.internal", 8080), ttl=30)
+rate = await service.aquotation(Currency.EUR, Currency.PLN)
+converted = await service.aconvert(cash, Currency.PLN)
+```
+"""
+
+import asyncio
+import decimal
+import json
+import time
+import typing
+import urllib.parse
+
+from app.cash import Cash
+from app.currency import Currency
+from app.exceptions import QuotationError
+
+Pair = typing.Tuple[Currency, Currency]
+
+
+class QuotationSource(typing.Protocol):
+    async def fetch_quotation(
+        self, origin: Currency, target: Currency
+    ) -> decimal.Decimal:
+        """Returns how many `target` units one `origin` unit is worth."""
+
+
+class HttpQuotationSource:
+    def __init__(
+        self, host: str, port: int, path: str = "/quotation", timeout: float = 5.0
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.path = path
+        self.timeout = timeout
+
+    async def fetch_quotation(
+        self, origin: Currency, target: Currency
+    ) -> decimal.Decimal:
+        query = urllib.parse.urlencode({"origin": origin.value, "target": target.value})
+        return await asyncio.wait_for(self._get(f"{self.path}?{query}"), self.timeout)
+
+    async def _get(self, target: str) -> decimal.Decimal:
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            writer.write(
+                f"GET {target} HTTP/1.0\r\nHost: {self.host}\r\n\r\n".encode("ascii")
+            )
+            await writer.drain()
+            response = await reader.read()
+        finally:
+            writer.close()
+            await writer.wait_closed()
+
+        head, _, body = response.partition(b"\r\n\r\n")
+        status = head.split(b"\r\n", 1)[0].split()
+        if len(status) < 2 or status[1] != b"200":
+            raise QuotationError(f"Pricing service answered {head[:64]!r} for {target}")
+        try:
+            return decimal.Decimal(json.loads(body)["rate"])
+        except (ValueError, KeyError, TypeError, decimal.InvalidOperation) as error:
+            raise QuotationError(f"Invalid pricing service response {body[:64]!r}") from error
+
+
+class AsyncExchangeRateService:
+    def __init__(
+        self,
+        source: QuotationSource,
+        ttl: float = 60.0,
+        clock: typing.Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.source = source
+        self.ttl = ttl
+        self.fetches = 0
+        self._clock = clock
+        self._cache: typing.Dict[Pair, typing.Tuple[float, decimal.Decimal]] = {}
+        self._in_flight: typing.Dict[Pair, "asyncio.Task[decimal.Decimal]"] = {}
+
+    async def aquotation(self, origin: Currency, target: Currency) -> decimal.Decimal:
+        """Returns the exchange rate for the supplied currency pair."""
+        if origin == target:
+            return decimal.Decimal(1)
+
+        pair = (origin, target)
+        cached = self._cache.get(pair)
+        if cached is not None and cached[0] > self._clock():
+            return cached[1]
+
+        task = self._in_flight.get(pair)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(pair))
+            self._in_flight[pair] = task
+            task.add_done_callback(lambda done: self._forget(pair, done))
+        return await asyncio.shield(task)
+
+    async def aconvert(self, cash: Cash, target_currency: Currency) -> Cash:
+        if target_currency is None or target_currency == cash.currency:
+            return cash
+        rate = await self.aquotation(cash.currency, target_currency)
+        return Cash(cash.amount * rate, target_currency)
+
+    def invalidate(self, origin: Currency, target: Currency) -> None:
+        self._cache.pop((origin, target), None)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def _forget(self, pair: Pair, task: "asyncio.Task[decimal.Decimal]") -> None:
+        self._in_flight.pop(pair, None)
+        if not task.cancelled():
+            # Retrieved here, so a failure nobody awaits anymore isn't logged as lost.
+            task.exception()
+
+    async def _fetch(self, pair: Pair) -> decimal.Decimal:
+        self.fetches += 1
+        rate = await self.source.fetch_quotation(*pair)
+        if not rate:
+            raise QuotationError(f"Invalid rate for {pair[0].name}/{pair[1].name} currency pair")
+        self._cache[pair] = (self._clock() + self.ttl, rate)
+        return rate
@@ -0,0 +1,120 @@
+"""
+Converting tens of millions of amounts with `Cash.to()` is CPU bound `Decimal` work
+that keeps a single core busy. `convert_batch()` splits the input into contiguous
+shards and converts them in a `ProcessPoolExecutor`.
+
+The rate snapshot is taken once, when the batch starts, and handed to every worker
+process by the pool initializer, so it is pickled once per worker instead of once per
+shard, and the whole batch is converted with the same rates even if they are updated
+meanwhile.
+
+Workers only multiply `Decimal`s and send back the products, with the same digits
+`Cash.to()` would compute in either `Cash` representation. Amounts cross the process
+boundary as strings, which pickle much faster than `Decimal` instances. The `Cash`
+instances are built in the calling process, in input order. The results are equal to
+`Cash(amount, origin).to(target)` one by one, including `rate_version`.
+
+Example:
+
+```python
+converted = convert_batch(amounts, currencies, Currency.EUR, workers=8)
+```
+"""
+
+import concurrent.futures
+import decimal
+import itertools
+import os
+import typing
+
+from app.cash import Cash
+from app.currency import Currency
+from app.exchange_rate import RateSnapshot, exchange_rate_service
+
+Amount = typing.Union[str, int, decimal.Decimal]
+Shard = typing.Tuple[typing.Sequence[Amount], typing.Sequence[Currency]]
+
+# Below this many amounts per worker, starting processes costs more than it saves.
+MIN_SHARD_SIZE = 10_000
+SHARDS_PER_WORKER = 4
+
+_QUANTUM = decimal.Decimal("0.0000")
+
+# Set in every worker process by `_init_worker`.
+_worker_snapshot: typing.Optional[RateSnapshot] = None
+
+
+def _init_worker(snapshot: RateSnapshot) -> None:
+    global _worker_snapshot
+    _worker_snapshot = snapshot
+
+
+def _convert_shard(
+    amounts: typing.Sequence[Amount],
+    origins: typing.Sequence[Currency],
+    target_currency: Currency,
+    snapshot: RateSnapshot,
+) -> typing.List[decimal.Decimal]:
+    """Returns the products `Cash.to()` would compute, without building any `Cash`."""
+    rates = {target_currency: None}
+    converted = []
+    for amount, origin in zip(amounts, origins):
+        try:
+            rate = rates[origin]
+        except KeyError:
+            rate = rates[origin] = snapshot.quotation(origin, target_currency)
+        amount = decimal.Decimal(amount)
+        converted.append(amount if rate is None else amount.quantize(_QUANTUM) * rate)
+    return converted
+
+
+def _convert_worker_shard(shard: Shard, target_currency: Currency) -> typing.List[str]:
+    # Decimals pickle an order of magnitude slower than their strings.
+    converted = _convert_shard(*shard, target_currency, _worker_snapshot)
+    return [str(amount) for amount in converted]
+
+
+def _shards(
+    amounts: typing.Sequence[Amount], origins: typing.Sequence[Currency], count: int
+) -> typing.Iterator[Shard]:
+    size = -(-len(amounts) // count)
+    for start in range(0, len(amounts), size):
+        yield amounts[start : start + size], origins[start : start + size]
+
+
+def convert_batch(
+    amounts: typing.Sequence[Amount],
+    origins: typing.Sequence[Currency],
+    target_currency: Currency,
+    workers: typing.Optional[int] = None,
+) -> typing.List[Cash]:
+    """Converts every `Cash(amounts[i], origins[i])` into `target_currency`, in order."""
+    if len(amounts) != len(origins):
+        raise ValueError("amounts and origins must have the same length")
+    amounts = list(amounts)
+    origins = list(origins)
+    workers = min(workers or os.cpu_count() or 1, len(amounts) // MIN_SHARD_SIZE)
+
+    snapshot = exchange_rate_service.snapshot
+    if workers <= 1:
+        converted = _convert_shard(amounts, origins, target_currency, snapshot)
+    else:
+        with concurrent.futures.ProcessPoolExecutor(
+            workers, initializer=_init_worker, initargs=(snapshot,)
+        ) as pool:
+            shards = _shards(
+                [str(amount) for amount in amounts], origins, workers * SHARDS_PER_WORKER
+            )
+            converted = []
+            for result in pool.map(
+                _convert_worker_shard, shards, itertools.repeat(target_currency)
+            ):
+                converted.extend(result)
+
+    results = []
+    for amount, origin in zip(converted, origins):
+        value = Cash._make(decimal.Decimal(amount), target_currency)
+        if origin != target_currency:
+            value._rate_version = snapshot.version
+        results.append(value)
+    return results
@@ -10,29 +10,99 @@ implement the __matmul__ special method, which is invoked when the @ operator is
 Here's the code:
 """
 
+import contextvars
 import decimal
-
+import os
 import typing
 
+from app import metrics
+from app.conversion_cache import ConversionCache
 from app.currency import Currency
-from app.exchange_rate import exchange_rate_service
+from app.exchange_rate import RateSnapshot, exchange_rate_service
 from app.exceptions import ExchangeRateUnknownError, InvalidCurrencyError
 
 CashOrNumber = typing.Union[int, decimal.Decimal, "Cash"]
 
+# Opt-in fixed-point representation, see `FixedPointCash` below.
+_fixed_point = os.environ.get("CASH_FIXED_POINT", "") not in ("", "0")
+
+
+def set_fixed_point(enabled: bool) -> None:
+    """Selects the representation used by every `Cash` created from now on."""
+    global _fixed_point
+    _fixed_point = enabled
+
+
+def fixed_point_enabled() -> bool:
+    return _fixed_point
+
+
+# Optional LRU cache in front of `Cash.to()`, see `app.conversion_cache`.
+_conversion_cache: typing.Optional[ConversionCache] = None
+
+
+def enable_conversion_cache(maxsize: int = 4096) -> ConversionCache:
+    global _conversion_cache
+    _conversion_cache = ConversionCache(maxsize)
+    return _conversion_cache
+
+
+def disable_conversion_cache() -> None:
+    global _conversion_cache
+    _conversion_cache = None
+
+
+def _reduce_cash(cash: "Cash", factory: typing.Callable, amount) -> tuple:
+    rate_version = cash.rate_version
+    if rate_version is None:
+        return factory, (amount, cash._currency)
+    return factory, (amount, cash._currency), (None, {"_rate_version": rate_version})
+
+
+def _cash_from_units(units: int, currency: Currency) -> "Cash":
+    # Loads a pickled `FixedPointCash` in the mode of the loading process.
+    if _fixed_point:
+        return FixedPointCash._from_units(units, currency)
+    return Cash._make(decimal.Decimal(units).scaleb(-4), currency)
+
 
 class Cash:
-    __slots__ = "_amount", "_currency"
+    """
+    An amount of money in a currency.
+
+    Instances are hashable by their amount, which agrees with `==` between instances
+    of the same currency and with plain numbers. Instances of different currencies
+    can compare equal through the current exchange rates, yet hash differently, so
+    don't mix currencies in the keys of a set or a dict.
+    """
+
+    __slots__ = "_amount", "_currency", "_rate_version"
+
+    def __new__(cls, *args, **kwargs):
+        if cls is Cash and _fixed_point:
+            cls = FixedPointCash
+        return super().__new__(cls)
 
     def __init__(
         self, amount: typing.Union[str, decimal.Decimal], currency: Currency
     ) -> None:
-        if not isinstance(currency, Currency) or not Currency.is_member(currency.value):
+        # Every `Currency` instance is a member, there's nothing else to look up.
+        if not isinstance(currency, Currency):
             raise InvalidCurrencyError
 
         self._amount = decimal.Decimal(amount)
         self._currency = currency
 
+    @classmethod
+    def _make(cls, amount: decimal.Decimal, currency: Currency) -> "Cash":
+        """Trusted constructor for a `Decimal` and a `Currency` that are known to be valid."""
+        if _fixed_point:
+            return FixedPointCash._make(amount, currency)
+        cash = object.__new__(cls)
+        cash._amount = amount
+        cash._currency = currency
+        return cash
+
     @property
     def amount(self) -> decimal.Decimal:
         return self._amount.quantize(decimal.Decimal("0.0000"))
@@ -41,45 +111,77 @@ class Cash:
     def currency(self) -> Currency:
         return self._currency
 
+    @property
+    def rate_version(self) -> typing.Optional[int]:
+        """Version of the rate snapshot `to()` used to produce this amount, if any."""
+        return getattr(self, "_rate_version", None)
+
     def __repr__(self) -> str:
         return f"{self.amount} {self.currency.name}"
 
     def __lt__(self, other: CashOrNumber) -> bool:
         amount = self._get_amount(other)
+        if amount is NotImplemented:
+            return NotImplemented
         return self.amount < amount
 
     def __le__(self, other: CashOrNumber) -> bool:
         amount = self._get_amount(other)
+        if amount is NotImplemented:
+            return NotImplemented
         return self.amount <= amount
 
     def __gt__(self, other: CashOrNumber) -> bool:
         amount = self._get_amount(other)
+        if amount is NotImplemented:
+            return NotImplemented
         return self.amount > amount
 
     def __ge__(self, other: CashOrNumber) -> bool:
         amount = self._get_amount(other)
+        if amount is NotImplemented:
+            return NotImplemented
         return self.amount >= amount
 
     def __eq__(self, other: CashOrNumber) -> bool:
         amount = self._get_amount(other)
+        if amount is NotImplemented:
+            return NotImplemented
         return self.amount == amount
 
     def __ne__(self, other: CashOrNumber) -> bool:
-        return not self == other
+        equal = self.__eq__(other)
+        if equal is NotImplemented:
+            return NotImplemented
+        return not equal
+
+    def __hash__(self) -> int:
+        # Equality across currencies goes through mutable exchange rates and isn't
+        # transitive, `Cash("1", EUR) == 1` while it's also equal to `Cash("4.55", PLN)`,
+        # so no hash can follow it. See the class docstring.
+        return hash(self.amount)
 
     def __bool__(self):
         return bool(self._amount)
 
+    def __reduce__(self):
+        # Through `_make`, so a `Cash` pickled in one mode is loaded in the mode of the
+        # loading process. `FixedPointCash` goes through `_cash_from_units` for the same.
+        return _reduce_cash(self, Cash._make, self._amount)
+
     """ 
     Here's the modified __add__ method after implementing the context manager
     """
 
     def __add__(self, other: CashOrNumber) -> "Cash":
-        amount = self.amount + self._get_amount(other)
-        result_currency = TargetCurrency.get_target_currency() or self.currency
-        if result_currency != self.currency:
-            return Cash(amount, self.currency).to(result_currency)
-        return Cash(amount, result_currency)
+        other_amount = self._get_amount(other)
+        if other_amount is NotImplemented:
+            return NotImplemented
+        amount = self.amount + other_amount
+        result_currency = TargetCurrency.get_target_currency() or self._currency
+        if result_currency != self._currency:
+            return self._make(amount, self._currency).to(result_currency)
+        return self._make(amount, result_currency)
 
     """ 
     Like with __add__, this method first calculates the new amount, then 
@@ -90,21 +192,25 @@ class Cash:
 
     def __sub__(self, other: CashOrNumber) -> "Cash":
         other_amount = self._get_amount(other)
-        result_amount = self.amount - other_amount
-
-        return Cash(str(result_amount), self.currency)
+        if other_amount is NotImplemented:
+            return NotImplemented
+        amount = self.amount - other_amount
+        result_currency = TargetCurrency.get_target_currency() or self._currency
+        if result_currency != self._currency:
+            return self._make(amount, self._currency).to(result_currency)
+        return self._make(amount, result_currency)
 
     def __radd__(self, other: CashOrNumber) -> "Cash":
         return self.__add__(other)
 
     def __neg__(self) -> "Cash":
-        return Cash(-self._amount, self.currency)
+        return self._make(-self._amount, self._currency)
 
     def __pos__(self) -> "Cash":
-        return Cash(+self._amount, self.currency)
+        return self._make(+self._amount, self._currency)
 
     def __abs__(self) -> "Cash":
-        return Cash(abs(self._amount), self.currency)
+        return self._make(abs(self._amount), self._currency)
 
     """ 
     Implementing the @ operator for currency conversion:
@@ -116,8 +222,30 @@ class Cash:
     def to(self, target_currency: Currency) -> "Cash":
         if target_currency is None or target_currency == self.currency:
             return self
-
-        rate = exchange_rate_service.quotation(self.currency, target_currency)
+        if metrics.registry is not None:
+            return metrics.registry.observe_conversion(
+                self._to, self._currency, target_currency
+            )
+        if _conversion_cache is None:
+            # The common case, converted here without going through `_to`.
+            return self._convert(target_currency, exchange_rate_service.snapshot)
+        return self._to(target_currency)
+
+    def _to(self, target_currency: Currency) -> "Cash":
+        snapshot = exchange_rate_service.snapshot
+        cache = _conversion_cache
+        if cache is None:
+            return self._convert(target_currency, snapshot)
+
+        amount = self.amount
+        converted = cache.get(amount, self.currency, target_currency, snapshot.version)
+        if converted is None:
+            converted = self._convert(target_currency, snapshot)
+            cache.put(amount, self.currency, target_currency, snapshot.version, converted)
+        return converted
+
+    def _convert(self, target_currency: Currency, snapshot: RateSnapshot) -> "Cash":
+        rate = snapshot.quotation(self.currency, target_currency)
         if rate is None:
             raise ExchangeRateUnknownError(
                 f"Exchange rate for {self.currency.name} to {target_currency.name} is unknown."
@@ -125,16 +253,172 @@ class Cash:
 
         new_amount = self.amount * rate
 
-        return Cash(new_amount, target_currency)
+        converted = self._make(new_amount, target_currency)
+        converted._rate_version = snapshot.version
+        return converted
 
     def _get_amount(self, other: CashOrNumber) -> decimal.Decimal:
+        """
+        Returns `other` converted into this currency, or `NotImplemented` for operand
+        types `Cash` doesn't know, so that Python tries the other operand's method.
+        """
         if isinstance(other, Cash):
             other_converted = other.to(self.currency)
             return other_converted.amount
         elif isinstance(other, (int, decimal.Decimal)):
             return decimal.Decimal(other)
         else:
-            raise ValueError(f"Unsupported operand type: {type(other)}")
+            return NotImplemented
+
+
+"""
+The fixed-point mode stores a `Cash` as a plain `int` of 0.0001 units instead
+of a `Decimal`. The amount is quantized once, at construction, so reading it no
+longer calls `quantize`, and comparisons and arithmetic between two instances run
+on Python ints. A `Decimal` is only built at the API boundary: `amount`, `repr`,
+multiplication by an exchange rate and operands that are decimals themselves.
+
+The mode is selected per process, either with the `CASH_FIXED_POINT=1`
+environment variable or by calling `set_fixed_point(True)`. `Cash(...)` then
+returns a `FixedPointCash`, which is still a `Cash` for `isinstance` checks.
+
+Because rounding happens on construction, amounts smaller than 0.00005 are falsy
+in this mode, while the decimal mode keeps them truthy until they're quantized.
+"""
+
+_SCALE = 10_000
+
+
+def _to_units(amount: typing.Union[str, int, decimal.Decimal]) -> int:
+    return int(decimal.Decimal(amount).quantize(decimal.Decimal("0.0000")).scaleb(4))
+
+
+class FixedPointCash(Cash):
+    __slots__ = ("_units",)
+
+    def __init__(
+        self, amount: typing.Union[str, decimal.Decimal], currency: Currency
+    ) -> None:
+        if not isinstance(currency, Currency):
+            raise InvalidCurrencyError
+
+        self._units = _to_units(amount)
+        self._currency = currency
+
+    @classmethod
+    def _from_units(
+        cls, units: typing.Union[int, decimal.Decimal], currency: Currency
+    ) -> "FixedPointCash":
+        cash = object.__new__(cls)
+        if not isinstance(units, int):
+            units = int(units.to_integral_value())
+        cash._units = units
+        cash._currency = currency
+        return cash
+
+    @classmethod
+    def _make(cls, amount: decimal.Decimal, currency: Currency) -> "FixedPointCash":
+        return cls._from_units(amount.scaleb(4), currency)
+
+    @property
+    def _amount(self) -> decimal.Decimal:
+        return decimal.Decimal(self._units).scaleb(-4)
+
+    @property
+    def amount(self) -> decimal.Decimal:
+        return decimal.Decimal(self._units).scaleb(-4)
+
+    def __lt__(self, other: CashOrNumber) -> bool:
+        units = self._get_units(other)
+        if units is NotImplemented:
+            return NotImplemented
+        return self._units < units
+
+    def __le__(self, other: CashOrNumber) -> bool:
+        units = self._get_units(other)
+        if units is NotImplemented:
+            return NotImplemented
+        return self._units <= units
+
+    def __gt__(self, other: CashOrNumber) -> bool:
+        units = self._get_units(other)
+        if units is NotImplemented:
+            return NotImplemented
+        return self._units > units
+
+    def __ge__(self, other: CashOrNumber) -> bool:
+        units = self._get_units(other)
+        if units is NotImplemented:
+            return NotImplemented
+        return self._units >= units
+
+    def __eq__(self, other: CashOrNumber) -> bool:
+        units = self._get_units(other)
+        if units is NotImplemented:
+            return NotImplemented
+        return self._units == units
+
+    __hash__ = Cash.__hash__
+
+    def __bool__(self):
+        return bool(self._units)
+
+    def __reduce__(self):
+        return _reduce_cash(self, _cash_from_units, self._units)
+
+    def __add__(self, other: CashOrNumber) -> "Cash":
+        units = self._get_units(other)
+        if units is NotImplemented:
+            return NotImplemented
+        result = self._from_units(self._units + units, self._currency)
+        return result.to(TargetCurrency.get_target_currency())
+
+    def __sub__(self, other: CashOrNumber) -> "Cash":
+        units = self._get_units(other)
+        if units is NotImplemented:
+            return NotImplemented
+        result = self._from_units(self._units - units, self._currency)
+        return result.to(TargetCurrency.get_target_currency())
+
+    def __neg__(self) -> "Cash":
+        return self._from_units(-self._units, self._currency)
+
+    def __pos__(self) -> "Cash":
+        return self._from_units(self._units, self._currency)
+
+    def __abs__(self) -> "Cash":
+        return self._from_units(abs(self._units), self._currency)
+
+    def _convert(self, target_currency: Currency, snapshot: RateSnapshot) -> "Cash":
+        rate = snapshot.quotation(self._currency, target_currency)
+        if rate is None:
+            raise ExchangeRateUnknownError(
+                f"Exchange rate for {self.currency.name} to {target_currency.name} is unknown."
+            )
+
+        # Same significant digits as `amount * rate`, so the rounding is identical.
+        converted = self._from_units(rate * self._units, target_currency)
+        converted._rate_version = snapshot.version
+        return converted
+
+    def _get_units(
+        self, other: CashOrNumber
+    ) -> typing.Union[int, decimal.Decimal]:
+        """
+        Returns `other` in 0.0001 units, as a `Decimal` when it isn't whole, or
+        `NotImplemented` for operand types `Cash` doesn't know.
+        """
+        if isinstance(other, Cash):
+            converted = other.to(self._currency)
+            if isinstance(converted, FixedPointCash):
+                return converted._units
+            return _to_units(converted.amount)
+        elif isinstance(other, int):
+            return other * _SCALE
+        elif isinstance(other, decimal.Decimal):
+            return other.scaleb(4)
+        else:
+            return NotImplemented
 
 
 """ 
@@ -148,36 +432,40 @@ For example, in the __add__ method, instead of just returning Cash(amount, self.
 you should check if there's a target currency set, and if so, convert the result 
 to that currency.
 
-We can utilize a class variable in TargetCurrency to store the target
-currency and leverage the __enter__ and __exit__ methods of the context manager to 
-manage its value.
-
-This implementation would store the _target_currency in memory for the entire process, 
-and the context manager would change its value. This approach will work fine for 
-single-threaded applications. However, if you are planning to use this code in a 
-multi-threaded application, different threads will overwrite each other's target currency, 
-causing unpredictable behavior. That's why using threading.local is recommended for
-multi-threaded applications.
+The target currency lives in a `contextvars.ContextVar` rather than in a class
+variable. Every thread, and every asyncio task, sees its own value, so concurrent
+request handlers can each have their own target currency without a global lock.
+`__enter__` keeps the token returned by `ContextVar.set` and `__exit__` resets to it,
+which restores whatever was active before, also when scopes are nested. The tokens
+are stacked in a context variable too, not on the instance, so a single instance
+can be shared by tasks and threads that leave it in any order.
 
 """
 
+_target_currency: contextvars.ContextVar[typing.Optional[Currency]] = contextvars.ContextVar(
+    "target_currency", default=None
+)
+# Tokens of the scopes entered in the current context, innermost last. A tuple, so
+# that contexts copied from this one never see each other's scopes.
+_target_currency_tokens: contextvars.ContextVar[
+    typing.Tuple[contextvars.Token, ...]
+] = contextvars.ContextVar("target_currency_tokens", default=())
 
-class TargetCurrency:
-    _target_currency = None
 
+class TargetCurrency:
     def __init__(self, target_currency: Currency):
-        self.previous_currency = None
         self.new_currency = target_currency
 
     def __enter__(self):
-        if TargetCurrency._target_currency:
-            self.previous_currency = TargetCurrency._target_currency
-        TargetCurrency._target_currency = self.new_currency
+        token = _target_currency.set(self.new_currency)
+        _target_currency_tokens.set(_target_currency_tokens.get() + (token,))
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        # Restore the original target currency or set it to None if there wasn't any
-        TargetCurrency._target_currency = self.previous_currency
+        # Restore the target currency that was active before entering
+        tokens = _target_currency_tokens.get()
+        _target_currency_tokens.set(tokens[:-1])
+        _target_currency.reset(tokens[-1])
 
     @classmethod
-    def get_target_currency(cls) -> Currency:
-        return cls._target_currency
+    def get_target_currency(cls) -> typing.Optional[Currency]:
+        return _target_currency.get()
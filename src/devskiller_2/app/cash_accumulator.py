@@ -0,0 +1,158 @@
+"""
+`total += tx` on a `Cash` builds a new immutable `Cash` on every iteration.
+`CashAccumulator` is its mutable companion for accumulation heavy loops: `+=` and
+`-=` update the running total in place and return the accumulator itself.
+
+The semantics are those of `Cash.__add__` and `Cash.__sub__`: the operand is
+converted into the currency of the total, a plain number counts in that currency,
+and under `TargetCurrency` the total is converted into the target currency after
+the operation. Every step rounds exactly like the chain of `Cash` results would.
+
+`freeze()` returns the total as an immutable `Cash` without validating or parsing
+anything again.
+
+Like `Cash`, in the fixed-point mode `CashAccumulator(...)` returns a
+`FixedPointCashAccumulator`, which keeps the total in integer 0.0001 units.
+
+Example:
+
+```python
+total = CashAccumulator(Currency.EUR)
+for tx in transactions:
+    total += tx
+balance = total.freeze()
+```
+"""
+
+import decimal
+import typing
+
+from app.cash import (
+    _SCALE,
+    Cash,
+    CashOrNumber,
+    FixedPointCash,
+    TargetCurrency,
+    _to_units,
+    fixed_point_enabled,
+)
+from app.currency import Currency
+from app.exceptions import InvalidCurrencyError
+
+_QUANTUM = decimal.Decimal("0.0000")
+
+
+class CashAccumulator:
+    __slots__ = "_amount", "_currency"
+
+    def __new__(cls, *args, **kwargs):
+        if cls is CashAccumulator and fixed_point_enabled():
+            cls = FixedPointCashAccumulator
+        return super().__new__(cls)
+
+    def __init__(
+        self, currency: Currency, amount: typing.Union[str, int, decimal.Decimal] = 0
+    ) -> None:
+        if not isinstance(currency, Currency):
+            raise InvalidCurrencyError
+
+        self._amount = decimal.Decimal(amount)
+        self._currency = currency
+
+    @classmethod
+    def from_cash(cls, cash: Cash) -> "CashAccumulator":
+        return cls(cash.currency, cash._amount)
+
+    @property
+    def amount(self) -> decimal.Decimal:
+        return self._amount.quantize(_QUANTUM)
+
+    @property
+    def currency(self) -> Currency:
+        return self._currency
+
+    def __repr__(self) -> str:
+        return f"CashAccumulator({self.amount} {self._currency.name})"
+
+    def __iadd__(self, other: CashOrNumber) -> "CashAccumulator":
+        self._amount = self._amount.quantize(_QUANTUM) + self._get_amount(other)
+        self._apply_target_currency()
+        return self
+
+    def __isub__(self, other: CashOrNumber) -> "CashAccumulator":
+        self._amount = self._amount.quantize(_QUANTUM) - self._get_amount(other)
+        self._apply_target_currency()
+        return self
+
+    def freeze(self) -> Cash:
+        """Returns the current total as an immutable `Cash`."""
+        return Cash._make(self._amount, self._currency)
+
+    def _apply_target_currency(self) -> None:
+        target_currency = TargetCurrency.get_target_currency()
+        if target_currency is not None and target_currency != self._currency:
+            converted = self.freeze().to(target_currency)
+            self._amount = converted._amount
+            self._currency = target_currency
+
+    def _get_amount(self, other: CashOrNumber) -> decimal.Decimal:
+        if isinstance(other, Cash):
+            if other._currency is not self._currency:
+                other = other.to(self._currency)
+            return other.amount
+        elif isinstance(other, (int, decimal.Decimal)):
+            return decimal.Decimal(other)
+        else:
+            raise ValueError(f"Unsupported operand type: {type(other)}")
+
+
+class FixedPointCashAccumulator(CashAccumulator):
+    __slots__ = ("_units",)
+
+    def __init__(
+        self, currency: Currency, amount: typing.Union[str, int, decimal.Decimal] = 0
+    ) -> None:
+        if not isinstance(currency, Currency):
+            raise InvalidCurrencyError
+
+        self._units = _to_units(amount)
+        self._currency = currency
+
+    @property
+    def amount(self) -> decimal.Decimal:
+        return decimal.Decimal(self._units).scaleb(-4)
+
+    def __iadd__(self, other: CashOrNumber) -> "CashAccumulator":
+        self._units = self._round(self._units + self._get_units(other))
+        self._apply_target_currency()
+        return self
+
+    def __isub__(self, other: CashOrNumber) -> "CashAccumulator":
+        self._units = self._round(self._units - self._get_units(other))
+        self._apply_target_currency()
+        return self
+
+    def freeze(self) -> Cash:
+        return FixedPointCash._from_units(self._units, self._currency)
+
+    def _apply_target_currency(self) -> None:
+        target_currency = TargetCurrency.get_target_currency()
+        if target_currency is not None and target_currency != self._currency:
+            self._units = _to_units(self.freeze().to(target_currency).amount)
+            self._currency = target_currency
+
+    @staticmethod
+    def _round(units: typing.Union[int, decimal.Decimal]) -> int:
+        return units if isinstance(units, int) else int(units.to_integral_value())
+
+    def _get_units(self, other: CashOrNumber) -> typing.Union[int, decimal.Decimal]:
+        if isinstance(other, FixedPointCash) and other._currency is self._currency:
+            return other._units
+        elif isinstance(other, Cash):
+            return _to_units(other.to(self._currency).amount)
+        elif isinstance(other, int):
+            return other * _SCALE
+        elif isinstance(other, decimal.Decimal):
+            return other.scaleb(4)
+        else:
+            raise ValueError(f"Unsupported operand type: {type(other)}")
@@ -0,0 +1,311 @@
+"""
+`CashArray` is a columnar container for many `Cash` values at once. Instead of
+allocating one `Cash` object per amount it keeps two parallel NumPy arrays:
+
+* `units` - int64 amounts expressed in minor units of 0.0001, i.e. the same
+  4 decimal places `Cash.amount` is quantized to,
+* `codes` - uint8 positions of each currency in the `Currency` enum.
+
+Additions, subtractions and comparisons then become integer array operations.
+Currency conversion groups the elements by currency pair, so
+`ExchangeRateService.quotation` is called once per pair instead of once per element,
+all on the same rate snapshot.
+
+Conversion multiplies in float64 and rounds half to even, just like `Decimal.quantize`
+does. The few products that land too close to a rounding boundary for float64 to
+decide are recomputed with `Decimal`, so the results match the scalar `Cash` path
+exactly, not only approximately.
+
+Example:
+
+```python
+prices = CashArray(["10", "12.5", "7"], [Currency.PLN, Currency.EUR, Currency.USD])
+total = prices.to(Currency.PLN).sum()
+```
+"""
+
+import decimal
+import operator
+import typing
+
+import numpy as np
+
+from app.cash import Cash, TargetCurrency, _to_units
+from app.currency import CURRENCY_BY_CODE, Currency
+from app.exceptions import ExchangeRateUnknownError, InvalidCurrencyError
+from app.exchange_rate import RateSnapshot, exchange_rate_service
+
+# float64 keeps ~53 bits of the product; anything closer to a .5 boundary than
+# this is handed over to Decimal to make the rounding decision.
+_RELATIVE_TOLERANCE = 2.0**-45
+_ABSOLUTE_TOLERANCE = 1e-9
+_MAX_EXACT_FLOAT = 2.0**52
+
+CashArrayOperand = typing.Union[int, decimal.Decimal, Cash, "CashArray"]
+
+
+def _to_code(currency: Currency) -> int:
+    if not isinstance(currency, Currency):
+        raise InvalidCurrencyError
+    return currency.code
+
+
+def _convert_units(
+    units: np.ndarray, origin: Currency, target: Currency, snapshot: RateSnapshot
+) -> np.ndarray:
+    """Converts minor units of a single currency pair, rounding like `Cash.to`."""
+    rate = snapshot.quotation(origin, target)
+    if rate is None:
+        raise ExchangeRateUnknownError(
+            f"Exchange rate for {origin.name} to {target.name} is unknown."
+        )
+
+    product = units * float(rate)
+    rounded = np.rint(product)
+    distance_to_tie = np.abs(np.abs(product - rounded) - 0.5)
+    uncertain = (
+        distance_to_tie <= np.abs(product) * _RELATIVE_TOLERANCE + _ABSOLUTE_TOLERANCE
+    ) | (np.abs(product) >= _MAX_EXACT_FLOAT)
+
+    result = rounded.astype(np.int64)
+    if uncertain.any():
+        result[uncertain] = [
+            _to_units(decimal.Decimal(int(value)).scaleb(-4) * rate)
+            for value in units[uncertain]
+        ]
+    return result
+
+
+def _convert(units: np.ndarray, codes: np.ndarray, target_codes: np.ndarray) -> np.ndarray:
+    """Converts every element from its own currency into the matching target currency."""
+    result = units.copy()
+    differs = codes != target_codes
+    if not differs.any():
+        return result
+
+    snapshot = exchange_rate_service.snapshot
+    pairs = codes.astype(np.int64) * len(CURRENCY_BY_CODE) + target_codes
+    for pair in np.unique(pairs[differs]):
+        origin, target = divmod(int(pair), len(CURRENCY_BY_CODE))
+        mask = pairs == pair
+        result[mask] = _convert_units(
+            units[mask], CURRENCY_BY_CODE[origin], CURRENCY_BY_CODE[target], snapshot
+        )
+    return result
+
+
+def _add_number(units: np.ndarray, number: typing.Union[int, decimal.Decimal]) -> np.ndarray:
+    """Adds a plain number, rounding the sum half to even like `Cash.amount` does."""
+    scaled = decimal.Decimal(number).scaleb(4)
+    floor = int(scaled.to_integral_value(rounding=decimal.ROUND_FLOOR))
+    fraction = scaled - floor
+    result = units + floor
+    if fraction > decimal.Decimal("0.5"):
+        result += 1
+    elif fraction == decimal.Decimal("0.5"):
+        result += result & 1
+    return result
+
+
+class CashArray:
+    __slots__ = "_units", "_codes"
+
+    def __init__(
+        self,
+        amounts: typing.Iterable[typing.Union[str, int, decimal.Decimal]],
+        currencies: typing.Union[Currency, typing.Iterable[Currency]],
+    ) -> None:
+        units = np.array([_to_units(amount) for amount in amounts], dtype=np.int64)
+        if isinstance(currencies, Currency):
+            codes = np.full(len(units), _to_code(currencies), dtype=np.uint8)
+        else:
+            codes = np.array([_to_code(c) for c in currencies], dtype=np.uint8)
+        if len(codes) != len(units):
+            raise ValueError("amounts and currencies must have the same length")
+
+        self._units = units
+        self._codes = codes
+
+    @classmethod
+    def from_cash(cls, values: typing.Iterable[Cash]) -> "CashArray":
+        values = list(values)
+        return cls(
+            [value.amount for value in values], [value.currency for value in values]
+        )
+
+    @classmethod
+    def from_units(
+        cls,
+        units: typing.Iterable[int],
+        currencies: typing.Union[Currency, typing.Iterable[Currency]],
+    ) -> "CashArray":
+        """Wraps amounts that are already in minor units of 0.0001, without parsing them."""
+        units = np.asarray(units, dtype=np.int64)
+        if isinstance(currencies, Currency):
+            codes = np.full(len(units), _to_code(currencies), dtype=np.uint8)
+        else:
+            codes = np.array([_to_code(c) for c in currencies], dtype=np.uint8)
+        if len(codes) != len(units):
+            raise ValueError("units and currencies must have the same length")
+        return cls._from_arrays(units, codes)
+
+    @classmethod
+    def _from_arrays(cls, units: np.ndarray, codes: np.ndarray) -> "CashArray":
+        array = cls.__new__(cls)
+        array._units = units
+        array._codes = codes
+        return array
+
+    @property
+    def units(self) -> np.ndarray:
+        """Amounts in minor units of 0.0001, read-only."""
+        view = self._units.view()
+        view.flags.writeable = False
+        return view
+
+    @property
+    def codes(self) -> np.ndarray:
+        """Positions of the currencies in the `Currency` enum, read-only."""
+        view = self._codes.view()
+        view.flags.writeable = False
+        return view
+
+    @property
+    def amounts(self) -> typing.List[decimal.Decimal]:
+        return [decimal.Decimal(int(value)).scaleb(-4) for value in self._units]
+
+    @property
+    def currencies(self) -> typing.List[Currency]:
+        return [CURRENCY_BY_CODE[code] for code in self._codes]
+
+    def to_cash(self) -> typing.List[Cash]:
+        return list(self)
+
+    def __len__(self) -> int:
+        return len(self._units)
+
+    def __iter__(self) -> typing.Iterator[Cash]:
+        for value, code in zip(self._units, self._codes):
+            yield Cash._make(decimal.Decimal(int(value)).scaleb(-4), CURRENCY_BY_CODE[code])
+
+    def __getitem__(self, index) -> typing.Union[Cash, "CashArray"]:
+        if isinstance(index, (int, np.integer)):
+            return Cash._make(
+                decimal.Decimal(int(self._units[index])).scaleb(-4),
+                CURRENCY_BY_CODE[self._codes[index]],
+            )
+        return self._from_arrays(self._units[index], self._codes[index])
+
+    def __repr__(self) -> str:
+        return f"CashArray({[repr(cash) for cash in self]})"
+
+    def __add__(self, other: CashArrayOperand) -> "CashArray":
+        if isinstance(other, (int, decimal.Decimal)):
+            units = _add_number(self._units, other)
+        else:
+            units = self._units + self._get_units(other)
+
+        result = self._from_arrays(units, self._codes.copy())
+        target_currency = TargetCurrency.get_target_currency()
+        if target_currency is not None:
+            return result.to(target_currency)
+        return result
+
+    def __radd__(self, other: CashArrayOperand) -> "CashArray":
+        return self.__add__(other)
+
+    def __sub__(self, other: CashArrayOperand) -> "CashArray":
+        if isinstance(other, (int, decimal.Decimal)):
+            units = _add_number(self._units, -decimal.Decimal(other))
+        else:
+            units = self._units - self._get_units(other)
+
+        result = self._from_arrays(units, self._codes.copy())
+        target_currency = TargetCurrency.get_target_currency()
+        if target_currency is not None:
+            return result.to(target_currency)
+        return result
+
+    def __rsub__(self, other: CashArrayOperand) -> "CashArray":
+        return (-self).__add__(other)
+
+    def __neg__(self) -> "CashArray":
+        return self._from_arrays(-self._units, self._codes.copy())
+
+    def __pos__(self) -> "CashArray":
+        return self._from_arrays(self._units.copy(), self._codes.copy())
+
+    def __abs__(self) -> "CashArray":
+        return self._from_arrays(np.abs(self._units), self._codes.copy())
+
+    def __lt__(self, other: CashArrayOperand) -> np.ndarray:
+        return self._compare(other, operator.lt)
+
+    def __le__(self, other: CashArrayOperand) -> np.ndarray:
+        return self._compare(other, operator.le)
+
+    def __gt__(self, other: CashArrayOperand) -> np.ndarray:
+        return self._compare(other, operator.gt)
+
+    def __ge__(self, other: CashArrayOperand) -> np.ndarray:
+        return self._compare(other, operator.ge)
+
+    def __eq__(self, other: CashArrayOperand) -> np.ndarray:
+        return self._compare(other, operator.eq)
+
+    def __ne__(self, other: CashArrayOperand) -> np.ndarray:
+        return ~self._compare(other, operator.eq)
+
+    __hash__ = None
+
+    def __matmul__(self, target_currency: Currency) -> "CashArray":
+        return self.to(target_currency)
+
+    def to(self, target_currency: Currency) -> "CashArray":
+        if target_currency is None:
+            return self
+
+        target_codes = np.full(len(self), _to_code(target_currency), dtype=np.uint8)
+        units = _convert(self._units, self._codes, target_codes)
+        return self._from_arrays(units, target_codes)
+
+    def sum(self, currency: typing.Optional[Currency] = None) -> Cash:
+        """
+        Returns the total as a single `Cash`, in `currency` or in the currency of
+        the first element, the way `sum()` over a list of `Cash` would.
+        Every element is converted once; the total itself is not re-converted
+        under `TargetCurrency`, pass `currency` for that instead.
+        """
+        if currency is None:
+            if not len(self):
+                raise ValueError("currency is required to sum an empty CashArray")
+            currency = CURRENCY_BY_CODE[self._codes[0]]
+
+        target_codes = np.full(len(self), _to_code(currency), dtype=np.uint8)
+        total = int(_convert(self._units, self._codes, target_codes).sum())
+        return Cash._make(decimal.Decimal(total).scaleb(-4), currency)
+
+    def _get_units(self, other: typing.Union[Cash, "CashArray"]) -> np.ndarray:
+        """Returns `other` in minor units, converted into this array's currencies."""
+        if isinstance(other, Cash):
+            units = np.full(len(self), _to_units(other.amount), dtype=np.int64)
+            codes = np.full(len(self), _to_code(other.currency), dtype=np.uint8)
+        elif isinstance(other, CashArray):
+            if len(other) != len(self):
+                raise ValueError("CashArray operands must have the same length")
+            units, codes = other._units, other._codes
+        else:
+            raise ValueError(f"Unsupported operand type: {type(other)}")
+        return _convert(units, codes, self._codes)
+
+    def _compare(self, other: CashArrayOperand, compare) -> np.ndarray:
+        if not isinstance(other, (int, decimal.Decimal)):
+            return compare(self._units, self._get_units(other))
+
+        scaled = decimal.Decimal(other).scaleb(4)
+        if scaled == scaled.to_integral_value():
+            return compare(self._units, int(scaled))
+        # A non-integral bound sits strictly between two neighbouring units, so
+        # comparing against the midpoint gives the same answer without rounding.
+        floor = int(scaled.to_integral_value(rounding=decimal.ROUND_FLOOR))
+        return compare(self._units * 2, floor * 2 + 1)
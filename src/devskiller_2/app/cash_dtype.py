@@ -0,0 +1,327 @@
+"""
+A pandas extension type for columns of `Cash`. Holding `Cash` objects in an `object`
+column makes every `groupby().sum()` fall back to Python-level `Cash.__add__`, one
+element and one conversion at a time. `CashDtype("EUR")` is a registered dtype whose
+values all share one currency and live in a contiguous int64 array of 0.0001 units,
+next to a boolean mask for missing values.
+
+* arithmetic between columns is delegated to `CashArray`, so an operand in another
+  currency is converted with one quotation per currency pair,
+* `sum`, `min` and `max`, including their `groupby` versions, run on the integers,
+* `astype("cash[USD]")` converts the column through `ExchangeRateService`,
+* values read back out of the column are plain `Cash` instances.
+
+Example:
+
+```python
+import app.cash_dtype  # registers the "cash[...]" dtypes
+
+prices = pd.Series(["10", "12.5"], dtype="cash[EUR]")
+prices.groupby(["a", "a"]).sum()  # a    22.5000 EUR
+prices.astype("cash[PLN]")
+```
+"""
+
+import decimal
+import math
+import operator
+import re
+import typing
+
+import numpy as np
+import pandas as pd
+from pandas.api.extensions import (
+    ExtensionArray,
+    ExtensionDtype,
+    register_extension_dtype,
+    take,
+)
+from pandas.api.indexers import check_array_indexer
+from pandas.api.types import is_integer, is_list_like, pandas_dtype
+
+from app.cash import Cash, TargetCurrency, _to_units
+from app.cash_array import CashArray
+from app.currency import Currency
+from app.exceptions import InvalidCurrencyError
+
+# Stands in for missing values when pandas factorizes the units.
+_NA_SENTINEL = np.iinfo(np.int64).min
+
+
+def _is_na(value: typing.Any) -> bool:
+    return value is None or value is pd.NA or (isinstance(value, float) and math.isnan(value))
+
+
+@register_extension_dtype
+class CashDtype(ExtensionDtype):
+    type = Cash
+    kind = "O"
+    na_value = pd.NA
+    _metadata = ("currency",)
+
+    def __init__(self, currency: typing.Union[Currency, str]) -> None:
+        if isinstance(currency, str):
+            if not Currency.is_member(currency):
+                raise InvalidCurrencyError(currency)
+            currency = Currency(currency)
+        if not isinstance(currency, Currency):
+            raise InvalidCurrencyError
+        self.currency = currency
+
+    @property
+    def name(self) -> str:
+        return f"cash[{self.currency.value}]"
+
+    @property
+    def _is_numeric(self) -> bool:
+        return True
+
+    @classmethod
+    def construct_array_type(cls) -> typing.Type["CashExtensionArray"]:
+        return CashExtensionArray
+
+    @classmethod
+    def construct_from_string(cls, string: str) -> "CashDtype":
+        if not isinstance(string, str):
+            raise TypeError(f"'construct_from_string' expects a string, got {type(string)}")
+        match = re.fullmatch(r"cash\[(\w+)\]", string)
+        if match is None:
+            raise TypeError(f"Cannot construct a 'CashDtype' from '{string}'")
+        return cls(match.group(1))
+
+
+class CashExtensionArray(ExtensionArray):
+    def __init__(self, units: np.ndarray, mask: np.ndarray, dtype: CashDtype) -> None:
+        self._units = np.asarray(units, dtype=np.int64)
+        self._mask = np.asarray(mask, dtype=bool)
+        self._dtype = dtype
+
+    @classmethod
+    def _from_sequence(cls, scalars, *, dtype=None, copy: bool = False):
+        if dtype is not None:
+            dtype = pandas_dtype(dtype)
+        if isinstance(scalars, cls):
+            result = scalars if dtype is None else scalars.astype(dtype, copy=False)
+            return result.copy() if copy and result is scalars else result
+
+        scalars = list(scalars)
+        if dtype is None:
+            currencies = [value.currency for value in scalars if isinstance(value, Cash)]
+            if not currencies:
+                raise ValueError("dtype is required when there are no Cash values")
+            dtype = CashDtype(currencies[0])
+
+        units = np.zeros(len(scalars), dtype=np.int64)
+        mask = np.zeros(len(scalars), dtype=bool)
+        for index, value in enumerate(scalars):
+            if _is_na(value):
+                mask[index] = True
+            elif isinstance(value, Cash):
+                units[index] = _to_units(value.to(dtype.currency).amount)
+            else:
+                units[index] = _to_units(value)
+        return cls(units, mask, dtype)
+
+    @classmethod
+    def _from_sequence_of_strings(cls, strings, *, dtype=None, copy: bool = False):
+        return cls._from_sequence(strings, dtype=dtype, copy=copy)
+
+    @classmethod
+    def _from_factorized(cls, values, original: "CashExtensionArray"):
+        return cls(values, np.zeros(len(values), dtype=bool), original.dtype)
+
+    @property
+    def dtype(self) -> CashDtype:
+        return self._dtype
+
+    @property
+    def nbytes(self) -> int:
+        return self._units.nbytes + self._mask.nbytes
+
+    def __len__(self) -> int:
+        return len(self._units)
+
+    def __getitem__(self, item):
+        if is_integer(item):
+            if self._mask[item]:
+                return pd.NA
+            return Cash._make(
+                decimal.Decimal(int(self._units[item])).scaleb(-4), self._dtype.currency
+            )
+        item = check_array_indexer(self, item)
+        return type(self)(self._units[item], self._mask[item], self._dtype)
+
+    def __setitem__(self, key, value) -> None:
+        key = check_array_indexer(self, key)
+        if is_list_like(value) and not isinstance(value, Cash):
+            value = self._from_sequence(value, dtype=self._dtype)
+            self._units[key] = value._units
+            self._mask[key] = value._mask
+        else:
+            value = self._from_sequence([value], dtype=self._dtype)
+            self._units[key] = value._units[0]
+            self._mask[key] = value._mask[0]
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        return np.array(list(self), dtype=object)
+
+    def isna(self) -> np.ndarray:
+        return self._mask.copy()
+
+    def copy(self) -> "CashExtensionArray":
+        return type(self)(self._units.copy(), self._mask.copy(), self._dtype)
+
+    def take(self, indices, *, allow_fill: bool = False, fill_value=None):
+        units = take(self._units, indices, allow_fill=allow_fill, fill_value=0)
+        mask = take(self._mask, indices, allow_fill=allow_fill, fill_value=True)
+        if allow_fill and not _is_na(fill_value):
+            fill = self._from_sequence([fill_value], dtype=self._dtype)
+            missing = np.asarray(indices) == -1
+            units[missing] = fill._units[0]
+            mask[missing] = False
+        return type(self)(units, mask, self._dtype)
+
+    @classmethod
+    def _concat_same_type(cls, to_concat):
+        dtype = to_concat[0].dtype
+        arrays = [array.astype(dtype, copy=False) for array in to_concat]
+        return cls(
+            np.concatenate([array._units for array in arrays]),
+            np.concatenate([array._mask for array in arrays]),
+            dtype,
+        )
+
+    def _values_for_factorize(self) -> typing.Tuple[np.ndarray, int]:
+        return np.where(self._mask, _NA_SENTINEL, self._units), _NA_SENTINEL
+
+    def _values_for_argsort(self) -> np.ndarray:
+        return self._units
+
+    def astype(self, dtype, copy: bool = True):
+        dtype = pandas_dtype(dtype)
+        if isinstance(dtype, CashDtype):
+            if dtype == self._dtype:
+                return self.copy() if copy else self
+            converted = self._to_cash_array().to(dtype.currency)
+            return type(self)(np.array(converted.units), self._mask.copy(), dtype)
+        return super().astype(dtype, copy=copy)
+
+    def _reduce(self, name: str, *, skipna: bool = True, keepdims: bool = False, **kwargs):
+        if name not in ("sum", "min", "max"):
+            raise TypeError(f"'{self._dtype}' does not support reduction '{name}'")
+
+        valid = self._units[~self._mask]
+        if (not skipna and self._mask.any()) or (
+            len(valid) < max(kwargs.get("min_count", 0), name != "sum")
+        ):
+            result = pd.NA
+        else:
+            total = int(getattr(valid, name)()) if len(valid) else 0
+            result = Cash._make(decimal.Decimal(total).scaleb(-4), self._dtype.currency)
+
+        if keepdims:
+            return self._from_sequence([result], dtype=self._dtype)
+        return result
+
+    def _groupby_op(
+        self,
+        *,
+        how: str,
+        has_dropped_na: bool,
+        min_count: int,
+        ngroups: int,
+        ids: np.ndarray,
+        **kwargs,
+    ):
+        reducers = {
+            "sum": (np.add, 0),
+            "min": (np.minimum, np.iinfo(np.int64).max),
+            "max": (np.maximum, np.iinfo(np.int64).min),
+        }
+        if how not in reducers:
+            return super()._groupby_op(
+                how=how,
+                has_dropped_na=has_dropped_na,
+                min_count=min_count,
+                ngroups=ngroups,
+                ids=ids,
+                **kwargs,
+            )
+
+        reducer, initial = reducers[how]
+        grouped = ids >= 0
+        valid = grouped & ~self._mask
+        units = np.full(ngroups, initial, dtype=np.int64)
+        reducer.at(units, ids[valid], self._units[valid])
+
+        counts = np.bincount(ids[valid], minlength=ngroups)
+        mask = counts < max(min_count, how != "sum")
+        if not kwargs.get("skipna", True):
+            mask |= np.bincount(ids[grouped & self._mask], minlength=ngroups) > 0
+        return type(self)(np.where(mask, 0, units), mask, self._dtype)
+
+    def __add__(self, other):
+        return self._arithmetic(other, operator.add)
+
+    def __radd__(self, other):
+        return self._arithmetic(other, operator.add)
+
+    def __sub__(self, other):
+        return self._arithmetic(other, operator.sub)
+
+    def __neg__(self) -> "CashExtensionArray":
+        return type(self)(-self._units, self._mask.copy(), self._dtype)
+
+    def __pos__(self) -> "CashExtensionArray":
+        return self.copy()
+
+    def __abs__(self) -> "CashExtensionArray":
+        return type(self)(np.abs(self._units), self._mask.copy(), self._dtype)
+
+    def __eq__(self, other):
+        return self._comparison(other, operator.eq)
+
+    def __ne__(self, other):
+        return self._comparison(other, operator.ne)
+
+    def __lt__(self, other):
+        return self._comparison(other, operator.lt)
+
+    def __le__(self, other):
+        return self._comparison(other, operator.le)
+
+    def __gt__(self, other):
+        return self._comparison(other, operator.gt)
+
+    def __ge__(self, other):
+        return self._comparison(other, operator.ge)
+
+    def _to_cash_array(self) -> CashArray:
+        return CashArray.from_units(self._units, self._dtype.currency)
+
+    def _unbox(self, other) -> typing.Tuple[typing.Any, np.ndarray]:
+        """Returns `other` as a `CashArray` operand and the mask of missing results."""
+        if isinstance(other, (pd.Series, pd.Index, pd.DataFrame)):
+            return NotImplemented, self._mask
+        if isinstance(other, (Cash, int, decimal.Decimal)):
+            return other, self._mask
+        if is_list_like(other) and not isinstance(other, CashExtensionArray):
+            other = self._from_sequence(other, dtype=self._dtype)
+        if isinstance(other, CashExtensionArray):
+            return other._to_cash_array(), self._mask | other._mask
+        return NotImplemented, self._mask
+
+    def _arithmetic(self, other, op):
+        operand, mask = self._unbox(other)
+        if operand is NotImplemented:
+            return NotImplemented
+
+        result = op(self._to_cash_array(), operand)
+        currency = TargetCurrency.get_target_currency() or self._dtype.currency
+        return type(self)(np.where(mask, 0, result.units), mask.copy(), CashDtype(currency))
+
+    def _comparison(self, other, op):
+        operand, mask = self._unbox(other)
+        if operand is NotImplemented:
+            return NotImplemented
+        return pd.arrays.BooleanArray(op(self._to_cash_array(), operand), mask.copy())
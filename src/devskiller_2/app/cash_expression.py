@@ -0,0 +1,182 @@
+"""
+Under `TargetCurrency`, `Cash.__add__` converts and quantizes after every single
+addition, so `a + b + c + d` does three round trips through the target currency and
+compounds their rounding.
+
+In the lazy mode, operators don't compute anything. They build a small expression
+tree instead, and `evaluate()` walks it once:
+
+1. every node sums its leaves into exact per-currency `Decimal` totals, which don't
+   depend on any rate and are memoized on the node, so a subexpression shared by
+   several parents is only summed once,
+2. each per-currency total is converted into the target currency once, using a
+   single rate snapshot,
+3. the converted totals are added and quantized once.
+
+The target is the argument of `evaluate()`, else the active `TargetCurrency`, else
+the currency of the leftmost `Cash` in the expression. Like in `Cash`, a plain number
+counts in the currency of the `Cash` it is combined with.
+
+Example:
+
+```python
+total = (lazy(a) + b + c - 15).evaluate(Currency.EUR)
+```
+"""
+
+import abc
+import decimal
+import typing
+
+from app.cash import Cash, TargetCurrency
+from app.currency import Currency
+from app.exchange_rate import exchange_rate_service
+
+Buckets = typing.Dict[typing.Optional[Currency], decimal.Decimal]
+Operand = typing.Union[int, decimal.Decimal, Cash, "CashExpression"]
+
+
+class CashExpression(abc.ABC):
+    __slots__ = "_buckets", "_result"
+
+    def __init__(self) -> None:
+        self._buckets: typing.Optional[Buckets] = None
+        self._result: typing.Optional[typing.Tuple[Currency, int, Cash]] = None
+
+    @property
+    @abc.abstractmethod
+    def home_currency(self) -> typing.Optional[Currency]:
+        """Currency of the leftmost `Cash`, the one plain numbers are counted in."""
+
+    def buckets(self) -> Buckets:
+        """Returns the exact total of every currency in the expression, memoized."""
+        if self._buckets is None:
+            self._buckets = self._compute_buckets()
+        return self._buckets
+
+    def evaluate(self, target_currency: typing.Optional[Currency] = None) -> Cash:
+        target_currency = (
+            target_currency or TargetCurrency.get_target_currency() or self.home_currency
+        )
+        if target_currency is None:
+            raise ValueError("A target currency is required to evaluate plain numbers")
+
+        snapshot = exchange_rate_service.snapshot
+        if self._result is not None and self._result[:2] == (
+            target_currency,
+            snapshot.version,
+        ):
+            return self._result[2]
+
+        amount = decimal.Decimal(0)
+        for currency, total in self.buckets().items():
+            if currency is None or currency == target_currency:
+                amount += total
+            else:
+                amount += total * snapshot.quotation(currency, target_currency)
+
+        result = Cash._make(amount.quantize(decimal.Decimal("0.0000")), target_currency)
+        self._result = (target_currency, snapshot.version, result)
+        return result
+
+    def to(self, target_currency: Currency) -> Cash:
+        return self.evaluate(target_currency)
+
+    def __matmul__(self, target_currency: Currency) -> Cash:
+        return self.evaluate(target_currency)
+
+    def __add__(self, other: Operand) -> "CashExpression":
+        return _Sum(self, _wrap(other))
+
+    def __radd__(self, other: Operand) -> "CashExpression":
+        return _Sum(_wrap(other), self)
+
+    def __sub__(self, other: Operand) -> "CashExpression":
+        return _Sum(self, _Negation(_wrap(other)))
+
+    def __rsub__(self, other: Operand) -> "CashExpression":
+        return _Sum(_wrap(other), _Negation(self))
+
+    def __neg__(self) -> "CashExpression":
+        return _Negation(self)
+
+    def __pos__(self) -> "CashExpression":
+        return self
+
+    @abc.abstractmethod
+    def _compute_buckets(self) -> Buckets:
+        """Returns the exact total of every currency in the expression."""
+
+
+class _Leaf(CashExpression):
+    __slots__ = ("_value",)
+
+    def __init__(self, value: typing.Union[int, decimal.Decimal, Cash]) -> None:
+        super().__init__()
+        if not isinstance(value, (int, decimal.Decimal, Cash)):
+            raise ValueError(f"Unsupported operand type: {type(value)}")
+        self._value = value
+
+    def __repr__(self) -> str:
+        return repr(self._value)
+
+    @property
+    def home_currency(self) -> typing.Optional[Currency]:
+        return self._value.currency if isinstance(self._value, Cash) else None
+
+    def _compute_buckets(self) -> Buckets:
+        if isinstance(self._value, Cash):
+            return {self._value.currency: self._value.amount}
+        return {None: decimal.Decimal(self._value)}
+
+
+class _Sum(CashExpression):
+    __slots__ = "_left", "_right"
+
+    def __init__(self, left: CashExpression, right: CashExpression) -> None:
+        super().__init__()
+        self._left = left
+        self._right = right
+
+    def __repr__(self) -> str:
+        return f"({self._left!r} + {self._right!r})"
+
+    @property
+    def home_currency(self) -> typing.Optional[Currency]:
+        return self._left.home_currency or self._right.home_currency
+
+    def _compute_buckets(self) -> Buckets:
+        home_currency = self.home_currency
+        buckets: Buckets = {}
+        for child in (self._left, self._right):
+            for currency, total in child.buckets().items():
+                currency = currency or home_currency
+                buckets[currency] = buckets.get(currency, 0) + total
+        return buckets
+
+
+class _Negation(CashExpression):
+    __slots__ = ("_operand",)
+
+    def __init__(self, operand: CashExpression) -> None:
+        super().__init__()
+        self._operand = operand
+
+    def __repr__(self) -> str:
+        return f"-{self._operand!r}"
+
+    @property
+    def home_currency(self) -> typing.Optional[Currency]:
+        return self._operand.home_currency
+
+    def _compute_buckets(self) -> Buckets:
+        return {currency: -total for currency, total in self._operand.buckets().items()}
+
+
+def _wrap(value: Operand) -> CashExpression:
+    return value if isinstance(value, CashExpression) else _Leaf(value)
+
+
+def lazy(value: typing.Union[int, decimal.Decimal, Cash]) -> CashExpression:
+    """Starts a lazy expression; operators on it build a tree instead of computing."""
+    return _wrap(value)
@@ -0,0 +1,99 @@
+"""
+Pricing workloads call `Cash.to()` with the same few thousand combinations of amount,
+origin and target currency over and over. `ConversionCache` is a bounded LRU map
+from those combinations to the converted `Cash`, so a repeated conversion skips the
+quotation, the `Decimal` multiplication and the construction of the result.
+
+Entries are only valid for one rate snapshot version. As soon as a lookup or a store
+comes with a newer version, i.e. after `ExchangeRateService.update_rate`, the cache
+drops everything it holds, so stale conversions are never returned. Callers still
+holding an older snapshot simply miss.
+
+Enable it for `Cash.to()` with `app.cash.enable_conversion_cache(maxsize)`.
+"""
+
+import collections
+import decimal
+import threading
+import typing
+
+from app.currency import Currency
+
+CacheKey = typing.Tuple[decimal.Decimal, Currency, Currency]
+
+
+class CacheInfo(typing.NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+
+class ConversionCache:
+    def __init__(self, maxsize: int = 4096) -> None:
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "collections.OrderedDict[CacheKey, typing.Any]" = (
+            collections.OrderedDict()
+        )
+        self._version: typing.Optional[int] = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(
+        self, amount: decimal.Decimal, origin: Currency, target: Currency, version: int
+    ) -> typing.Any:
+        """Returns the cached conversion, or None when it isn't cached."""
+        key = (amount, origin, target)
+        with self._lock:
+            if not self._is_current(version):
+                self.misses += 1
+                return None
+            try:
+                value = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(
+        self,
+        amount: decimal.Decimal,
+        origin: Currency,
+        target: Currency,
+        version: int,
+        value: typing.Any,
+    ) -> None:
+        key = (amount, origin, target)
+        with self._lock:
+            if not self._is_current(version):
+                return
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(
+            self.hits, self.misses, self.evictions, self.maxsize, len(self._entries)
+        )
+
+    def _is_current(self, version: int) -> bool:
+        if self._version is None or version > self._version:
+            self._entries.clear()
+            self._version = version
+        return version == self._version
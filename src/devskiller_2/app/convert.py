@@ -0,0 +1,218 @@
+"""
+Converts a transaction export into a reporting currency, e.g.
+
+    python -m app.convert transactions.csv --to EUR -o transactions_eur.csv
+
+The input has one `amount,currency` row per line, either as CSV (an `amount,currency`
+header line is optional, amounts with thousands separators are quoted like
+`"1,000.00",PLN`) or as JSON lines like `{"amount": "12.34", "currency": "PLN"}`.
+The format follows the file extension unless `--format` is given, and `-` reads from
+stdin.
+
+The input is streamed in chunks of `--chunk-size` rows. Each chunk becomes a
+`CashArray`, which is converted in one go with one quotation per currency, and is
+written out before the next chunk is read. Memory use therefore depends on the chunk
+size only, not on the size of the input. The number of rows and rows/sec are
+reported on stderr. A row that can't be converted stops the conversion with its line
+number.
+"""
+
+import argparse
+import contextlib
+import csv
+import decimal
+import itertools
+import json
+import sys
+import time
+import typing
+
+from app.cash import _SCALE
+from app.cash_array import CashArray
+from app.currency import Currency
+from app.exceptions import CurrencyExchangeError, InvalidCurrencyError
+
+CSV_HEADER = "amount,currency"
+DEFAULT_CHUNK_SIZE = 100_000
+
+# Line number, amount and currency code.
+Row = typing.Tuple[int, typing.Any, str]
+
+
+class RowError(ValueError):
+    """A row of the input that can't be converted."""
+
+    def __init__(self, line: int, message: str) -> None:
+        super().__init__(f"line {line}: {message}")
+        self.line = line
+
+
+def _parse_currency(code: str) -> Currency:
+    if not Currency.is_member(code):
+        raise InvalidCurrencyError(f"Unknown currency {code!r}")
+    return Currency(code)
+
+
+def _format_units(units: int) -> str:
+    sign = "-" if units < 0 else ""
+    whole, fraction = divmod(abs(units), _SCALE)
+    return f"{sign}{whole}.{fraction:04d}"
+
+
+def _read_csv(lines: typing.Iterable[str]) -> typing.Iterator[Row]:
+    reader = csv.reader(lines)
+    for fields in reader:
+        fields = [field.strip() for field in fields]
+        if not any(fields) or (reader.line_num == 1 and ",".join(fields) == CSV_HEADER):
+            continue
+        if len(fields) != 2:
+            raise RowError(reader.line_num, f"expected amount,currency, got {fields!r}")
+        yield reader.line_num, fields[0].replace(",", ""), fields[1]
+
+
+def _read_jsonl(lines: typing.Iterable[str]) -> typing.Iterator[Row]:
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line, parse_float=decimal.Decimal)
+            amount, code = record["amount"], record["currency"]
+        except (KeyError, TypeError, ValueError):
+            raise RowError(
+                number, f"expected an amount and a currency, got {line.strip()!r}"
+            ) from None
+        yield number, amount, code
+
+
+def _write_csv(write: typing.Callable[[str], typing.Any], units, currency: Currency) -> None:
+    write("".join(f"{_format_units(int(value))},{currency.value}\n" for value in units))
+
+
+def _write_jsonl(write: typing.Callable[[str], typing.Any], units, currency: Currency) -> None:
+    write(
+        "".join(
+            f'{{"amount": "{_format_units(int(value))}", "currency": "{currency.value}"}}\n'
+            for value in units
+        )
+    )
+
+
+READERS = {"csv": _read_csv, "jsonl": _read_jsonl}
+WRITERS = {"csv": _write_csv, "jsonl": _write_jsonl}
+
+
+def convert_stream(
+    lines: typing.Iterable[str],
+    write: typing.Callable[[str], typing.Any],
+    target_currency: Currency,
+    file_format: str = "csv",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    """Converts `lines` chunk by chunk, passing the output to `write`; returns the row count."""
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be at least 1, got {chunk_size}")
+    rows = READERS[file_format](lines)
+    writer = WRITERS[file_format]
+    if file_format == "csv":
+        write(CSV_HEADER + "\n")
+
+    count = 0
+    while True:
+        chunk = list(itertools.islice(rows, chunk_size))
+        if not chunk:
+            return count
+        _, amounts, codes = zip(*chunk)
+        try:
+            array = CashArray(amounts, [_parse_currency(code) for code in codes])
+        except (InvalidCurrencyError, decimal.InvalidOperation, TypeError, ValueError):
+            # Only on failure, the rows are checked one by one to find the bad one.
+            _check_rows(chunk)
+            raise
+        converted = array.to(target_currency)
+        writer(write, converted.units, target_currency)
+        count += len(chunk)
+
+
+def _check_rows(rows: typing.Sequence[Row]) -> None:
+    for number, amount, code in rows:
+        try:
+            currency = _parse_currency(code)
+        except InvalidCurrencyError as error:
+            raise RowError(number, str(error)) from None
+        try:
+            CashArray([amount], [currency])
+        except (decimal.InvalidOperation, TypeError, ValueError):
+            raise RowError(number, f"invalid amount {amount!r}") from None
+
+
+def _positive_int(value: str) -> int:
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid integer {value!r}") from None
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def _detect_format(path: str) -> str:
+    return "jsonl" if path.endswith((".jsonl", ".ndjson")) else "csv"
+
+
+def main(argv: typing.Optional[typing.Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.convert",
+        description="Convert amount,currency transactions into a reporting currency.",
+    )
+    parser.add_argument("input", help="CSV or JSONL file to convert, - for stdin")
+    parser.add_argument("--to", required=True, dest="target", help="reporting currency")
+    parser.add_argument("-o", "--output", default="-", help="output file, - for stdout")
+    parser.add_argument("--format", choices=sorted(READERS), help="input and output format")
+    parser.add_argument(
+        "--chunk-size",
+        type=_positive_int,
+        default=DEFAULT_CHUNK_SIZE,
+        help="rows converted per batch (default: %(default)s)",
+    )
+    args = parser.parse_args(argv)
+
+    file_format = args.format or _detect_format(args.input)
+    try:
+        target_currency = _parse_currency(args.target)
+    except InvalidCurrencyError as error:
+        parser.error(str(error))
+
+    with contextlib.ExitStack() as stack:
+        try:
+            source = (
+                sys.stdin
+                if args.input == "-"
+                else stack.enter_context(open(args.input, newline=""))
+            )
+            output = (
+                sys.stdout
+                if args.output == "-"
+                else stack.enter_context(open(args.output, "w", newline=""))
+            )
+        except OSError as error:
+            parser.error(str(error))
+
+        started = time.perf_counter()
+        try:
+            count = convert_stream(
+                source, output.write, target_currency, file_format, args.chunk_size
+            )
+        except (CurrencyExchangeError, decimal.InvalidOperation, OSError, ValueError) as error:
+            parser.exit(1, f"{parser.prog}: error: {error}\n")
+
+    elapsed = time.perf_counter() - started
+    print(
+        f"converted {count} rows in {elapsed:.2f}s "
+        f"({count / elapsed if elapsed else 0:,.0f} rows/s)",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
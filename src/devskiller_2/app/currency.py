@@ -30,12 +30,32 @@ That being said, `_value2member_map_` is technically considered an internal attr
 leading underscore). While it can be used as demonstrated, be cautious if you're planning to use it in
  production code since, in theory, internal details of standard library modules can change. In practice,
   however, such attributes tend to remain stable across versions.
+
+Array-backed structures don't store `Currency` members but their `code`, a dense small
+integer given in declaration order, and map it back with `CURRENCY_BY_CODE`. Every
+member also carries `minor_units`, its ISO 4217 exponent.
 """
 
+import typing
 from enum import Enum
 
+# ISO 4217 exponent: the number of digits after the decimal point of the minor unit.
+MINOR_UNITS = {
+    "PLN": 2,
+    "CZK": 2,
+    "DKK": 2,
+    "EUR": 2,
+    "GBP": 2,
+    "NOK": 2,
+    "USD": 2,
+    "ZAR": 2,
+}
+
 
 class Currency(Enum):
+    code: int
+    minor_units: int
+
     PLN = "PLN"
     CZK = "CZK"
     DKK = "DKK"
@@ -45,6 +65,19 @@ class Currency(Enum):
     USD = "USD"
     ZAR = "ZAR"
 
+    def __init__(self, value: str) -> None:
+        # Plain attributes rather than properties, they're read on every conversion.
+        self.code = len(type(self)._member_names_)
+        self.minor_units = MINOR_UNITS[value]
+
     @classmethod
     def is_member(cls, value: str) -> bool:
         return value in cls._value2member_map_
+
+    @classmethod
+    def from_code(cls, code: int) -> "Currency":
+        return CURRENCY_BY_CODE[code]
+
+
+# `CURRENCY_BY_CODE[currency.code] is currency`, codes are dense and fit in an uint8.
+CURRENCY_BY_CODE: typing.Tuple[Currency, ...] = tuple(Currency)
@@ -0,0 +1,155 @@
+"""
+Not every currency has a rate against the base currency: `RATES[Currency.ZAR]` is
+`None`. We may still know how ZAR trades against some other currency, in which case
+the quotation can be triangulated, e.g. ZAR -> EUR -> PLN.
+
+`CurrencyGraph` stores direct pair quotes as edges between currencies and resolves
+a missing quotation by walking the path with the fewest hops (a breadth-first
+search). Fewer hops means fewer rounded operations, so that is also the most precise
+path. The product along a path is computed as the product of the forward rates
+divided by the product of the inverted ones, so a two-hop path through the base
+currency gives exactly the same `Decimal` as dividing the two base rates.
+
+Paths and resolved rates are cached per pair. Changing the rate of an edge only drops
+the cached rates of the pairs whose path uses that edge; their paths stay valid.
+Adding an edge may make any path shorter, so it clears the path cache, but that is
+rare compared to rate updates. Once warmed up, `rate()` is a single dict lookup,
+however many currencies the graph holds.
+
+Nodes can be any hashable values, `ExchangeRateService` uses `Currency` members.
+"""
+
+import collections
+import decimal
+import typing
+
+Node = typing.Hashable
+EdgeKey = typing.Tuple[Node, Node]
+# An edge on a path: the key of the quote and whether it is walked against its direction.
+PathEdge = typing.Tuple[EdgeKey, bool]
+Pair = typing.Tuple[Node, Node]
+
+
+class CurrencyGraph:
+    def __init__(self) -> None:
+        self._quotes: typing.Dict[EdgeKey, decimal.Decimal] = {}
+        self._neighbours: typing.Dict[Node, typing.Dict[Node, PathEdge]] = {}
+        self._paths: typing.Dict[Pair, typing.Optional[typing.Tuple[PathEdge, ...]]] = {}
+        self._resolved: typing.Dict[Pair, typing.Optional[decimal.Decimal]] = {}
+        self._dependents: typing.Dict[EdgeKey, typing.Set[Pair]] = collections.defaultdict(
+            set
+        )
+
+    def __len__(self) -> int:
+        return len(self._quotes)
+
+    def set_quote(
+        self, base: Node, quote: Node, rate: typing.Optional[decimal.Decimal]
+    ) -> None:
+        """Sets the direct quote: one unit of `base` is worth `rate` units of `quote`."""
+        if not rate:
+            self.remove_quote(base, quote)
+            return
+
+        key = (base, quote)
+        if key in self._quotes:
+            self._quotes[key] = decimal.Decimal(rate)
+            for pair in self._dependents.get(key, ()):
+                self._resolved.pop(pair, None)
+            return
+
+        self.remove_quote(quote, base)
+        self._quotes[key] = decimal.Decimal(rate)
+        self._neighbours.setdefault(base, {})[quote] = (key, False)
+        self._neighbours.setdefault(quote, {})[base] = (key, True)
+        self._paths.clear()
+        self._resolved.clear()
+        self._dependents.clear()
+
+    def remove_quote(self, base: Node, quote: Node) -> None:
+        key = (base, quote)
+        if self._quotes.pop(key, None) is None:
+            return
+
+        del self._neighbours[base][quote]
+        del self._neighbours[quote][base]
+        for pair in self._dependents.pop(key, ()):
+            self._paths.pop(pair, None)
+            self._resolved.pop(pair, None)
+
+    def path(self, origin: Node, target: Node) -> typing.Optional[typing.List[Node]]:
+        """Returns the currencies visited from `origin` to `target`, or None."""
+        edges = self._path((origin, target))
+        if edges is None:
+            return None
+
+        nodes = [origin]
+        for (base, quote), inverted in edges:
+            nodes.append(base if inverted else quote)
+        return nodes
+
+    def rate(self, origin: Node, target: Node) -> typing.Optional[decimal.Decimal]:
+        """Returns how many `target` units one `origin` unit is worth, or None."""
+        pair = (origin, target)
+        try:
+            return self._resolved[pair]
+        except KeyError:
+            pass
+
+        edges = self._path(pair)
+        rate = None if edges is None else self._multiply(edges)
+        self._resolved[pair] = rate
+        return rate
+
+    def _path(self, pair: Pair) -> typing.Optional[typing.Tuple[PathEdge, ...]]:
+        try:
+            return self._paths[pair]
+        except KeyError:
+            pass
+
+        edges = self._find_path(*pair)
+        self._paths[pair] = edges
+        for key, _ in edges or ():
+            self._dependents[key].add(pair)
+        return edges
+
+    def _find_path(
+        self, origin: Node, target: Node
+    ) -> typing.Optional[typing.Tuple[PathEdge, ...]]:
+        if origin == target:
+            return ()
+
+        previous: typing.Dict[Node, typing.Optional[typing.Tuple[Node, PathEdge]]] = {
+            origin: None
+        }
+        queue = collections.deque([origin])
+        while queue:
+            node = queue.popleft()
+            for neighbour, edge in self._neighbours.get(node, {}).items():
+                if neighbour in previous:
+                    continue
+                previous[neighbour] = (node, edge)
+                if neighbour == target:
+                    return self._backtrack(previous, target)
+                queue.append(neighbour)
+        return None
+
+    @staticmethod
+    def _backtrack(previous, target: Node) -> typing.Tuple[PathEdge, ...]:
+        edges = []
+        step = previous[target]
+        while step is not None:
+            node, edge = step
+            edges.append(edge)
+            step = previous[node]
+        return tuple(reversed(edges))
+
+    def _multiply(self, edges: typing.Tuple[PathEdge, ...]) -> decimal.Decimal:
+        numerator = decimal.Decimal(1)
+        denominator = decimal.Decimal(1)
+        for key, inverted in edges:
+            if inverted:
+                denominator *= self._quotes[key]
+            else:
+                numerator *= self._quotes[key]
+        return numerator / denominator
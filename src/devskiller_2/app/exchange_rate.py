@@ -1,52 +1,268 @@
-""" 
-To determine the quotation of one currency to another, we would divide 
-the exchange rate of the origin currency by the exchange rate of the 
+"""
+To determine the quotation of one currency to another, we would divide
+the exchange rate of the origin currency by the exchange rate of the
 target currency. This will give us the rate at which one unit of the origin
  currency is exchanged for the target currency.
 
+There are only a handful of currencies, so instead of dividing on every call the
+service keeps an N x N matrix of all cross rates. The matrix is built lazily on the
+first quotation, and `update_rate` only recomputes the row and the column of the
+currency that changed. A quotation is then just two index lookups.
+
+The rates and their matrix live in an immutable, versioned `RateSnapshot`.
+Readers grab the current snapshot with a single attribute read and never lock.
+Writers copy the snapshot, apply their change and publish the new one with a single
+attribute assignment, so a reader sees either the old rates or the new ones, never
+a torn mix of the two. `update_rates` publishes several rates in one version.
+
+Quotations that the base rates can't provide, like anything involving ZAR, are
+triangulated through a `CurrencyGraph` of direct pair quotes added with
+`set_pair_rate`. The base rates are edges of the same graph, all meeting in one
+reference node. Resolved paths are cached by the graph and copied into every
+published matrix, so triangulated quotations are O(1) lookups as well.
+
+With `use_shared_rates`, the base rates live in a `SharedRateTable` that several
+processes map, see `app.shared_rates`. Every process publishes a new snapshot of its
+own as soon as it notices the table has changed.
+
 Here's how you can implement the quotation method:
 """
 
 
 import decimal
+import threading
+import types
 import typing
 
-from app.currency import Currency
+from app import metrics
+from app.currency import CURRENCY_BY_CODE, Currency
+from app.currency_graph import CurrencyGraph
+from app.exceptions import QuotationError
 from app.rates import RATES
 
+if typing.TYPE_CHECKING:
+    from app.shared_rates import SharedRateTable
+
+# Graph node every base rate connects to: one unit of a currency is worth `rate` of it.
+_RATES_BASE = "RATES_BASE"
+
+QuotationMatrix = typing.Tuple[typing.Tuple[typing.Optional[decimal.Decimal], ...], ...]
+
+
+def _cross_rate(
+    rates: typing.Mapping[Currency, typing.Optional[decimal.Decimal]],
+    origin: Currency,
+    target: Currency,
+) -> typing.Optional[decimal.Decimal]:
+    origin_rate = rates.get(origin)
+    target_rate = rates.get(target)
+
+    # Ensure both rates are present and are not zero
+    if not origin_rate or not target_rate:
+        return None
+
+    # Exchange rate is the original rate divided by the target rate
+    return decimal.Decimal(origin_rate) / decimal.Decimal(target_rate)
+
+
+def _triangulate(
+    rates: typing.Mapping[Currency, typing.Optional[decimal.Decimal]],
+    quotations: typing.List[typing.List[typing.Optional[decimal.Decimal]]],
+    graph: typing.Optional[CurrencyGraph],
+) -> None:
+    """Fills the pairs the base rates can't quote with rates resolved by `graph`."""
+    if graph is None:
+        return
+    for origin_index, origin in enumerate(CURRENCY_BY_CODE):
+        for target_index, target in enumerate(CURRENCY_BY_CODE):
+            if not rates.get(origin) or not rates.get(target):
+                quotations[origin_index][target_index] = graph.rate(origin, target)
+
+
+class RateSnapshot(typing.NamedTuple):
+    version: int
+    rates: typing.Mapping[Currency, typing.Optional[decimal.Decimal]]
+    quotations: QuotationMatrix
+
+    @classmethod
+    def build(
+        cls,
+        version: int,
+        rates: typing.Mapping[Currency, typing.Optional[decimal.Decimal]],
+        graph: typing.Optional[CurrencyGraph] = None,
+    ) -> "RateSnapshot":
+        quotations = [
+            [_cross_rate(rates, origin, target) for target in CURRENCY_BY_CODE]
+            for origin in CURRENCY_BY_CODE
+        ]
+        _triangulate(rates, quotations, graph)
+        return cls(
+            version,
+            types.MappingProxyType(dict(rates)),
+            tuple(tuple(row) for row in quotations),
+        )
+
+    def updated(
+        self,
+        changes: typing.Mapping[Currency, typing.Optional[decimal.Decimal]],
+        graph: typing.Optional[CurrencyGraph] = None,
+    ) -> "RateSnapshot":
+        """Returns the next version, recomputing only the rows and columns of `changes`."""
+        rates = dict(self.rates)
+        rates.update(changes)
+
+        quotations = [list(row) for row in self.quotations]
+        for changed in changes:
+            if not isinstance(changed, Currency):
+                continue
+            index = changed.code
+            for other_index, other in enumerate(CURRENCY_BY_CODE):
+                quotations[index][other_index] = _cross_rate(rates, changed, other)
+                quotations[other_index][index] = _cross_rate(rates, other, changed)
+        _triangulate(rates, quotations, graph)
+
+        return type(self)(
+            self.version + 1,
+            types.MappingProxyType(rates),
+            tuple(tuple(row) for row in quotations),
+        )
+
+    def __reduce__(self):
+        # The mapping proxy can't be pickled, so the rates travel as a plain dict.
+        return _unpickle_snapshot, (self.version, dict(self.rates), self.quotations)
+
+    def quotation(self, origin: Currency, target: Currency) -> decimal.Decimal:
+        # Every quotation goes through here, `Cash.to()`, `CashArray` and
+        # `convert_batch()` included, so this is where metrics count them. Without
+        # metrics, the lookup is done in place rather than through `_quotation`.
+        if metrics.registry is not None:
+            return metrics.registry.observe_quotation(self._quotation, origin, target)
+        try:
+            rate = self.quotations[origin.code][target.code]
+        except AttributeError:
+            rate = None
+
+        if rate is None:
+            raise _quotation_error(origin, target)
+        return rate
+
+    def _quotation(self, origin: Currency, target: Currency) -> decimal.Decimal:
+        try:
+            rate = self.quotations[origin.code][target.code]
+        except AttributeError:
+            rate = None
+
+        if rate is None:
+            raise _quotation_error(origin, target)
+        return rate
+
+
+def _quotation_error(origin: Currency, target: Currency) -> QuotationError:
+    return QuotationError(
+        f"Invalid rate for {getattr(origin, 'name', origin)}/"
+        f"{getattr(target, 'name', target)} currency pair"
+    )
+
+
+def _unpickle_snapshot(
+    version: int,
+    rates: typing.Dict[Currency, typing.Optional[decimal.Decimal]],
+    quotations: QuotationMatrix,
+) -> RateSnapshot:
+    return RateSnapshot(version, types.MappingProxyType(rates), quotations)
+
 
 class ExchangeRateService:
     _rates = RATES
+    _snapshot: typing.Optional[RateSnapshot] = None
+    _graph: typing.Optional[CurrencyGraph] = None
+    _write_lock = threading.RLock()
+    _shared: typing.Optional["SharedRateTable"] = None
+    _shared_sequence: typing.Optional[int] = None
+
+    @property
+    def snapshot(self) -> RateSnapshot:
+        """The current rates; hold on to it to get several consistent quotations."""
+        shared = self._shared
+        if shared is not None and shared.sequence != self._shared_sequence:
+            return self._publish(self._sync_shared)
+        return self._snapshot or self._publish(
+            lambda: self._snapshot or self._initial_snapshot()
+        )
+
+    def use_shared_rates(self, table: typing.Optional["SharedRateTable"]) -> None:
+        """Reads and writes the base rates in `table`, shared by processes; None detaches."""
+        with self._write_lock:
+            type(self)._shared = table
+            type(self)._shared_sequence = None
 
     def update_rate(self, currency: Currency, rate: decimal.Decimal):
-        self._rates[currency] = rate
+        self.update_rates({currency: rate})
 
-    def get_rate(self, currency: Currency) -> typing.Optional[decimal.Decimal]:
-        try:
-            return self._rates[currency]
-        except KeyError:
-            return None
+    def update_rates(
+        self, rates: typing.Mapping[Currency, typing.Optional[decimal.Decimal]]
+    ) -> RateSnapshot:
+        """Publishes all of `rates` together, as a single new snapshot version."""
 
-    def quotation(
-        self, origin: Currency, target: Currency
-    ) -> typing.Optional[decimal.Decimal]:
-        """TODO: Part 2"""
+        def build() -> RateSnapshot:
+            if self._shared is not None:
+                self._shared.update(rates)
+                return self._sync_shared()
+            snapshot = self.snapshot
+            for currency, rate in rates.items():
+                self._graph.set_quote(currency, _RATES_BASE, rate)
+            return snapshot.updated(rates, self._graph)
+
+        return self._publish(build)
+
+    def set_pair_rate(
+        self, base: Currency, quote: Currency, rate: typing.Optional[decimal.Decimal]
+    ) -> RateSnapshot:
+        """Publishes a direct quote, one `base` is worth `rate` `quote`; None removes it."""
+
+        def build() -> RateSnapshot:
+            snapshot = self.snapshot
+            self._graph.set_quote(base, quote, rate)
+            return snapshot.updated({}, self._graph)
+
+        return self._publish(build)
+
+    def get_rate(self, currency: Currency) -> typing.Optional[decimal.Decimal]:
+        return self.snapshot.rates.get(currency)
 
     def quotation(
         self, origin: Currency, target: Currency
     ) -> typing.Optional[decimal.Decimal]:
         """Returns the exchange rate for the supplied currency pair."""
-        origin_rate = self.get_rate(origin)
-        target_rate = self.get_rate(target)
+        return self.snapshot.quotation(origin, target)
+
+    def _initial_snapshot(self) -> RateSnapshot:
+        graph = CurrencyGraph()
+        for currency, rate in self._rates.items():
+            graph.set_quote(currency, _RATES_BASE, rate)
+        type(self)._graph = graph
+        return RateSnapshot.build(0, self._rates, graph)
 
-        # Ensure both rates are present and are not zero
-        if not origin_rate or not target_rate or target_rate == decimal.Decimal("0"):
-            raise QuotationError(
-                f"Invalid rate for {origin.name}/{target.name} currency pair"
-            )
+    def _sync_shared(self) -> RateSnapshot:
+        """Applies the rates of the shared table that differ from the current snapshot."""
+        snapshot = self._snapshot or self._initial_snapshot()
+        sequence, rates = self._shared.read()
+        changes = {
+            currency: rate
+            for currency, rate in rates.items()
+            if snapshot.rates.get(currency) != rate
+        }
+        for currency, rate in changes.items():
+            self._graph.set_quote(currency, _RATES_BASE, rate)
+        type(self)._shared_sequence = sequence
+        return snapshot.updated(changes, self._graph) if changes else snapshot
 
-        # Return exchange rate by dividing original rate by target rate
-        return decimal.Decimal(origin_rate) / decimal.Decimal(target_rate)
+    def _publish(self, build: typing.Callable[[], RateSnapshot]) -> RateSnapshot:
+        # Only writers take the lock, so concurrent updates never lose each other.
+        with self._write_lock:
+            snapshot = build()
+            type(self)._snapshot = snapshot
+        return snapshot
 
 
 exchange_rate_service = ExchangeRateService()
@@ -0,0 +1,198 @@
+"""
+`ExchangeRateService` only knows the rate in force right now. To revalue an old
+transaction we need the rate that was in force on its booking date, so
+`HistoricalRateStore` keeps the whole history of every currency's rate against the
+base currency, the same kind of rates as `app.rates.RATES`. The base currency itself
+is worth 1 at every point in time and needs no history of its own.
+
+Each currency has a sorted list of timestamps and a parallel list of rates. The rate
+in force at `as_of` is the last one published at or before it, which `bisect` finds
+in O(log n). `quotations_as_of` resolves a whole column of timestamps with
+`numpy.searchsorted` and divides each distinct pair of rates only once.
+
+Timestamps can be `datetime`, `date` or ISO 8601 strings; naive values are taken
+as UTC. History is loaded from CSV files with `timestamp,currency,rate` columns:
+
+```
+timestamp,currency,rate
+2023-01-02,EUR,4.6899
+2023-01-03T12:00:00,EUR,4.7011
+```
+"""
+
+import bisect
+import csv
+import datetime
+import decimal
+import typing
+
+import numpy as np
+
+from app.currency import Currency
+from app.exceptions import InvalidCurrencyError, QuotationError
+from app.rates import RATES
+
+Timestamp = typing.Union[datetime.datetime, datetime.date, str]
+
+_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+_MICROSECOND = datetime.timedelta(microseconds=1)
+# Earlier than any real timestamp, the base currency's rate of 1 holds from here on.
+_BEGINNING = int(np.iinfo(np.int64).min)
+_BASE_CURRENCY = next(currency for currency, rate in RATES.items() if rate == 1)
+
+
+def _to_micros(timestamp: Timestamp) -> int:
+    """Returns `timestamp` as microseconds since the Unix epoch."""
+    if isinstance(timestamp, str):
+        timestamp = datetime.datetime.fromisoformat(timestamp)
+    if not isinstance(timestamp, datetime.datetime):
+        timestamp = datetime.datetime.combine(timestamp, datetime.time())
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=datetime.timezone.utc)
+    return (timestamp - _EPOCH) // _MICROSECOND
+
+
+def _to_micros_array(timestamps: typing.Iterable[Timestamp]) -> np.ndarray:
+    if isinstance(timestamps, np.ndarray) and timestamps.dtype.kind == "M":
+        return timestamps.astype("datetime64[us]").astype(np.int64)
+    return np.array([_to_micros(timestamp) for timestamp in timestamps], dtype=np.int64)
+
+
+class _RateHistory:
+    __slots__ = "timestamps", "rates", "_array"
+
+    def __init__(self) -> None:
+        self.timestamps: typing.List[int] = []
+        self.rates: typing.List[typing.Optional[decimal.Decimal]] = []
+        self._array: typing.Optional[np.ndarray] = None
+
+    @property
+    def array(self) -> np.ndarray:
+        if self._array is None:
+            self._array = np.array(self.timestamps, dtype=np.int64)
+        return self._array
+
+    def add(self, timestamp: int, rate: typing.Optional[decimal.Decimal]) -> None:
+        index = bisect.bisect_left(self.timestamps, timestamp)
+        if index < len(self.timestamps) and self.timestamps[index] == timestamp:
+            self.rates[index] = rate
+        else:
+            self.timestamps.insert(index, timestamp)
+            self.rates.insert(index, rate)
+            self._array = None
+
+    def extend(
+        self, entries: typing.Iterable[typing.Tuple[int, typing.Optional[decimal.Decimal]]]
+    ) -> None:
+        # Later entries win over earlier ones with the same timestamp, like `add`.
+        merged = dict(zip(self.timestamps, self.rates))
+        merged.update(entries)
+        self.timestamps = sorted(merged)
+        self.rates = [merged[timestamp] for timestamp in self.timestamps]
+        self._array = None
+
+    def index_as_of(self, timestamp: int) -> int:
+        return bisect.bisect_right(self.timestamps, timestamp) - 1
+
+
+class HistoricalRateStore:
+    def __init__(self) -> None:
+        self._histories: typing.Dict[Currency, _RateHistory] = {}
+        self._history(_BASE_CURRENCY).add(_BEGINNING, decimal.Decimal(1))
+
+    def add_rate(
+        self,
+        currency: Currency,
+        timestamp: Timestamp,
+        rate: typing.Optional[decimal.Decimal],
+    ) -> None:
+        self._history(currency).add(_to_micros(timestamp), rate)
+
+    def load_csv(self, path: str) -> int:
+        """Bulk-loads `timestamp,currency,rate` rows and returns how many were read."""
+        entries: typing.Dict[Currency, list] = {}
+        count = 0
+        with open(path, newline="") as file:
+            for row in csv.DictReader(file):
+                if not Currency.is_member(row["currency"]):
+                    raise InvalidCurrencyError(row["currency"])
+                rate = row["rate"].strip()
+                entries.setdefault(Currency(row["currency"]), []).append(
+                    (
+                        _to_micros(row["timestamp"]),
+                        decimal.Decimal(rate) if rate else None,
+                    )
+                )
+                count += 1
+
+        for currency, currency_entries in entries.items():
+            self._history(currency).extend(currency_entries)
+        return count
+
+    def get_rate(
+        self, currency: Currency, as_of: Timestamp
+    ) -> typing.Optional[decimal.Decimal]:
+        """Returns the rate of `currency` in force at `as_of`, if there was one."""
+        history = self._histories.get(currency)
+        if history is None:
+            return None
+        index = history.index_as_of(_to_micros(as_of))
+        return history.rates[index] if index >= 0 else None
+
+    def quotation(
+        self, origin: Currency, target: Currency, as_of: Timestamp
+    ) -> decimal.Decimal:
+        """Returns the exchange rate for the currency pair as it was at `as_of`."""
+        origin_rate = self.get_rate(origin, as_of)
+        target_rate = self.get_rate(target, as_of)
+        if not origin_rate or not target_rate:
+            raise QuotationError(
+                f"Invalid rate for {getattr(origin, 'name', origin)}/"
+                f"{getattr(target, 'name', target)} currency pair as of {as_of}"
+            )
+        return origin_rate / target_rate
+
+    def quotations_as_of(
+        self,
+        origin: Currency,
+        target: Currency,
+        timestamps: typing.Iterable[Timestamp],
+    ) -> typing.List[decimal.Decimal]:
+        """Returns the quotation in force at each of `timestamps`, in order."""
+        queries = _to_micros_array(timestamps)
+        origin_history = self._histories.get(origin)
+        target_history = self._histories.get(target)
+        if origin_history is None or target_history is None:
+            raise QuotationError(
+                f"No rate history for {getattr(origin, 'name', origin)}/"
+                f"{getattr(target, 'name', target)} currency pair"
+            )
+
+        origin_indexes = np.searchsorted(origin_history.array, queries, "right") - 1
+        target_indexes = np.searchsorted(target_history.array, queries, "right") - 1
+        if len(queries) and min(origin_indexes.min(), target_indexes.min()) < 0:
+            raise QuotationError(
+                f"No rate for {origin.name}/{target.name} before "
+                f"{np.datetime64(int(queries.min()), 'us')}"
+            )
+
+        # Neighbouring timestamps mostly share their rates, so divide each pair once.
+        pairs = origin_indexes * len(target_history.rates) + target_indexes
+        unique_pairs, inverse = np.unique(pairs, return_inverse=True)
+        quotations = []
+        for pair in unique_pairs:
+            origin_index, target_index = divmod(int(pair), len(target_history.rates))
+            origin_rate = origin_history.rates[origin_index]
+            target_rate = target_history.rates[target_index]
+            if not origin_rate or not target_rate:
+                raise QuotationError(
+                    f"Invalid rate for {origin.name}/{target.name} currency pair"
+                )
+            quotations.append(origin_rate / target_rate)
+
+        return [quotations[index] for index in inverse.ravel()]
+
+    def _history(self, currency: Currency) -> _RateHistory:
+        if not isinstance(currency, Currency):
+            raise InvalidCurrencyError
+        return self._histories.setdefault(currency, _RateHistory())
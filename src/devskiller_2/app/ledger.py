@@ -0,0 +1,63 @@
+"""
+Summing mixed-currency `Cash` values with `sum()` converts every right-hand operand
+into the accumulator's currency, which costs one quotation and one rounding per
+element. A `Ledger` instead keeps one plain `Decimal` total per `Currency`, and only
+converts when a total in a specific currency is requested. That is at most one
+conversion per currency, however many amounts were added.
+
+Rounding happens once per currency rather than once per element, so a ledger total
+can differ from the equivalent `sum()` by the per-element rounding that `sum()` does.
+
+Example:
+
+```python
+ledger = Ledger([Cash("10", Currency.PLN), Cash("5", Currency.EUR)])
+ledger.add(Cash("2.50", Currency.EUR))
+ledger.total(Currency.PLN)  # 44.1250 PLN
+```
+"""
+
+import decimal
+import typing
+
+from app.cash import Cash
+from app.currency import Currency
+
+
+class Ledger:
+    __slots__ = ("_totals",)
+
+    def __init__(self, values: typing.Iterable[Cash] = ()) -> None:
+        self._totals: typing.Dict[Currency, decimal.Decimal] = {}
+        for value in values:
+            self.add(value)
+
+    def __repr__(self) -> str:
+        return f"Ledger({list(self.totals_by_currency().values())})"
+
+    def __len__(self) -> int:
+        return len(self._totals)
+
+    def add(self, cash: Cash) -> None:
+        self._apply(cash.currency, cash.amount)
+
+    def remove(self, cash: Cash) -> None:
+        self._apply(cash.currency, -cash.amount)
+
+    def totals_by_currency(self) -> typing.Dict[Currency, Cash]:
+        """Returns the running total of every currency with a non-zero balance."""
+        return {currency: Cash(total, currency) for currency, total in self._totals.items()}
+
+    def total(self, currency: Currency) -> Cash:
+        """Returns the balance in `currency`, converting each per-currency total once."""
+        amount = decimal.Decimal("0")
+        for origin, total in self._totals.items():
+            amount += Cash(total, origin).to(currency).amount
+        return Cash(amount, currency)
+
+    def _apply(self, currency: Currency, amount: decimal.Decimal) -> None:
+        total = self._totals.get(currency, 0) + amount
+        if total:
+            self._totals[currency] = total
+        else:
+            self._totals.pop(currency, None)
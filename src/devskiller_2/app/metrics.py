@@ -0,0 +1,276 @@
+"""
+Opt-in instrumentation of `RateSnapshot.quotation()`, which serves every quotation
+of `ExchangeRateService`, and `Cash.to()`.
+
+`enable_metrics()` installs a `MetricsRegistry` that counts quotations and
+conversions per currency pair, records the latency of every conversion in a
+histogram, counts `CurrencyExchangeError`s by type and reports the hit ratio of the
+conversion cache. While metrics are disabled, the instrumented methods only pay for
+checking that `registry` is None.
+
+`registry.snapshot()` returns an immutable copy of everything for in-process use,
+e.g. `snapshot.conversion_latency.quantile(0.99)`, and `registry.to_prometheus()`
+renders the same data in the Prometheus text exposition format.
+
+Example:
+
+```python
+registry = enable_metrics()
+...
+print(registry.snapshot().quotations[("EUR", "PLN")])
+print(registry.to_prometheus())
+```
+"""
+
+import bisect
+import collections
+import threading
+import time
+import typing
+
+from app.exceptions import CurrencyExchangeError
+
+Pair = typing.Tuple[str, str]
+
+# Upper bounds in seconds, a `Cash.to()` takes a few microseconds.
+DEFAULT_LATENCY_BUCKETS = (
+    0.000001,
+    0.0000025,
+    0.000005,
+    0.00001,
+    0.000025,
+    0.00005,
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.01,
+    0.1,
+)
+
+T = typing.TypeVar("T")
+
+
+class HistogramSnapshot(typing.NamedTuple):
+    buckets: typing.Tuple[float, ...]
+    # Not cumulative, `counts[-1]` is the overflow bucket above the last bound.
+    counts: typing.Tuple[int, ...]
+    sum: float
+    count: int
+
+    def quantile(self, q: float) -> float:
+        """Estimates the `q` quantile, interpolating inside its bucket like Prometheus."""
+        if not self.count:
+            return float("nan")
+
+        rank = q * self.count
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            if cumulative + count >= rank and count:
+                if index == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[index - 1] if index else 0.0
+                upper = self.buckets[index]
+                return lower + (upper - lower) * (rank - cumulative) / count
+            cumulative += count
+        return self.buckets[-1]
+
+
+class CacheStats(typing.NamedTuple):
+    hits: int
+    misses: int
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class MetricsSnapshot(typing.NamedTuple):
+    elapsed: float
+    quotations: typing.Mapping[Pair, int]
+    conversions: typing.Mapping[Pair, int]
+    errors: typing.Mapping[str, int]
+    conversion_latency: HistogramSnapshot
+    caches: typing.Mapping[str, CacheStats]
+
+    @property
+    def quotations_per_second(self) -> float:
+        return sum(self.quotations.values()) / self.elapsed if self.elapsed else 0.0
+
+
+class Histogram:
+    def __init__(self, buckets: typing.Sequence[float] = DEFAULT_LATENCY_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+
+    def observe(self, value: float) -> None:
+        self._counts[bisect.bisect_left(self.buckets, value)] += 1
+        self._sum += value
+        self._count += 1
+
+    def snapshot(self) -> HistogramSnapshot:
+        return HistogramSnapshot(
+            self.buckets, tuple(self._counts), self._sum, self._count
+        )
+
+
+class MetricsRegistry:
+    def __init__(
+        self, latency_buckets: typing.Sequence[float] = DEFAULT_LATENCY_BUCKETS
+    ) -> None:
+        self._started = time.monotonic()
+        self._lock = threading.Lock()
+        # Keyed by the raw arguments, they're only turned into names by `snapshot()`.
+        self._quotations: typing.Counter[typing.Tuple[typing.Any, typing.Any]] = (
+            collections.Counter()
+        )
+        self._conversions: typing.Counter[typing.Tuple[typing.Any, typing.Any]] = (
+            collections.Counter()
+        )
+        self._errors: typing.Counter[str] = collections.Counter()
+        self._conversion_latency = Histogram(latency_buckets)
+        self._caches: typing.Dict[str, typing.Any] = {}
+
+    def register_cache(self, name: str, cache: typing.Any) -> None:
+        """Reports the `hits` and `misses` attributes of `cache` under `name`."""
+        self._caches[name] = cache
+
+    def observe_quotation(
+        self, quote: typing.Callable[[typing.Any, typing.Any], T], origin, target
+    ) -> T:
+        try:
+            return quote(origin, target)
+        except CurrencyExchangeError as error:
+            self._count_error(error)
+            raise
+        finally:
+            with self._lock:
+                self._quotations[origin, target] += 1
+
+    def observe_conversion(
+        self, convert: typing.Callable[[typing.Any], T], origin, target
+    ) -> T:
+        started = time.perf_counter()
+        try:
+            return convert(target)
+        except CurrencyExchangeError as error:
+            self._count_error(error)
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self._conversions[origin, target] += 1
+                self._conversion_latency.observe(elapsed)
+
+    def snapshot(self) -> MetricsSnapshot:
+        caches = dict(self._caches)
+        conversion_cache = _conversion_cache()
+        if conversion_cache is not None:
+            caches.setdefault("conversion", conversion_cache)
+
+        with self._lock:
+            return MetricsSnapshot(
+                time.monotonic() - self._started,
+                _by_name(self._quotations),
+                _by_name(self._conversions),
+                dict(self._errors),
+                self._conversion_latency.snapshot(),
+                {
+                    name: CacheStats(cache.hits, cache.misses)
+                    for name, cache in caches.items()
+                },
+            )
+
+    def to_prometheus(self, prefix: str = "cash") -> str:
+        snapshot = self.snapshot()
+        lines: typing.List[str] = []
+
+        def family(name: str, kind: str, help_text: str) -> str:
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            return f"{prefix}_{name}"
+
+        metric = family(
+            "quotations_total", "counter", "Quotations served by ExchangeRateService."
+        )
+        for (origin, target), count in sorted(snapshot.quotations.items()):
+            lines.append(f'{metric}{{origin="{origin}",target="{target}"}} {count}')
+
+        metric = family("conversions_total", "counter", "Conversions made by Cash.to().")
+        for (origin, target), count in sorted(snapshot.conversions.items()):
+            lines.append(f'{metric}{{origin="{origin}",target="{target}"}} {count}')
+
+        metric = family("errors_total", "counter", "Currency exchange errors by type.")
+        for error, count in sorted(snapshot.errors.items()):
+            lines.append(f'{metric}{{error="{error}"}} {count}')
+
+        histogram = snapshot.conversion_latency
+        metric = family(
+            "conversion_latency_seconds", "histogram", "Latency of Cash.to() conversions."
+        )
+        cumulative = 0
+        for bound, count in zip(histogram.buckets, histogram.counts):
+            cumulative += count
+            lines.append(f'{metric}_bucket{{le="{bound!r}"}} {cumulative}')
+        lines.append(f'{metric}_bucket{{le="+Inf"}} {histogram.count}')
+        lines.append(f"{metric}_sum {histogram.sum!r}")
+        lines.append(f"{metric}_count {histogram.count}")
+
+        for name, attribute in (
+            ("cache_hits_total", "hits"),
+            ("cache_misses_total", "misses"),
+        ):
+            metric = family(name, "counter", f"Cache {attribute} by cache.")
+            for cache, stats in sorted(snapshot.caches.items()):
+                lines.append(f'{metric}{{cache="{cache}"}} {getattr(stats, attribute)}')
+
+        return "\n".join(lines) + "\n"
+
+    def _count_error(self, error: Exception) -> None:
+        # A quotation error propagates through the conversion that asked for the
+        # quotation, count it once.
+        if getattr(error, "_counted_by", None) is self:
+            return
+        error._counted_by = self  # type: ignore[attr-defined]
+        with self._lock:
+            self._errors[type(error).__name__] += 1
+
+
+def _name(currency: typing.Any) -> str:
+    return getattr(currency, "value", str(currency))
+
+
+def _by_name(
+    counter: typing.Counter[typing.Tuple[typing.Any, typing.Any]]
+) -> typing.Dict[Pair, int]:
+    pairs: typing.Counter[Pair] = collections.Counter()
+    for (origin, target), count in counter.items():
+        pairs[_name(origin), _name(target)] += count
+    return dict(pairs)
+
+
+def _conversion_cache():
+    from app import cash
+
+    return cash._conversion_cache
+
+
+# Checked by the instrumented methods, None while metrics are disabled.
+registry: typing.Optional[MetricsRegistry] = None
+
+
+def enable_metrics(
+    latency_buckets: typing.Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+) -> MetricsRegistry:
+    global registry
+    registry = MetricsRegistry(latency_buckets)
+    return registry
+
+
+def disable_metrics() -> None:
+    global registry
+    registry = None
@@ -0,0 +1,144 @@
+"""
+Worker processes, e.g. gunicorn or `multiprocessing` workers, each hold their own
+rates, so an `update_rate` in one of them isn't seen by the others.
+
+`SharedRateTable` keeps the rate of every `Currency` in a block of
+`multiprocessing.shared_memory` that all processes map. The block is a vector of
+int64 words:
+
+    [sequence, coefficient_0, exponent_0, coefficient_1, exponent_1, ...]
+
+with one `Decimal` rate per currency, in the order of `Currency.code`, stored as an integer
+coefficient and a power of ten. A missing rate has the exponent `_MISSING`.
+
+The table is guarded by a seqlock. A writer makes the sequence odd, writes the rates
+and makes it even again. A reader copies the rates between two reads of the sequence
+and retries if it was odd or has changed meanwhile, so it never sees a half written
+vector, and it never blocks a writer. Readers don't take any lock and don't make a
+syscall, the memory is simply mapped into the process.
+
+Writers must not interleave, they take `lock`. Pass the same
+`multiprocessing.Lock` to every process that writes, e.g. by creating the table
+before forking the workers; the default lock only serializes writers of one process.
+Create the table in the parent process too: before Python 3.13, a process that is
+not a fork of the creator unlinks the block it attached to when it exits.
+
+`ExchangeRateService.use_shared_rates(table)` makes the service read its base rates
+from the table. Reading the sequence is all it costs per quotation, the snapshot is
+only rebuilt when the sequence has changed. Direct pair quotes set with
+`set_pair_rate` stay local to the process.
+"""
+
+import decimal
+import threading
+import typing
+from multiprocessing import shared_memory
+
+from app.currency import CURRENCY_BY_CODE, Currency
+
+_WORD_SIZE = 8
+_MISSING = -(2**63)
+_MAX_COEFFICIENT = 2**63 - 1
+
+Rates = typing.Mapping[Currency, typing.Optional[decimal.Decimal]]
+
+
+def _encode(rate: typing.Optional[decimal.Decimal]) -> typing.Tuple[int, int]:
+    if rate is None:
+        return 0, _MISSING
+
+    sign, digits, exponent = decimal.Decimal(rate).normalize().as_tuple()
+    if not isinstance(exponent, int):
+        raise ValueError(f"Rate {rate} is not a finite number")
+    coefficient = int("".join(map(str, digits)) or "0")
+    if coefficient > _MAX_COEFFICIENT:
+        raise ValueError(f"Rate {rate} has too many digits for the shared table")
+    return -coefficient if sign else coefficient, exponent
+
+
+def _decode(coefficient: int, exponent: int) -> typing.Optional[decimal.Decimal]:
+    if exponent == _MISSING:
+        return None
+    return decimal.Decimal(coefficient).scaleb(exponent)
+
+
+class SharedRateTable:
+    def __init__(
+        self, memory: shared_memory.SharedMemory, lock: typing.Any = None
+    ) -> None:
+        self._memory = memory
+        self._words = memory.buf.cast("q")
+        self._lock = lock or threading.Lock()
+
+    @classmethod
+    def create(
+        cls, rates: Rates, name: typing.Optional[str] = None, lock: typing.Any = None
+    ) -> "SharedRateTable":
+        """Allocates a new table holding `rates`; currencies not in `rates` are missing."""
+        memory = shared_memory.SharedMemory(
+            name, create=True, size=(1 + 2 * len(CURRENCY_BY_CODE)) * _WORD_SIZE
+        )
+        table = cls(memory, lock)
+        table.update({currency: rates.get(currency) for currency in CURRENCY_BY_CODE})
+        return table
+
+    @classmethod
+    def attach(cls, name: str, lock: typing.Any = None) -> "SharedRateTable":
+        """Maps the existing table `name`, created by another process."""
+        try:
+            memory = shared_memory.SharedMemory(name, track=False)
+        except TypeError:
+            # Before Python 3.13 every attached block is tracked, which is harmless
+            # in processes forked from the creator as they share its resource tracker.
+            memory = shared_memory.SharedMemory(name)
+        return cls(memory, lock)
+
+    @property
+    def name(self) -> str:
+        return self._memory.name
+
+    @property
+    def sequence(self) -> int:
+        """Even while the table is consistent, changes on every update."""
+        return self._words[0]
+
+    def read(
+        self,
+    ) -> typing.Tuple[int, typing.Dict[Currency, typing.Optional[decimal.Decimal]]]:
+        """Returns a consistent copy of the rates, with the sequence they belong to."""
+        words = self._words
+        while True:
+            sequence = words[0]
+            if sequence & 1:
+                continue
+            values = words[1:].tolist()
+            if words[0] == sequence:
+                break
+
+        return sequence, {
+            currency: _decode(values[2 * index], values[2 * index + 1])
+            for index, currency in enumerate(CURRENCY_BY_CODE)
+        }
+
+    def update(self, rates: Rates) -> int:
+        """Writes `rates` in one step, other currencies keep their rates."""
+        encoded = {
+            currency.code: _encode(rate) for currency, rate in rates.items()
+        }
+        words = self._words
+        with self._lock:
+            sequence = words[0] + 1
+            words[0] = sequence
+            for index, (coefficient, exponent) in encoded.items():
+                words[1 + 2 * index] = coefficient
+                words[2 + 2 * index] = exponent
+            words[0] = sequence + 1
+        return sequence + 1
+
+    def close(self) -> None:
+        self._words.release()
+        self._memory.close()
+
+    def unlink(self) -> None:
+        """Frees the block once every process has closed it; call it in the creator."""
+        self._memory.unlink()
@@ -0,0 +1,44 @@
+"""
+Scaling of `convert_batch()` with the number of worker processes, against a plain
+`Cash.to()` loop. The speedup is bounded by the number of cores and by building the
+resulting `Cash` instances, which happens in the calling process.
+
+Run from the `devskiller_2` directory, optionally with the largest worker count:
+
+    python -m benchmarks.bench_batch_conversion [max_workers]
+"""
+
+import decimal
+import os
+import random
+import sys
+import time
+
+from app.batch_conversion import convert_batch
+from app.cash import Cash
+from app.currency import Currency
+
+SIZE = 1_000_000
+
+
+def run(max_workers: int):
+    random.seed(42)
+    currencies = [currency for currency in Currency if currency != Currency.ZAR]
+    amounts = [decimal.Decimal(random.randrange(10**8)).scaleb(-4) for _ in range(SIZE)]
+    origins = [random.choice(currencies) for _ in range(SIZE)]
+
+    started = time.perf_counter()
+    for amount, origin in zip(amounts, origins):
+        Cash(amount, origin).to(Currency.EUR)
+    baseline = time.perf_counter() - started
+    print(f"{'Cash.to loop':<16} {baseline:6.2f}s")
+
+    for workers in range(1, max_workers + 1):
+        started = time.perf_counter()
+        convert_batch(amounts, origins, Currency.EUR, workers=workers)
+        elapsed = time.perf_counter() - started
+        print(f"{workers:>2} workers{'':<6} {elapsed:6.2f}s  {baseline / elapsed:5.2f}x")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count() or 1)
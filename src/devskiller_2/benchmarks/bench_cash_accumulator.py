@@ -0,0 +1,50 @@
+"""
+A reconciliation style loop summing transactions, mostly in the currency of the
+total, with `total = total + tx` on `Cash` against `total += tx` on a
+`CashAccumulator`.
+
+Run from the `devskiller_2` directory:
+
+    python -m benchmarks.bench_cash_accumulator
+"""
+
+import decimal
+import random
+import time
+
+from app.cash import Cash
+from app.cash_accumulator import CashAccumulator
+from app.currency import Currency
+
+SIZE = 300_000
+
+
+def run():
+    random.seed(42)
+    transactions = [
+        Cash(
+            decimal.Decimal(random.randrange(-10**6, 10**6)).scaleb(-2),
+            Currency.EUR if random.random() < 0.1 else Currency.PLN,
+        )
+        for _ in range(SIZE)
+    ]
+
+    started = time.perf_counter()
+    total = Cash("0", Currency.PLN)
+    for tx in transactions:
+        total = total + tx
+    immutable = time.perf_counter() - started
+
+    started = time.perf_counter()
+    accumulator = CashAccumulator(Currency.PLN)
+    for tx in transactions:
+        accumulator += tx
+    mutable = time.perf_counter() - started
+
+    assert accumulator.freeze() == total
+    print(f"Cash             {immutable / SIZE * 1e9:6.0f} ns/tx")
+    print(f"CashAccumulator  {mutable / SIZE * 1e9:6.0f} ns/tx  ({immutable / mutable:.2f}x)")
+
+
+if __name__ == "__main__":
+    run()
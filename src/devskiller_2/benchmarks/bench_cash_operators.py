@@ -0,0 +1,56 @@
+"""
+Runs the scenarios of `test/test_cash_operators.py` with results built by the trusted
+`Cash._make` against results built by the public `Cash.__init__`, as they were before,
+validating the currency and converting the amount again.
+
+Run from the `devskiller_2` directory:
+
+    python -m benchmarks.bench_cash_operators
+"""
+
+import timeit
+from unittest import mock
+
+from app.cash import Cash
+from app.currency import Currency
+
+NUMBER = 100_000
+
+
+def _make_through_init(cls, amount, currency):
+    return Cash(amount, currency)
+
+
+def _scenarios():
+    usd, pln = Cash("100", Currency.USD), Cash("100", Currency.PLN)
+    other_usd = Cash("28", Currency.USD)
+    return {
+        "add same currency": lambda: usd + other_usd,
+        "add other currency": lambda: pln + other_usd,
+        "add integer": lambda: usd + 15,
+        "radd integer": lambda: 15 + usd,
+        "sub same currency": lambda: usd - other_usd,
+        "sub other currency": lambda: pln - other_usd,
+        "negation": lambda: -usd,
+        "positive": lambda: +usd,
+        "abs": lambda: abs(-usd),
+    }
+
+
+def _measure(statement) -> float:
+    return min(timeit.repeat(statement, number=NUMBER, repeat=5)) / NUMBER
+
+
+def run():
+    for name, statement in _scenarios().items():
+        with mock.patch.object(Cash, "_make", classmethod(_make_through_init)):
+            before = _measure(statement)
+        after = _measure(statement)
+        print(
+            f"{name:<20} __init__ {before * 1e9:6.0f} ns/op"
+            f"  _make {after * 1e9:6.0f} ns/op  ({before / after:.2f}x)"
+        )
+
+
+if __name__ == "__main__":
+    run()
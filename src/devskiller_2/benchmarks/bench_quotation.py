@@ -0,0 +1,56 @@
+"""
+Compares `Cash.to()` and `Cash.__matmul__` with the precomputed quotation matrix
+against the previous implementation, which divided two rates on every call.
+
+Run from the `devskiller_2` directory:
+
+    python -m benchmarks.bench_quotation
+"""
+
+import decimal
+import timeit
+from unittest import mock
+
+from app import cash
+from app.cash import Cash
+from app.currency import Currency
+from app.rates import RATES
+
+NUMBER = 200_000
+
+
+class DividingSnapshot:
+    """The quotation as it was before the matrix: two lookups and a division."""
+
+    version = 0
+
+    def quotation(self, origin, target):
+        return decimal.Decimal(RATES[origin]) / decimal.Decimal(RATES[target])
+
+
+class DividingExchangeRateService:
+    snapshot = DividingSnapshot()
+
+
+def run():
+    value = Cash("1337.42", Currency.EUR)
+    statements = {
+        "Cash.to": lambda: value.to(Currency.USD),
+        "Cash.__matmul__": lambda: value @ Currency.GBP,
+    }
+
+    for name, statement in statements.items():
+        with mock.patch.object(
+            cash, "exchange_rate_service", DividingExchangeRateService()
+        ):
+            before = min(timeit.repeat(statement, number=NUMBER, repeat=5))
+        after = min(timeit.repeat(statement, number=NUMBER, repeat=5))
+        print(
+            f"{name:<16} division {before / NUMBER * 1e9:8.0f} ns/op"
+            f"  matrix {after / NUMBER * 1e9:8.0f} ns/op"
+            f"  speedup {before / after:5.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,97 @@
+"""
+Request handlers that sum cash under their own `TargetCurrency` and wait on I/O in
+between, as in the asyncio and threaded workers. With the target currency in a class
+variable such handlers had to be serialized behind a global lock; with `contextvars`
+they run concurrently. Every handler checks it got its own currency back.
+
+Run from the `devskiller_2` directory:
+
+    python -m benchmarks.bench_target_currency
+"""
+
+import asyncio
+import concurrent.futures
+import itertools
+import threading
+import time
+
+from app.cash import Cash, TargetCurrency
+from app.currency import Currency
+
+TASKS = 1_000
+THREADS = 32
+THREAD_REQUESTS = 320
+IO_SECONDS = 0.005
+CURRENCIES = [Currency.EUR, Currency.USD, Currency.GBP, Currency.CZK]
+
+
+def _handle(currency: Currency) -> bool:
+    total = Cash("10", Currency.PLN) + Cash("15", Currency.PLN) + Cash("2", Currency.EUR)
+    return total.currency == currency
+
+
+async def _async_request(currency: Currency, lock) -> bool:
+    async with lock:
+        with TargetCurrency(currency):
+            await asyncio.sleep(IO_SECONDS)
+            return _handle(currency)
+
+
+def _thread_request(currency: Currency, lock) -> bool:
+    with lock:
+        with TargetCurrency(currency):
+            time.sleep(IO_SECONDS)
+            return _handle(currency)
+
+
+class _NoLock:
+    async def __aenter__(self):
+        pass
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+def _run_tasks(lock) -> float:
+    async def main():
+        currencies = itertools.islice(itertools.cycle(CURRENCIES), TASKS)
+        return await asyncio.gather(*(_async_request(c, lock) for c in currencies))
+
+    started = time.perf_counter()
+    results = asyncio.run(main())
+    assert all(results), "a task saw another task's target currency"
+    return time.perf_counter() - started
+
+
+def _run_threads(lock) -> float:
+    currencies = list(itertools.islice(itertools.cycle(CURRENCIES), THREAD_REQUESTS))
+    started = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(THREADS) as pool:
+        results = list(pool.map(lambda c: _thread_request(c, lock), currencies))
+    assert all(results), "a thread saw another thread's target currency"
+    return time.perf_counter() - started
+
+
+def run():
+    rows = [
+        (f"asyncio, {TASKS} tasks", TASKS, _run_tasks, asyncio.Lock()),
+        (f"threads, {THREADS} workers", THREAD_REQUESTS, _run_threads, threading.Lock()),
+    ]
+    for name, requests, bench, lock in rows:
+        serialized = bench(lock)
+        unlocked = bench(_NoLock())
+        print(
+            f"{name:<22} global lock {requests / serialized:9,.0f} req/s"
+            f"  contextvars {requests / unlocked:9,.0f} req/s"
+            f"  ({serialized / unlocked:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    run()
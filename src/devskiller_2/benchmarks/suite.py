@@ -0,0 +1,296 @@
+"""
+Benchmark suite of the money engine: scalar `Cash` operations, mixed currency sums,
+conversions and `TargetCurrency` scoping, and bulk conversions. Each scenario reports
+the best time per operation out of several repeats, with a fixed random seed.
+
+Run from the `devskiller_2` directory:
+
+    python -m benchmarks.suite run --save baseline.json
+    python -m benchmarks.suite compare baseline.json --threshold 0.10
+
+`compare` runs the suite again and exits with status 1 if any scenario is slower
+than in the baseline by more than the threshold, 10% by default. `--filter` only
+runs the scenarios whose name contains the given text. Compare baselines recorded
+on the same machine, with the same Python and the same `CASH_FIXED_POINT` setting.
+"""
+
+import argparse
+import decimal
+import json
+import platform
+import random
+import sys
+import timeit
+import typing
+
+from app.batch_conversion import convert_batch
+from app.cash import Cash, TargetCurrency, fixed_point_enabled
+from app.cash_accumulator import CashAccumulator
+from app.cash_array import CashArray
+from app.cash_expression import lazy
+from app.currency import Currency
+
+REPEAT = 5
+DEFAULT_THRESHOLD = 0.10
+
+Statement = typing.Callable[[], typing.Any]
+
+SCENARIOS: typing.Dict[str, typing.Callable[[], Statement]] = {}
+
+
+def scenario(name: str):
+    """Registers a function that prepares the data and returns the statement to time."""
+
+    def register(
+        setup: typing.Callable[[], Statement]
+    ) -> typing.Callable[[], Statement]:
+        SCENARIOS[name] = setup
+        return setup
+
+    return register
+
+
+def _random_cash(count: int) -> typing.List[Cash]:
+    currencies = [currency for currency in Currency if currency != Currency.ZAR]
+    return [
+        Cash(
+            decimal.Decimal(random.randrange(-(10**7), 10**7)).scaleb(-4),
+            random.choice(currencies),
+        )
+        for _ in range(count)
+    ]
+
+
+@scenario("scalar.construct_str")
+def _construct_str() -> Statement:
+    return lambda: Cash("1337.42", Currency.EUR)
+
+
+@scenario("scalar.construct_decimal")
+def _construct_decimal() -> Statement:
+    amount = decimal.Decimal("1337.42")
+    return lambda: Cash(amount, Currency.EUR)
+
+
+@scenario("scalar.compare_same_currency")
+def _compare_same_currency() -> Statement:
+    a, b = Cash("10", Currency.EUR), Cash("12", Currency.EUR)
+    return lambda: a < b
+
+
+@scenario("scalar.compare_mixed_currency")
+def _compare_mixed_currency() -> Statement:
+    a, b = Cash("10", Currency.EUR), Cash("12", Currency.PLN)
+    return lambda: a < b
+
+
+@scenario("scalar.add_same_currency")
+def _add_same_currency() -> Statement:
+    a, b = Cash("10", Currency.EUR), Cash("12", Currency.EUR)
+    return lambda: a + b
+
+
+@scenario("scalar.add_mixed_currency")
+def _add_mixed_currency() -> Statement:
+    a, b = Cash("10", Currency.EUR), Cash("12", Currency.PLN)
+    return lambda: a + b
+
+
+@scenario("scalar.sub_integer")
+def _sub_integer() -> Statement:
+    a = Cash("10", Currency.EUR)
+    return lambda: a - 3
+
+
+@scenario("scalar.neg")
+def _neg() -> Statement:
+    a = Cash("10", Currency.EUR)
+    return lambda: -a
+
+
+@scenario("scalar.to")
+def _to() -> Statement:
+    a = Cash("1337.42", Currency.EUR)
+    return lambda: a.to(Currency.USD)
+
+
+@scenario("scalar.matmul")
+def _matmul() -> Statement:
+    a = Cash("1337.42", Currency.EUR)
+    return lambda: a @ Currency.GBP
+
+
+@scenario("sum.mixed_currency_100")
+def _sum_mixed_currency() -> Statement:
+    values = _random_cash(100)
+    start = Cash("0", Currency.EUR)
+    return lambda: sum(values, start)
+
+
+@scenario("sum.accumulator_100")
+def _sum_accumulator() -> Statement:
+    values = _random_cash(100)
+
+    def accumulate():
+        total = CashAccumulator(Currency.EUR)
+        for value in values:
+            total += value
+        return total.freeze()
+
+    return accumulate
+
+
+@scenario("sum.lazy_100")
+def _sum_lazy() -> Statement:
+    values = _random_cash(100)
+    return lambda: sum(values, lazy(Cash("0", Currency.EUR))).evaluate()
+
+
+@scenario("target_currency.scope")
+def _target_currency_scope() -> Statement:
+    def enter():
+        with TargetCurrency(Currency.EUR):
+            pass
+
+    return enter
+
+
+@scenario("target_currency.add")
+def _target_currency_add() -> Statement:
+    a, b = Cash("10", Currency.PLN), Cash("12", Currency.PLN)
+
+    def add():
+        with TargetCurrency(Currency.EUR):
+            return a + b
+
+    return add
+
+
+@scenario("target_currency.sum_100")
+def _target_currency_sum() -> Statement:
+    values = _random_cash(100)
+    start = Cash("0", Currency.EUR)
+
+    def add():
+        with TargetCurrency(Currency.USD):
+            return sum(values, start)
+
+    return add
+
+
+@scenario("bulk.cash_array_to_10k")
+def _cash_array_to() -> Statement:
+    array = CashArray.from_cash(_random_cash(10_000))
+    return lambda: array.to(Currency.EUR)
+
+
+@scenario("bulk.convert_batch_10k")
+def _convert_batch() -> Statement:
+    values = _random_cash(10_000)
+    amounts = [value.amount for value in values]
+    origins = [value.currency for value in values]
+    return lambda: convert_batch(amounts, origins, Currency.EUR, workers=1)
+
+
+def _measure(statement: Statement) -> float:
+    timer = timeit.Timer(statement)
+    # Loops per repeat so that each repeat takes at least 0.2 seconds.
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=REPEAT, number=number)) / number
+
+
+def run(name_filter: str = "") -> typing.Dict[str, float]:
+    """Returns the best seconds per operation of every selected scenario."""
+    results = {}
+    for name, setup in SCENARIOS.items():
+        if name_filter not in name:
+            continue
+        random.seed(42)
+        results[name] = _measure(setup())
+        print(f"{name:<32} {results[name] * 1e9:14,.0f} ns/op", flush=True)
+    return results
+
+
+def compare(
+    baseline: typing.Mapping[str, float],
+    results: typing.Mapping[str, float],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> typing.List[str]:
+    """Prints the change of every scenario and returns the names of the regressions."""
+    regressions = []
+    for name in sorted(results):
+        if name not in baseline:
+            print(f"{name:<32} {'':>14} new scenario")
+            continue
+        change = results[name] / baseline[name] - 1
+        regressed = change > threshold
+        if regressed:
+            regressions.append(name)
+        print(
+            f"{name:<32} {results[name] * 1e9:14,.0f} ns/op  {change:+7.1%}"
+            f"{'  REGRESSION' if regressed else ''}"
+        )
+    return regressions
+
+
+def _environment() -> typing.Dict[str, typing.Any]:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "fixed_point": fixed_point_enabled(),
+    }
+
+
+def main(argv: typing.Optional[typing.Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.suite")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the suite")
+    run_parser.add_argument("--save", metavar="PATH", help="write the results as JSON")
+    run_parser.add_argument("--filter", default="", help="only scenarios containing this")
+
+    compare_parser = commands.add_parser(
+        "compare", help="run the suite and compare it with a baseline"
+    )
+    compare_parser.add_argument("baseline", help="JSON written by `run --save`")
+    compare_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="allowed slowdown as a fraction (default: %(default)s)",
+    )
+    compare_parser.add_argument(
+        "--filter", default="", help="only scenarios containing this"
+    )
+    args = parser.parse_args(argv)
+
+    if args.command == "compare":
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        if baseline["environment"] != _environment():
+            print(
+                f"warning: baseline recorded with {baseline['environment']}",
+                file=sys.stderr,
+            )
+        results = run(args.filter)
+        print()
+        regressions = compare(baseline["results"], results, args.threshold)
+        if regressions:
+            print(
+                f"\n{len(regressions)} scenario(s) regressed by more than "
+                f"{args.threshold:.0%}"
+            )
+            return 1
+        return 0
+
+    results = run(args.filter)
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump({"environment": _environment(), "results": results}, file, indent=2)
+            file.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
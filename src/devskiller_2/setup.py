@@ -11,14 +11,17 @@ setup(
     author="Devskiller",
     author_email="support@devskiller.com",
     packages=find_packages(),
-    python_requires=">=3.6",
+    python_requires=">=3.8",
     include_package_data=True,
     zip_safe=False,
     install_requires=packages
     + [
         "wheel",
         "setuptools==41.0.1",
+        "numpy",
     ],
+    extras_require={"pandas": ["pandas"]},
+    entry_points={"console_scripts": ["convert-transactions=app.convert:main"]},
     setup_requires=["pytest-runner"],
     tests_require=packages,
 )
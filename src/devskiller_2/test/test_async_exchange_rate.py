@@ -0,0 +1,145 @@
+import asyncio
+import decimal
+import unittest
+import urllib.parse
+
+import pytest
+
+
+class FakeRateServer:
+    """Answers `GET /quotation?origin=..&target=..` from `RATES`, once `release` is set."""
+
+    def __init__(self) -> None:
+        from app.rates import RATES
+
+        self.rates = dict(RATES)
+        self.requests = []
+        self.release = asyncio.Event()
+        self.release.set()
+        self._server = None
+
+    @property
+    def port(self) -> int:
+        return self._server.sockets[0].getsockname()[1]
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+
+    async def stop(self) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader, writer) -> None:
+        request_line = (await reader.readline()).decode("ascii")
+        while (await reader.readline()) not in (b"\r\n", b""):
+            pass
+        query = urllib.parse.parse_qs(urllib.parse.urlsplit(request_line.split()[1]).query)
+        origin, target = query["origin"][0], query["target"][0]
+        self.requests.append((origin, target))
+        await self.release.wait()
+
+        from app.currency import Currency
+
+        origin_rate = self.rates.get(Currency(origin))
+        target_rate = self.rates.get(Currency(target))
+        if origin_rate and target_rate:
+            writer.write(
+                b'HTTP/1.0 200 OK\r\n\r\n{"rate": "%s"}' % str(origin_rate / target_rate).encode()
+            )
+        else:
+            writer.write(b"HTTP/1.0 404 Not Found\r\n\r\n")
+        await writer.drain()
+        writer.close()
+
+
+class TestAsyncExchangeRateService(unittest.IsolatedAsyncioTestCase):
+    async def test_aquotation(self):
+        from app.currency import Currency
+
+        rate = await self._sut.aquotation(Currency.EUR, Currency.PLN)
+
+        assert rate == decimal.Decimal("4.55")
+        assert self._server.requests == [("EUR", "PLN")]
+
+    async def test_concurrent_requests_are_coalesced(self):
+        from app.currency import Currency
+
+        self._server.release.clear()
+        calls = [
+            asyncio.ensure_future(self._sut.aquotation(Currency.EUR, Currency.USD))
+            for _ in range(50)
+        ]
+        calls.append(asyncio.ensure_future(self._sut.aquotation(Currency.GBP, Currency.USD)))
+        await asyncio.sleep(0.05)
+        self._server.release.set()
+        rates = await asyncio.gather(*calls)
+
+        assert set(rates[:50]) == {decimal.Decimal("4.55") / decimal.Decimal("3.8024")}
+        assert sorted(self._server.requests) == [("EUR", "USD"), ("GBP", "USD")]
+        assert self._sut.fetches == 2
+
+    async def test_results_expire_after_ttl(self):
+        from app.currency import Currency
+
+        await self._sut.aquotation(Currency.EUR, Currency.PLN)
+        self._now += 9
+        await self._sut.aquotation(Currency.EUR, Currency.PLN)
+        self._now += 2
+        await self._sut.aquotation(Currency.EUR, Currency.PLN)
+
+        assert len(self._server.requests) == 2
+
+    async def test_failures_are_shared_and_not_cached(self):
+        from app.currency import Currency
+        from app.exceptions import QuotationError
+
+        self._server.release.clear()
+        calls = [
+            asyncio.ensure_future(self._sut.aquotation(Currency.ZAR, Currency.PLN))
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0.05)
+        self._server.release.set()
+        results = await asyncio.gather(*calls, return_exceptions=True)
+
+        assert all(isinstance(result, QuotationError) for result in results)
+        with pytest.raises(QuotationError):
+            await self._sut.aquotation(Currency.ZAR, Currency.PLN)
+        assert len(self._server.requests) == 2
+
+    async def test_cancelled_caller_does_not_cancel_others(self):
+        from app.currency import Currency
+
+        self._server.release.clear()
+        first = asyncio.ensure_future(self._sut.aquotation(Currency.EUR, Currency.PLN))
+        second = asyncio.ensure_future(self._sut.aquotation(Currency.EUR, Currency.PLN))
+        await asyncio.sleep(0.05)
+        first.cancel()
+        self._server.release.set()
+
+        assert await second == decimal.Decimal("4.55")
+        assert first.cancelled()
+
+    async def test_aconvert(self):
+        from app.cash import Cash
+        from app.currency import Currency
+
+        converted = await self._sut.aconvert(Cash("100", Currency.EUR), Currency.PLN)
+
+        assert converted == Cash("455", Currency.PLN)
+        assert converted.currency == Currency.PLN
+
+    async def asyncSetUp(self):
+        from app.async_exchange_rate import AsyncExchangeRateService, HttpQuotationSource
+
+        self._server = FakeRateServer()
+        await self._server.start()
+        self._now = 0.0
+        self._sut = AsyncExchangeRateService(
+            HttpQuotationSource("127.0.0.1", self._server.port),
+            ttl=10,
+            clock=lambda: self._now,
+        )
+
+    async def asyncTearDown(self):
+        await self._server.stop()
@@ -0,0 +1,69 @@
+import decimal
+import unittest
+from unittest import mock
+
+import pytest
+
+
+class TestConvertBatch(unittest.TestCase):
+    def test_matches_cash_to_in_order(self):
+        from app.cash import Cash
+        from app.currency import Currency
+
+        result = self._execute_sut(self._amounts, self._origins, Currency.USD, workers=2)
+
+        expected = [
+            Cash(amount, origin).to(Currency.USD)
+            for amount, origin in zip(self._amounts, self._origins)
+        ]
+        assert [(cash.amount, cash.currency) for cash in result] == [
+            (cash.amount, cash.currency) for cash in expected
+        ]
+
+    def test_single_worker(self):
+        from app.currency import Currency
+
+        in_process = self._execute_sut(self._amounts, self._origins, Currency.GBP, workers=1)
+        pooled = self._execute_sut(self._amounts, self._origins, Currency.GBP, workers=3)
+
+        assert [cash.amount for cash in in_process] == [cash.amount for cash in pooled]
+
+    def test_rate_version(self):
+        from app.currency import Currency
+        from app.exchange_rate import exchange_rate_service
+
+        result = self._execute_sut(
+            ["1", "2"], [Currency.EUR, Currency.PLN], Currency.PLN, workers=2
+        )
+
+        assert result[0].rate_version == exchange_rate_service.snapshot.version
+        assert result[1].rate_version is None
+
+    def test_unknown_rate(self):
+        from app.currency import Currency
+        from app.exceptions import CurrencyExchangeError
+
+        with pytest.raises(CurrencyExchangeError):
+            self._execute_sut(["1", "2"], [Currency.EUR, Currency.ZAR], Currency.PLN, workers=2)
+
+    def test_length_mismatch(self):
+        from app.currency import Currency
+
+        with pytest.raises(ValueError):
+            self._execute_sut(["1", "2"], [Currency.EUR], Currency.PLN)
+
+    def setUp(self):
+        from app import batch_conversion
+        from app.currency import Currency
+
+        patcher = mock.patch.object(batch_conversion, "MIN_SHARD_SIZE", 1)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        currencies = [currency for currency in Currency if currency != Currency.ZAR]
+        self._amounts = [decimal.Decimal(index).scaleb(-3) for index in range(1, 300)]
+        self._origins = [currencies[index % len(currencies)] for index in range(1, 300)]
+        self._sut = batch_conversion.convert_batch
+
+    def _execute_sut(self, *args, **kwargs):
+        return self._sut(*args, **kwargs)
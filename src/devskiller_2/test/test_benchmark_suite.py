@@ -0,0 +1,39 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+
+class TestBenchmarkSuiteCompare(unittest.TestCase):
+    def test_flags_regressions_beyond_threshold(self):
+        baseline = {"a": 1.0, "b": 1.0, "c": 1.0}
+        results = {"a": 1.05, "b": 1.2, "c": 0.5, "d": 3.0}
+
+        with mock.patch("builtins.print"):
+            regressions = self._sut.compare(baseline, results, threshold=0.1)
+
+        assert regressions == ["b"]
+
+    def test_save_and_compare_exit_status(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "baseline.json")
+            with mock.patch.object(self._sut, "run", return_value={"a": 1.0}):
+                assert self._sut.main(["run", "--save", path]) == 0
+            with open(path) as file:
+                assert json.load(file)["results"] == {"a": 1.0}
+
+            with mock.patch("builtins.print"):
+                with mock.patch.object(self._sut, "run", return_value={"a": 1.05}):
+                    assert self._sut.main(["compare", path]) == 0
+                with mock.patch.object(self._sut, "run", return_value={"a": 1.5}):
+                    assert self._sut.main(["compare", path, "--threshold", "0.2"]) == 1
+
+    def test_scenarios_run(self):
+        for name, setup in self._sut.SCENARIOS.items():
+            setup()()
+
+    def setUp(self):
+        from benchmarks import suite
+
+        self._sut = suite
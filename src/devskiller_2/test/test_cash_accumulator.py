@@ -0,0 +1,93 @@
+import decimal
+import unittest
+
+import pytest
+
+
+class TestCashAccumulator(unittest.TestCase):
+    def test_matches_cash_addition(self):
+        from app.cash import Cash
+        from app.currency import Currency
+
+        expected = Cash("0", Currency.PLN)
+        for value in self._values:
+            expected = expected + value
+        for value in self._values:
+            self._sut += value
+
+        assert self._sut.currency == expected.currency
+        assert self._sut.amount == expected.amount
+
+    def test_matches_cash_subtraction(self):
+        from app.cash import Cash
+        from app.currency import Currency
+
+        expected = Cash("0", Currency.PLN)
+        for value in self._values:
+            expected = expected - value
+        for value in self._values:
+            self._sut -= value
+
+        assert self._sut.amount == expected.amount
+
+    def test_updates_in_place(self):
+        from app.cash import Cash
+        from app.currency import Currency
+
+        accumulator = self._sut
+        self._sut += Cash("10", Currency.PLN)
+
+        assert self._sut is accumulator
+
+    def test_target_currency(self):
+        from app.cash import Cash, TargetCurrency
+        from app.currency import Currency
+
+        expected = Cash("0", Currency.PLN)
+        with TargetCurrency(Currency.EUR):
+            for value in self._values:
+                expected = expected + value
+                self._sut += value
+
+        assert self._sut.currency == Currency.EUR
+        assert self._sut.amount == expected.amount
+
+    def test_freeze(self):
+        from app.cash import Cash
+        from app.cash_accumulator import CashAccumulator
+        from app.currency import Currency
+
+        accumulator = CashAccumulator.from_cash(Cash("12.5", Currency.USD))
+        accumulator += 2
+        frozen = accumulator.freeze()
+        accumulator += 1
+
+        assert isinstance(frozen, Cash)
+        assert frozen == Cash("14.5", Currency.USD)
+        assert frozen.currency == Currency.USD
+        assert accumulator.amount == decimal.Decimal("15.5")
+
+    def test_invalid_operand(self):
+        with pytest.raises(ValueError):
+            self._sut += "10"
+
+    def test_invalid_currency(self):
+        from app.cash_accumulator import CashAccumulator
+        from app.exceptions import InvalidCurrencyError
+
+        with pytest.raises(InvalidCurrencyError):
+            CashAccumulator("PLN")
+
+    def setUp(self):
+        from app.cash import Cash
+        from app.cash_accumulator import CashAccumulator
+        from app.currency import Currency
+
+        self._values = [
+            Cash("10.00015", Currency.PLN),
+            Cash("3.3333", Currency.USD),
+            decimal.Decimal("0.00005"),
+            7,
+            Cash("-1.25", Currency.EUR),
+        ]
+        self._sut = CashAccumulator(Currency.PLN)
@@ -0,0 +1,166 @@
+import decimal
+import random
+import unittest
+
+
+class CashArrayTestCase(unittest.TestCase):
+    def setUp(self):
+        from app.cash import Cash
+        from app.currency import Currency
+
+        random.seed(1337)
+        currencies = [c for c in Currency if c != Currency.ZAR]
+        self._cash = [
+            Cash(
+                decimal.Decimal(random.randint(-10_000_000, 10_000_000)).scaleb(-4),
+                random.choice(currencies),
+            )
+            for _ in range(500)
+        ]
+        self._other = [
+            Cash(
+                decimal.Decimal(random.randint(-10_000_000, 10_000_000)).scaleb(-4),
+                random.choice(currencies),
+            )
+            for _ in range(500)
+        ]
+
+    def _execute_sut(self, values):
+        from app.cash_array import CashArray
+
+        return CashArray.from_cash(values)
+
+
+class TestCashArray(CashArrayTestCase):
+    def test_round_trip(self):
+        array = self._execute_sut(self._cash)
+
+        assert len(array) == len(self._cash)
+        for cash, expected in zip(array, self._cash):
+            assert cash.amount == expected.amount
+            assert cash.currency == expected.currency
+
+    def test_single_currency_constructor(self):
+        from app.cash_array import CashArray
+        from app.currency import Currency
+
+        array = CashArray(["1", "2.5", 3], Currency.EUR)
+
+        assert list(array.units) == [10000, 25000, 30000]
+        assert array.currencies == [Currency.EUR] * 3
+
+    def test_invalid_currency(self):
+        from app.cash_array import CashArray
+        from app.exceptions import InvalidCurrencyError
+
+        with self.assertRaises(InvalidCurrencyError):
+            CashArray(["1"], ["EUR"])
+
+    def test_to_matches_scalar(self):
+        from app.currency import Currency
+
+        for target in (Currency.PLN, Currency.EUR, Currency.NOK):
+            converted = self._execute_sut(self._cash).to(target)
+            for cash, expected in zip(converted, self._cash):
+                assert cash.amount == expected.to(target).amount
+                assert cash.currency == target
+
+    def test_to_matches_scalar_on_ties(self):
+        from app.cash import Cash
+        from app.currency import Currency
+
+        values = [Cash(decimal.Decimal(n).scaleb(-4), Currency.EUR) for n in range(1000)]
+
+        converted = self._execute_sut(values).to(Currency.PLN)
+
+        assert [c.amount for c in converted] == [
+            v.to(Currency.PLN).amount for v in values
+        ]
+
+    def test_add_and_sub_match_scalar(self):
+        array = self._execute_sut(self._cash)
+        other = self._execute_sut(self._other)
+
+        for result, operation in ((array + other, "__add__"), (array - other, "__sub__")):
+            expected = [
+                getattr(a, operation)(b) for a, b in zip(self._cash, self._other)
+            ]
+            assert [c.amount for c in result] == [c.amount for c in expected]
+            assert result.currencies == [c.currency for c in expected]
+
+    def test_add_number_matches_scalar(self):
+        array = self._execute_sut(self._cash)
+
+        for number in (15, decimal.Decimal("0.00005"), decimal.Decimal("-2.71828")):
+            assert [c.amount for c in array + number] == [
+                (c + number).amount for c in self._cash
+            ]
+            assert [c.amount for c in array - number] == [
+                (c - number).amount for c in self._cash
+            ]
+
+    def test_neg_and_abs(self):
+        array = self._execute_sut(self._cash)
+
+        assert [c.amount for c in -array] == [(-c).amount for c in self._cash]
+        assert [c.amount for c in abs(array)] == [abs(c).amount for c in self._cash]
+
+    def test_comparisons_match_scalar(self):
+        import operator
+
+        array = self._execute_sut(self._cash)
+        other = self._execute_sut(self._other)
+
+        for compare in (operator.lt, operator.le, operator.gt, operator.ge, operator.eq):
+            assert list(compare(array, other)) == [
+                compare(a, b) for a, b in zip(self._cash, self._other)
+            ]
+            assert list(compare(array, decimal.Decimal("12.34565"))) == [
+                compare(a, decimal.Decimal("12.34565")) for a in self._cash
+            ]
+
+    def test_cash_on_the_left(self):
+        array = self._execute_sut(self._cash)
+        cash = self._other[0]
+
+        assert [c.amount for c in cash + array] == [(a + cash).amount for a in self._cash]
+        assert [c.amount for c in cash - array] == [(-a + cash).amount for a in self._cash]
+        assert list(cash < array) == [cash < a for a in self._cash]
+        assert list(cash >= array) == [cash >= a for a in self._cash]
+
+    def test_sum_matches_scalar(self):
+        from app.currency import Currency
+
+        array = self._execute_sut(self._cash)
+
+        assert array.sum() == sum(self._cash)
+        assert array.sum().currency == self._cash[0].currency
+        assert array.sum(Currency.USD).currency == Currency.USD
+
+    def test_add_under_target_currency(self):
+        from app.cash import TargetCurrency
+        from app.currency import Currency
+
+        array = self._execute_sut(self._cash)
+        other = self._execute_sut(self._other)
+
+        with TargetCurrency(Currency.EUR):
+            result = array + other
+            expected = [a + b for a, b in zip(self._cash, self._other)]
+
+        assert result.currencies == [Currency.EUR] * len(expected)
+        assert [c.amount for c in result] == [c.amount for c in expected]
+
+    def test_sub_under_target_currency(self):
+        from app.cash import TargetCurrency
+        from app.currency import Currency
+
+        array = self._execute_sut(self._cash)
+        other = self._execute_sut(self._other)
+
+        with TargetCurrency(Currency.USD):
+            result = array - other
+            expected = [a - b for a, b in zip(self._cash, self._other)]
+
+        assert result.currencies == [Currency.USD] * len(expected)
+        assert [c.amount for c in result] == [c.amount for c in expected]
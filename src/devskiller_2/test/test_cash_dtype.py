@@ -0,0 +1,110 @@
+import unittest
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+
+class TestCashDtype(unittest.TestCase):
+    def test_dtype_from_string(self):
+        from app.cash_dtype import CashDtype
+        from app.currency import Currency
+
+        series = self._execute_sut(["10", "12.5"], "cash[EUR]")
+
+        assert series.dtype == CashDtype(Currency.EUR)
+        assert str(series.dtype) == "cash[EUR]"
+
+    def test_invalid_currency(self):
+        from app.exceptions import InvalidCurrencyError
+
+        with pytest.raises(InvalidCurrencyError):
+            self._execute_sut(["10"], "cash[JPY]")
+
+    def test_round_trip_cash(self):
+        from app.cash import Cash
+        from app.currency import Currency
+
+        values = [Cash("10.1234", Currency.EUR), Cash("-3", Currency.EUR), None]
+
+        series = self._execute_sut(values, "cash[EUR]")
+
+        assert list(series[:2]) == values[:2]
+        assert all(isinstance(value, Cash) for value in series[:2])
+        assert series.isna().tolist() == [False, False, True]
+
+    def test_arithmetic(self):
+        from app.cash import Cash
+        from app.currency import Currency
+
+        eur = self._execute_sut(["10", "20"], "cash[EUR]")
+        pln = self._execute_sut(["4.55", "9.10"], "cash[PLN]")
+
+        assert list(eur + pln) == [Cash("11", Currency.EUR), Cash("22", Currency.EUR)]
+        assert list(eur - 5) == [Cash("5", Currency.EUR), Cash("15", Currency.EUR)]
+        assert list(-eur) == [Cash("-10", Currency.EUR), Cash("-20", Currency.EUR)]
+        assert (eur > pln).tolist() == [True, True]
+
+    def test_reductions(self):
+        from app.cash import Cash
+        from app.currency import Currency
+
+        series = self._execute_sut(["10", "2.5", None], "cash[EUR]")
+
+        assert series.sum() == Cash("12.5", Currency.EUR)
+        assert series.min() == Cash("2.5", Currency.EUR)
+        assert series.max() == Cash("10", Currency.EUR)
+
+    def test_groupby_sum_matches_object_column(self):
+        from app.cash import Cash
+        from app.currency import Currency
+
+        values = [Cash(str(n), Currency.USD) for n in range(20)]
+        keys = [n % 3 for n in range(20)]
+
+        result = self._execute_sut(values, "cash[USD]").groupby(keys).sum()
+        expected = pd.Series(values, dtype=object).groupby(keys).agg(lambda g: sum(g))
+
+        assert str(result.dtype) == "cash[USD]"
+        assert list(result) == list(expected)
+
+    def test_groupby_min_max(self):
+        from app.cash import Cash
+        from app.currency import Currency
+
+        series = self._execute_sut(["1", "5", "3", None], "cash[EUR]")
+        groups = series.groupby(["a", "a", "b", "c"])
+
+        assert list(groups.min()[:2]) == [Cash("1", Currency.EUR), Cash("3", Currency.EUR)]
+        assert list(groups.max()[:2]) == [Cash("5", Currency.EUR), Cash("3", Currency.EUR)]
+        assert groups.max().isna().tolist() == [False, False, True]
+
+    def test_astype_converts_currency(self):
+        from app.cash import Cash
+        from app.currency import Currency
+
+        series = self._execute_sut(["100", "1.01"], "cash[EUR]")
+
+        converted = series.astype("cash[PLN]")
+
+        assert list(converted) == [
+            Cash("100", Currency.EUR).to(Currency.PLN),
+            Cash("1.01", Currency.EUR).to(Currency.PLN),
+        ]
+
+    def test_concat_and_take(self):
+        from app.cash import Cash
+        from app.currency import Currency
+
+        first = self._execute_sut(["1"], "cash[EUR]")
+        second = self._execute_sut(["2"], "cash[EUR]")
+
+        combined = pd.concat([first, second], ignore_index=True)
+
+        assert list(combined.iloc[[1, 0]]) == [Cash("2", Currency.EUR), Cash("1", Currency.EUR)]
+        assert combined.reindex([0, 5]).isna().tolist() == [False, True]
+
+    def _execute_sut(self, values, dtype):
+        import app.cash_dtype  # noqa: F401 registers the dtype
+
+        return pd.Series(values, dtype=dtype)
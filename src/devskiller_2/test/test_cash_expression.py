@@ -0,0 +1,115 @@
+import decimal
+import unittest
+from unittest import mock
+
+
+class TestCashExpression(unittest.TestCase):
+    def test_same_currency_matches_eager(self):
+        from app.cash import Cash
+        from app.currency import Currency
+
+        a, b, c = Cash("10", Currency.USD), Cash("2.5", Currency.USD), Cash("1", Currency.USD)
+
+        assert (self._execute_sut(a) + b - c + 15).evaluate() == a + b - c + 15
+
+    def test_cash_on_the_left(self):
+        from app.cash import Cash
+        from app.cash_expression import CashExpression
+        from app.currency import Currency
+
+        a, b = Cash("28", Currency.USD), Cash("100", Currency.PLN)
+
+        total = b + self._execute_sut(a)
+        difference = b - self._execute_sut(a)
+
+        assert isinstance(total, CashExpression)
+        assert total.evaluate() == Cash("206.4672", Currency.PLN)
+        assert difference.evaluate() == Cash("-6.4672", Currency.PLN)
+
+    def test_defaults_to_leftmost_currency(self):
+        from app.cash import Cash
+        from app.currency import Currency
+
+        result = (self._execute_sut(Cash("100", Currency.PLN)) + Cash("28", Currency.USD)).evaluate()
+
+        assert result == Cash("206.4672", Currency.PLN)
+
+    def test_numbers_count_in_the_combined_currency(self):
+        from app.cash import Cash
+        from app.currency import Currency
+
+        result = (15 + self._execute_sut(Cash("100", Currency.USD)) - 5).evaluate(Currency.PLN)
+
+        assert result == Cash("110", Currency.USD).to(Currency.PLN)
+
+    def test_single_conversion_per_currency(self):
+        from app.cash import Cash, TargetCurrency
+        from app.currency import Currency
+        from app.exchange_rate import RateSnapshot
+
+        expression = self._execute_sut(Cash("1", Currency.PLN))
+        for n in range(20):
+            expression = expression + Cash(str(n), Currency.PLN) + Cash(str(n), Currency.USD)
+
+        with mock.patch.object(
+            RateSnapshot, "quotation", autospec=True, side_effect=RateSnapshot.quotation
+        ) as quotation, TargetCurrency(Currency.EUR):
+            result = expression.evaluate()
+
+        assert quotation.call_count == 2
+        assert result.currency == Currency.EUR
+        exact = (
+            decimal.Decimal(191) * decimal.Decimal(1) / decimal.Decimal("4.55")
+            + decimal.Decimal(190) * decimal.Decimal("3.8024") / decimal.Decimal("4.55")
+        )
+        assert result.amount == exact.quantize(decimal.Decimal("0.0000"))
+
+    def test_shared_subexpression_is_computed_once(self):
+        from app.cash import Cash
+        from app.cash_expression import _Leaf
+        from app.currency import Currency
+
+        shared = self._execute_sut(Cash("1", Currency.EUR)) + Cash("2", Currency.PLN)
+        expression = shared + shared - shared
+
+        with mock.patch.object(
+            _Leaf, "_compute_buckets", autospec=True, side_effect=_Leaf._compute_buckets
+        ) as compute:
+            result = expression.evaluate()
+
+        assert compute.call_count == 2
+        assert result == (shared @ Currency.EUR)
+
+    def test_evaluation_is_memoized_per_rate_version(self):
+        from app.cash import Cash
+        from app.currency import Currency
+        from app.exchange_rate import exchange_rate_service
+
+        expression = self._execute_sut(Cash("1", Currency.EUR)) + Cash("1", Currency.PLN)
+        original = exchange_rate_service.get_rate(Currency.EUR)
+
+        first = expression.evaluate(Currency.PLN)
+        assert expression.evaluate(Currency.PLN) is first
+        exchange_rate_service.update_rate(Currency.EUR, decimal.Decimal("5"))
+        try:
+            assert expression.evaluate(Currency.PLN) == Cash("6", Currency.PLN)
+        finally:
+            exchange_rate_service.update_rate(Currency.EUR, original)
+
+    def test_incomplete_subclass_cannot_be_created(self):
+        from app.cash_expression import CashExpression
+
+        class Incomplete(CashExpression):
+            __slots__ = ()
+
+            @property
+            def home_currency(self):
+                return None
+
+        with self.assertRaises(TypeError):
+            Incomplete()
+
+    def _execute_sut(self, value):
+        from app.cash_expression import lazy
+
+        return lazy(value)
@@ -0,0 +1,135 @@
+import decimal
+import unittest
+
+from . import (
+    test_cash,
+    test_cash_accumulator,
+    test_cash_exchange,
+    test_cash_operators,
+    test_target_currency_context_manager,
+)
+
+
+class FixedPointMode:
+    def setUp(self):
+        from app.cash import fixed_point_enabled, set_fixed_point
+
+        self.addCleanup(set_fixed_point, fixed_point_enabled())
+        set_fixed_point(True)
+        super().setUp()
+
+
+class TestFixedPointCash(FixedPointMode, test_cash.TestCash):
+    pass
+
+
+class TestFixedPointCashExchangeTo(FixedPointMode, test_cash_exchange.TestCashExchangeTo):
+    pass
+
+
+class TestFixedPointCashAdd(FixedPointMode, test_cash_operators.TestCashAdd):
+    pass
+
+
+class TestFixedPointCashSubtract(FixedPointMode, test_cash_operators.TestCashSubtract):
+    pass
+
+
+class TestFixedPointCashCompare(FixedPointMode, test_cash_operators.TestCashCompare):
+    pass
+
+
+class TestFixedPointTargetCurrency(
+    FixedPointMode, test_target_currency_context_manager.TestTargetCurrencyContextManager
+):
+    pass
+
+
+class TestFixedPointCashAccumulator(FixedPointMode, test_cash_accumulator.TestCashAccumulator):
+    def test_accumulates_units(self):
+        from app.cash_accumulator import FixedPointCashAccumulator
+
+        assert isinstance(self._sut, FixedPointCashAccumulator)
+
+
+class TestFixedPointRepresentation(FixedPointMode, unittest.TestCase):
+    def test_stores_scaled_integer(self):
+        from app.cash import Cash, FixedPointCash
+        from app.currency import Currency
+
+        cash = Cash("13.37", Currency.EUR)
+
+        assert isinstance(cash, FixedPointCash)
+        assert cash._units == 133700
+        assert cash.amount == decimal.Decimal("13.3700")
+
+    def test_quantizes_half_to_even_on_construction(self):
+        from app.cash import Cash
+        from app.currency import Currency
+
+        assert Cash("0.00005", Currency.EUR)._units == 0
+        assert Cash("0.00015", Currency.EUR)._units == 2
+
+    def test_mixes_with_decimal_instances(self):
+        from app.cash import Cash, set_fixed_point
+        from app.currency import Currency
+
+        set_fixed_point(False)
+        decimal_cash = Cash("28", Currency.USD)
+        set_fixed_point(True)
+
+        result = Cash("100", Currency.PLN) + decimal_cash
+
+        assert result.amount == decimal.Decimal("206.4672")
+        assert decimal_cash + Cash("1", Currency.USD) == Cash("29", Currency.USD)
+
+    def test_copy_and_pickle(self):
+        import copy
+        import pickle
+
+        from app.cash import Cash, FixedPointCash
+        from app.currency import Currency
+
+        cash = Cash("1.5", Currency.EUR)
+        converted = cash.to(Currency.PLN)
+
+        for clone in (copy.copy(cash), pickle.loads(pickle.dumps(cash))):
+            assert isinstance(clone, FixedPointCash)
+            assert (clone._units, clone.currency) == (15000, Currency.EUR)
+            assert clone.rate_version is None
+        restored = pickle.loads(pickle.dumps(converted))
+        assert restored == converted
+        assert restored.rate_version == converted.rate_version is not None
+
+    def test_unpickles_decimal_instances(self):
+        import pickle
+
+        from app.cash import Cash, FixedPointCash, set_fixed_point
+        from app.currency import Currency
+
+        set_fixed_point(False)
+        pickled = pickle.dumps(Cash("1.5", Currency.EUR).to(Currency.PLN))
+        set_fixed_point(True)
+
+        restored = pickle.loads(pickled)
+
+        assert isinstance(restored, FixedPointCash)
+        assert restored.currency == Currency.PLN
+        assert restored.rate_version is not None
+
+    def test_unpickles_as_decimal_instances(self):
+        import pickle
+
+        from app.cash import Cash, FixedPointCash, set_fixed_point
+        from app.currency import Currency
+
+        converted = Cash("1.5", Currency.EUR).to(Currency.PLN)
+        pickled = pickle.dumps(converted)
+        set_fixed_point(False)
+
+        restored = pickle.loads(pickled)
+
+        assert type(restored) is Cash and not isinstance(restored, FixedPointCash)
+        assert restored.amount == converted.amount
+        assert restored.currency == Currency.PLN
+        assert restored.rate_version == converted.rate_version is not None
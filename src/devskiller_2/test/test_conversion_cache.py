@@ -0,0 +1,99 @@
+import decimal
+import unittest
+
+
+class TestCashHash(unittest.TestCase):
+    def test_equal_values_hash_equal(self):
+        from app.cash import Cash
+        from app.currency import Currency
+
+        assert hash(Cash("10", Currency.EUR)) == hash(Cash("10.0000", Currency.EUR))
+        assert hash(Cash("10", Currency.EUR)) == hash(10)
+        assert hash(Cash("0.00001", Currency.EUR)) == hash(Cash("0", Currency.EUR))
+
+    def test_usable_as_key(self):
+        from app.cash import Cash
+        from app.currency import Currency
+
+        prices = {Cash("10", Currency.EUR): "a", Cash("5", Currency.USD): "b"}
+
+        assert prices[Cash("10.00", Currency.EUR)] == "a"
+        assert len({Cash("1", Currency.PLN), Cash("1.0", Currency.PLN)}) == 1
+
+    def test_foreign_keys(self):
+        from app.cash import Cash
+        from app.currency import Currency
+
+        cash = Cash("1", Currency.EUR)
+
+        # Same hash as the float key, so the lookup has to compare them.
+        assert hash(cash) == hash(1.0)
+        assert cash not in {1.0: "x"}
+        assert cash != 1.0
+        assert cash != "1"
+
+    def test_other_currencies_hash_apart(self):
+        from app.cash import Cash
+        from app.currency import Currency
+
+        # Documented limitation, equal across currencies doesn't mean the same key.
+        pln, eur = Cash("4.55", Currency.PLN), Cash("1", Currency.EUR)
+
+        assert pln == eur
+        assert hash(pln) != hash(eur)
+        assert len({pln, eur}) == 2
+
+
+class TestConversionCache(unittest.TestCase):
+    def test_hits_and_misses(self):
+        from app.cash import Cash
+        from app.currency import Currency
+
+        first = Cash("100", Currency.EUR).to(Currency.PLN)
+        second = Cash("100.00", Currency.EUR).to(Currency.PLN)
+
+        assert first == second == Cash("455", Currency.PLN)
+        assert second is first
+        assert self._sut.info()[:3] == (1, 1, 0)
+
+    def test_evicts_least_recently_used(self):
+        from app.cash import Cash
+        from app.currency import Currency
+
+        for amount in ("1", "2", "3", "1", "4"):
+            Cash(amount, Currency.EUR).to(Currency.PLN)
+
+        assert self._sut.evictions == 1
+        assert len(self._sut) == 3
+        Cash("1", Currency.EUR).to(Currency.PLN)
+        assert self._sut.hits == 2
+
+    def test_rate_update_invalidates(self):
+        from app.cash import Cash
+        from app.currency import Currency
+        from app.exchange_rate import exchange_rate_service
+
+        original = exchange_rate_service.get_rate(Currency.EUR)
+        Cash("100", Currency.EUR).to(Currency.PLN)
+        exchange_rate_service.update_rate(Currency.EUR, decimal.Decimal("5"))
+        try:
+            converted = Cash("100", Currency.EUR).to(Currency.PLN)
+        finally:
+            exchange_rate_service.update_rate(Currency.EUR, original)
+
+        assert converted == Cash("500", Currency.PLN)
+        assert self._sut.hits == 0
+
+    def test_older_version_misses(self):
+        from app.currency import Currency
+
+        self._sut.put(decimal.Decimal("1"), Currency.EUR, Currency.PLN, 5, "cached")
+
+        assert self._sut.get(decimal.Decimal("1"), Currency.EUR, Currency.PLN, 4) is None
+        assert self._sut.get(decimal.Decimal("1"), Currency.EUR, Currency.PLN, 5) == "cached"
+
+    def setUp(self):
+        from app.cash import disable_conversion_cache, enable_conversion_cache
+
+        self._sut = enable_conversion_cache(maxsize=3)
+        self.addCleanup(disable_conversion_cache)
@@ -0,0 +1,141 @@
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import pytest
+
+
+class TestConvertCommand(unittest.TestCase):
+    def test_csv(self):
+        output = self._execute_sut(
+            "amount,currency\n100,EUR\n4.55,PLN\n-1.5,EUR\n", "in.csv", "--to", "PLN"
+        )
+
+        assert output == "amount,currency\n455.0000,PLN\n4.5500,PLN\n-6.8250,PLN\n"
+
+    def test_jsonl(self):
+        output = self._execute_sut(
+            '{"amount": "100", "currency": "EUR"}\n{"amount": 4.55, "currency": "PLN"}\n',
+            "in.jsonl",
+            "--to",
+            "EUR",
+        )
+
+        assert output == (
+            '{"amount": "100.0000", "currency": "EUR"}\n'
+            '{"amount": "1.0000", "currency": "EUR"}\n'
+        )
+
+    def test_matches_cash_across_chunks(self):
+        from app.cash import Cash
+        from app.currency import Currency
+
+        rows = [(f"{n}.{n % 7}", ("EUR", "USD", "GBP")[n % 3]) for n in range(50)]
+
+        output = self._execute_sut(
+            "".join(f"{amount},{code}\n" for amount, code in rows),
+            "in.csv",
+            "--to",
+            "NOK",
+            "--chunk-size",
+            "7",
+        )
+
+        assert output.splitlines()[1:] == [
+            f"{Cash(amount, Currency(code)).to(Currency.NOK).amount},NOK"
+            for amount, code in rows
+        ]
+
+    def test_quoted_csv(self):
+        output = self._execute_sut('amount,currency\n"1,000.00",PLN\n', "in.csv", "--to", "PLN")
+
+        assert output == "amount,currency\n1000.0000,PLN\n"
+
+    def test_reports_rows_per_second(self):
+        with mock.patch("sys.stderr", new_callable=io.StringIO) as stderr:
+            self._execute_sut("1,EUR\n2,EUR\n", "in.csv", "--to", "PLN")
+
+        assert stderr.getvalue().startswith("converted 2 rows in ")
+        assert "rows/s" in stderr.getvalue()
+
+    def test_invalid_currency(self):
+        with pytest.raises(SystemExit) as error, mock.patch("sys.stderr", new_callable=io.StringIO):
+            self._execute_sut("1,JPY\n", "in.csv", "--to", "PLN")
+
+        assert error.value.code == 1
+
+    def test_reports_the_line_of_an_invalid_row(self):
+        for content, filename, message in [
+            ("amount,currency\n1,EUR\nabc,EUR\n", "in.csv", "line 3: invalid amount 'abc'"),
+            ("1,EUR\n2,JPY\n", "in.csv", "line 2: Unknown currency 'JPY'"),
+            ("1,EUR\n1,2,EUR\n", "in.csv", "line 2: expected amount,currency"),
+            ('{"amount": "1", "currency": "EUR"}\n{"amount": "1"}\n', "in.jsonl", "line 2: "),
+        ]:
+            with pytest.raises(SystemExit) as error, mock.patch(
+                "sys.stderr", new_callable=io.StringIO
+            ) as stderr:
+                self._execute_sut(content, filename, "--to", "PLN", "--chunk-size", "5")
+
+            assert error.value.code == 1
+            assert f"error: {message}" in stderr.getvalue()
+
+    def test_missing_input(self):
+        from app.convert import main
+
+        with pytest.raises(SystemExit) as error, mock.patch(
+            "sys.stderr", new_callable=io.StringIO
+        ) as stderr:
+            main([os.path.join(tempfile.gettempdir(), "missing.csv"), "--to", "PLN"])
+
+        assert error.value.code == 2
+        assert "No such file or directory" in stderr.getvalue()
+        assert "Traceback" not in stderr.getvalue()
+
+    def test_rejects_empty_chunks(self):
+        from app.convert import convert_stream
+        from app.currency import Currency
+
+        with pytest.raises(SystemExit) as error, mock.patch("sys.stderr", new_callable=io.StringIO):
+            self._execute_sut("1,EUR\n", "in.csv", "--to", "PLN", "--chunk-size", "0")
+        with pytest.raises(ValueError):
+            convert_stream(["1,EUR\n"], lambda text: None, Currency.EUR, chunk_size=0)
+
+        assert error.value.code == 2
+
+    def test_streams_in_chunks(self):
+        from app.convert import convert_stream
+        from app.currency import Currency
+
+        consumed = []
+        written = []
+
+        def lines():
+            for n in range(10):
+                consumed.append(n)
+                yield f"{n},EUR\n"
+
+        def write(text):
+            written.append((len(consumed), text))
+
+        convert_stream(lines(), write, Currency.EUR, chunk_size=3)
+
+        # Each chunk is written before the rows of the following one are read.
+        assert [rows_read for rows_read, _ in written[1:]] == [3, 6, 9, 10]
+
+    def _execute_sut(self, content, filename, *args):
+        from app.convert import main
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        directory = directory.name
+        source = os.path.join(directory, filename)
+        target = os.path.join(directory, "out")
+        with open(source, "w") as file:
+            file.write(content)
+
+        main([source, "-o", target, *args])
+
+        with open(target) as file:
+            return file.read()
@@ -41,3 +41,24 @@ class TestCurrencyEnumIsMember(unittest.TestCase):
 
     def _execute_sut(self, value):
         return self._sut(value)
+
+
+class TestCurrencyCode(unittest.TestCase):
+    def test_codes_are_dense(self):
+        assert [currency.code for currency in self._sut] == list(range(len(self._sut)))
+
+    def test_round_trip(self):
+        from app.currency import CURRENCY_BY_CODE
+
+        for currency in self._sut:
+            assert CURRENCY_BY_CODE[currency.code] is currency
+            assert self._sut.from_code(currency.code) is currency
+
+    def test_minor_units(self):
+        assert self._sut.EUR.minor_units == 2
+        assert all(currency.minor_units == 2 for currency in self._sut)
+
+    def setUp(self):
+        from app.currency import Currency
+
+        self._sut = Currency
@@ -0,0 +1,120 @@
+import decimal
+import unittest
+from unittest import mock
+
+import pytest
+
+
+class TestCurrencyGraph(unittest.TestCase):
+    def test_direct_and_inverse_quote(self):
+        self._sut.set_quote("EUR", "USD", decimal.Decimal("1.25"))
+
+        assert self._sut.rate("EUR", "USD") == decimal.Decimal("1.25")
+        assert self._sut.rate("USD", "EUR") == decimal.Decimal("0.8")
+        assert self._sut.rate("EUR", "EUR") == decimal.Decimal("1")
+
+    def test_triangulates_shortest_path(self):
+        self._sut.set_quote("ZAR", "EUR", decimal.Decimal("0.05"))
+        self._sut.set_quote("EUR", "PLN", decimal.Decimal("4.5"))
+        self._sut.set_quote("ZAR", "USD", decimal.Decimal("0.06"))
+        self._sut.set_quote("USD", "GBP", decimal.Decimal("0.8"))
+        self._sut.set_quote("GBP", "PLN", decimal.Decimal("5"))
+
+        assert self._sut.path("ZAR", "PLN") == ["ZAR", "EUR", "PLN"]
+        assert self._sut.rate("ZAR", "PLN") == decimal.Decimal("0.225")
+        assert self._sut.rate("PLN", "ZAR") == 1 / decimal.Decimal("0.225")
+
+    def test_unreachable(self):
+        self._sut.set_quote("EUR", "USD", decimal.Decimal("1.25"))
+
+        assert self._sut.path("EUR", "ZAR") is None
+        assert self._sut.rate("EUR", "ZAR") is None
+
+    def test_rate_change_invalidates_dependent_pairs_only(self):
+        self._sut.set_quote("ZAR", "EUR", decimal.Decimal("0.05"))
+        self._sut.set_quote("EUR", "PLN", decimal.Decimal("4.5"))
+        self._sut.set_quote("USD", "PLN", decimal.Decimal("4"))
+        self._sut.rate("ZAR", "PLN")
+        self._sut.rate("USD", "PLN")
+
+        with mock.patch.object(self._sut, "_find_path") as find_path:
+            self._sut.set_quote("ZAR", "EUR", decimal.Decimal("0.04"))
+
+            assert self._sut.rate("ZAR", "PLN") == decimal.Decimal("0.18")
+            assert self._sut.rate("USD", "PLN") == decimal.Decimal("4")
+            find_path.assert_not_called()
+
+    def test_remove_quote(self):
+        self._sut.set_quote("ZAR", "EUR", decimal.Decimal("0.05"))
+        self._sut.set_quote("EUR", "PLN", decimal.Decimal("4.5"))
+        self._sut.rate("ZAR", "PLN")
+
+        self._sut.set_quote("ZAR", "EUR", None)
+
+        assert self._sut.rate("ZAR", "PLN") is None
+
+    def test_constant_resolution_after_warm_up(self):
+        currencies = [f"C{n:03}" for n in range(300)]
+        for previous, current in zip(currencies, currencies[1:]):
+            self._sut.set_quote(previous, current, decimal.Decimal("1.001"))
+        expected = self._sut.rate(currencies[0], currencies[-1])
+
+        with mock.patch.object(self._sut, "_find_path") as find_path:
+            assert self._sut.rate(currencies[0], currencies[-1]) == expected
+            find_path.assert_not_called()
+
+    def setUp(self):
+        from app.currency_graph import CurrencyGraph
+
+        self._sut = CurrencyGraph()
+
+
+class TestExchangeRateServicePairRates(unittest.TestCase):
+    def test_zar_is_triangulated(self):
+        from app.currency import Currency
+
+        self._service.set_pair_rate(Currency.ZAR, Currency.EUR, decimal.Decimal("0.05"))
+
+        assert self._service.quotation(Currency.ZAR, Currency.EUR) == decimal.Decimal("0.05")
+        assert self._service.quotation(Currency.ZAR, Currency.PLN) == decimal.Decimal("0.2275")
+        assert self._service.quotation(Currency.PLN, Currency.ZAR) == 1 / decimal.Decimal(
+            "0.2275"
+        )
+
+    def test_base_rate_update_reprices_triangulated_pairs(self):
+        from app.currency import Currency
+
+        self._service.set_pair_rate(Currency.ZAR, Currency.EUR, decimal.Decimal("0.05"))
+        self._service.update_rate(Currency.EUR, decimal.Decimal("5"))
+
+        assert self._service.quotation(Currency.ZAR, Currency.PLN) == decimal.Decimal("0.25")
+
+    def test_cash_conversion(self):
+        from app.cash import Cash
+        from app.currency import Currency
+
+        self._service.set_pair_rate(Currency.ZAR, Currency.EUR, decimal.Decimal("0.05"))
+
+        assert Cash("100", Currency.ZAR).to(Currency.EUR) == Cash("5", Currency.EUR)
+
+    def test_removed_pair_raises(self):
+        from app.currency import Currency
+        from app.exceptions import QuotationError
+
+        self._service.set_pair_rate(Currency.ZAR, Currency.EUR, decimal.Decimal("0.05"))
+        self._service.set_pair_rate(Currency.ZAR, Currency.EUR, None)
+
+        with pytest.raises(QuotationError):
+            self._service.quotation(Currency.ZAR, Currency.PLN)
+
+    def setUp(self):
+        from app.exchange_rate import exchange_rate_service
+
+        self._service = exchange_rate_service
+        self._original_rates = dict(self._service.snapshot.rates)
+
+    def tearDown(self):
+        from app.currency import Currency
+
+        self._service.set_pair_rate(Currency.ZAR, Currency.EUR, None)
+        self._service.update_rates(self._original_rates)
@@ -0,0 +1,62 @@
+import decimal
+import unittest
+
+import pytest
+
+
+class TestExchangeRateServiceQuotationMatrix(unittest.TestCase):
+    def test_matches_direct_division(self):
+        from app.currency import Currency
+        from app.rates import RATES
+
+        for origin in Currency:
+            for target in Currency:
+                if RATES[origin] is None or RATES[target] is None:
+                    continue
+                assert self._execute_sut(origin, target) == RATES[origin] / RATES[target]
+
+    def test_update_rate_refreshes_row_and_column(self):
+        from app.currency import Currency
+
+        self._execute_sut(Currency.EUR, Currency.PLN)
+        self._service.update_rate(Currency.EUR, decimal.Decimal("5.0000"))
+
+        assert self._execute_sut(Currency.EUR, Currency.PLN) == decimal.Decimal("5")
+        assert self._execute_sut(Currency.PLN, Currency.EUR) == decimal.Decimal("0.2")
+        assert self._execute_sut(Currency.USD, Currency.PLN) == decimal.Decimal("3.8024")
+
+    def test_update_rate_enables_missing_currency(self):
+        from app.currency import Currency
+        from app.exceptions import QuotationError
+
+        with pytest.raises(QuotationError):
+            self._execute_sut(Currency.ZAR, Currency.PLN)
+
+        self._service.update_rate(Currency.ZAR, decimal.Decimal("0.2500"))
+
+        assert self._execute_sut(Currency.ZAR, Currency.PLN) == decimal.Decimal("0.25")
+
+    def test_update_is_visible_to_other_instances(self):
+        from app.currency import Currency
+        from app.exchange_rate import ExchangeRateService
+
+        other = ExchangeRateService()
+        other.quotation(Currency.EUR, Currency.PLN)
+        self._service.update_rate(Currency.EUR, decimal.Decimal("5.0000"))
+
+        assert other.quotation(Currency.EUR, Currency.PLN) == decimal.Decimal("5")
+
+    def setUp(self):
+        from app.exchange_rate import ExchangeRateService
+        from app.rates import RATES
+
+        self._original_rates = dict(RATES)
+        self._service = ExchangeRateService()
+        self._sut = self._service.quotation
+
+    def tearDown(self):
+        for currency, rate in self._original_rates.items():
+            self._service.update_rate(currency, rate)
+
+    def _execute_sut(self, origin, target):
+        return self._sut(origin, target)
@@ -0,0 +1,94 @@
+import decimal
+import threading
+import unittest
+
+import pytest
+
+
+class TestExchangeRateServiceSnapshot(unittest.TestCase):
+    def test_snapshot_is_immutable(self):
+        from app.currency import Currency
+
+        snapshot = self._service.snapshot
+
+        with pytest.raises(TypeError):
+            snapshot.rates[Currency.EUR] = decimal.Decimal("1")
+        with pytest.raises(AttributeError):
+            snapshot.version = 42
+
+    def test_update_publishes_new_version(self):
+        from app.currency import Currency
+
+        before = self._service.snapshot
+
+        self._service.update_rate(Currency.EUR, decimal.Decimal("5.0000"))
+        after = self._service.snapshot
+
+        assert after.version == before.version + 1
+        assert before.quotation(Currency.EUR, Currency.PLN) == decimal.Decimal("4.55")
+        assert after.quotation(Currency.EUR, Currency.PLN) == decimal.Decimal("5")
+
+    def test_update_rates_publishes_one_version(self):
+        from app.currency import Currency
+
+        before = self._service.snapshot
+
+        after = self._service.update_rates(
+            {Currency.EUR: decimal.Decimal("4"), Currency.USD: decimal.Decimal("2")}
+        )
+
+        assert after.version == before.version + 1
+        assert after.quotation(Currency.EUR, Currency.USD) == decimal.Decimal("2")
+
+    def test_cash_reports_rate_version(self):
+        from app.cash import Cash
+        from app.currency import Currency
+
+        cash = Cash("100", Currency.EUR)
+        converted = cash.to(Currency.PLN)
+
+        assert cash.rate_version is None
+        assert converted.rate_version == self._service.snapshot.version
+
+    def test_readers_never_see_torn_rates(self):
+        from app.currency import Currency
+
+        pairs = [
+            {Currency.EUR: decimal.Decimal("4"), Currency.USD: decimal.Decimal("2")},
+            {Currency.EUR: decimal.Decimal("6"), Currency.USD: decimal.Decimal("3")},
+        ]
+        done = threading.Event()
+        torn = []
+
+        def write():
+            for n in range(2000):
+                self._service.update_rates(pairs[n % 2])
+            done.set()
+
+        def read():
+            while not done.is_set():
+                snapshot = self._service.snapshot
+                rates = snapshot.rates
+                if snapshot.quotation(Currency.EUR, Currency.USD) != 2 or (
+                    rates[Currency.EUR] != 2 * rates[Currency.USD]
+                ):
+                    torn.append(snapshot.version)
+
+        self._service.update_rates(pairs[0])
+        threads = [threading.Thread(target=read) for _ in range(4)]
+        threads.append(threading.Thread(target=write))
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert torn == []
+
+    def setUp(self):
+        from app.exchange_rate import exchange_rate_service
+
+        self._service = exchange_rate_service
+        self._original_rates = dict(self._service.snapshot.rates)
+
+    def tearDown(self):
+        self._service.update_rates(self._original_rates)
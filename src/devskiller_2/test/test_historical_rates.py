@@ -0,0 +1,114 @@
+import datetime
+import decimal
+import os
+import tempfile
+import unittest
+
+import pytest
+
+HISTORY = """timestamp,currency,rate
+2023-01-01,PLN,1.0000
+2023-01-02,EUR,4.6000
+2023-01-05,EUR,4.7000
+2023-01-03T12:00:00,USD,4.0000
+2023-01-10,USD,3.9000
+2023-01-02,ZAR,
+"""
+
+
+class TestHistoricalRateStore(unittest.TestCase):
+    def test_load_csv(self):
+        assert self._count == 6
+
+    def test_quotation_as_of(self):
+        from app.currency import Currency
+
+        assert self._execute_sut(Currency.EUR, Currency.PLN, "2023-01-02") == decimal.Decimal("4.6")
+        assert self._execute_sut(
+            Currency.EUR, Currency.PLN, datetime.date(2023, 1, 4)
+        ) == decimal.Decimal("4.6")
+        assert self._execute_sut(
+            Currency.EUR, Currency.PLN, datetime.datetime(2023, 1, 5)
+        ) == decimal.Decimal("4.7")
+        assert self._execute_sut(
+            Currency.EUR, Currency.USD, "2023-01-20"
+        ) == decimal.Decimal("4.7") / decimal.Decimal("3.9")
+
+    def test_base_currency_needs_no_history(self):
+        from app.currency import Currency
+        from app.historical_rates import HistoricalRateStore
+
+        store = HistoricalRateStore()
+        store.add_rate(Currency.EUR, "2023-01-02", decimal.Decimal("4.6899"))
+        store.add_rate(Currency.EUR, "2023-01-03T12:00:00", decimal.Decimal("4.7011"))
+
+        assert store.quotation(Currency.EUR, Currency.PLN, "2023-01-02") == decimal.Decimal("4.6899")
+        assert store.quotation(Currency.PLN, Currency.PLN, "1999-01-01") == 1
+        assert store.quotations_as_of(
+            Currency.PLN, Currency.EUR, ["2023-01-02", "2023-01-04"]
+        ) == [1 / decimal.Decimal("4.6899"), 1 / decimal.Decimal("4.7011")]
+
+    def test_quotation_before_history(self):
+        from app.currency import Currency
+        from app.exceptions import QuotationError
+
+        with pytest.raises(QuotationError):
+            self._execute_sut(Currency.USD, Currency.PLN, "2023-01-03")
+
+    def test_quotation_missing_rate(self):
+        from app.currency import Currency
+        from app.exceptions import QuotationError
+
+        with pytest.raises(QuotationError):
+            self._execute_sut(Currency.ZAR, Currency.PLN, "2023-02-01")
+        with pytest.raises(QuotationError):
+            self._execute_sut(Currency.GBP, Currency.PLN, "2023-02-01")
+
+    def test_add_rate_overrides_same_timestamp(self):
+        from app.currency import Currency
+
+        self._store.add_rate(Currency.EUR, "2023-01-05", decimal.Decimal("4.8"))
+        self._store.add_rate(Currency.EUR, "2023-01-04", decimal.Decimal("4.65"))
+
+        assert self._execute_sut(Currency.EUR, Currency.PLN, "2023-01-04") == decimal.Decimal("4.65")
+        assert self._execute_sut(Currency.EUR, Currency.PLN, "2023-01-06") == decimal.Decimal("4.8")
+
+    def test_quotations_as_of_matches_scalar(self):
+        from app.currency import Currency
+
+        timestamps = [
+            datetime.datetime(2023, 1, 3, 12) + datetime.timedelta(hours=n)
+            for n in range(0, 24 * 20, 7)
+        ]
+
+        result = self._store.quotations_as_of(Currency.EUR, Currency.USD, timestamps)
+
+        assert result == [
+            self._execute_sut(Currency.EUR, Currency.USD, timestamp)
+            for timestamp in timestamps
+        ]
+
+    def test_quotations_as_of_numpy_datetimes(self):
+        import numpy as np
+        from app.currency import Currency
+
+        timestamps = np.array(["2023-01-04", "2023-01-06"], dtype="datetime64[D]")
+
+        assert self._store.quotations_as_of(Currency.EUR, Currency.PLN, timestamps) == [
+            decimal.Decimal("4.6"),
+            decimal.Decimal("4.7"),
+        ]
+
+    def setUp(self):
+        from app.historical_rates import HistoricalRateStore
+
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as file:
+            file.write(HISTORY)
+        self.addCleanup(os.remove, file.name)
+
+        self._store = HistoricalRateStore()
+        self._count = self._store.load_csv(file.name)
+        self._sut = self._store.quotation
+
+    def _execute_sut(self, origin, target, as_of):
+        return self._sut(origin, target, as_of)
@@ -0,0 +1,70 @@
+import decimal
+import unittest
+from unittest import mock
+
+
+class TestLedger(unittest.TestCase):
+    def test_totals_by_currency(self):
+        from app.cash import Cash
+        from app.currency import Currency
+
+        ledger = self._execute_sut(
+            [Cash("10", Currency.PLN), Cash("5", Currency.EUR), Cash("2.5", Currency.EUR)]
+        )
+
+        assert ledger.totals_by_currency() == {
+            Currency.PLN: Cash("10", Currency.PLN),
+            Currency.EUR: Cash("7.5", Currency.EUR),
+        }
+
+    def test_total_in_target_currency(self):
+        from app.cash import Cash
+        from app.currency import Currency
+
+        ledger = self._execute_sut(
+            [Cash("10", Currency.PLN), Cash("5", Currency.EUR), Cash("2.5", Currency.EUR)]
+        )
+
+        total = ledger.total(Currency.PLN)
+
+        assert total.currency == Currency.PLN
+        assert total.amount == decimal.Decimal("44.1250")
+
+    def test_converts_once_per_currency(self):
+        from app.cash import Cash
+        from app.currency import Currency
+        from app.exchange_rate import RateSnapshot
+
+        ledger = self._execute_sut(
+            [Cash(str(n), currency) for n in range(100) for currency in Currency
+             if currency != Currency.ZAR]
+        )
+
+        with mock.patch.object(
+            RateSnapshot, "quotation", autospec=True, side_effect=RateSnapshot.quotation
+        ) as quotation:
+            ledger.total(Currency.EUR)
+
+        assert quotation.call_count == len(ledger) - 1
+
+    def test_remove(self):
+        from app.cash import Cash
+        from app.currency import Currency
+
+        ledger = self._execute_sut([Cash("10", Currency.PLN), Cash("5", Currency.EUR)])
+
+        ledger.remove(Cash("5", Currency.EUR))
+        ledger.remove(Cash("2", Currency.PLN))
+
+        assert ledger.totals_by_currency() == {Currency.PLN: Cash("8", Currency.PLN)}
+        assert len(ledger) == 1
+
+    def test_empty_total(self):
+        from app.currency import Currency
+
+        assert self._execute_sut([]).total(Currency.USD).amount == decimal.Decimal("0")
+
+    def _execute_sut(self, values):
+        from app.ledger import Ledger
+
+        return Ledger(values)
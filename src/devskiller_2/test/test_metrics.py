@@ -0,0 +1,121 @@
+import math
+import unittest
+
+import pytest
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    def test_counts_quotations_per_pair(self):
+        from app.currency import Currency
+        from app.exchange_rate import exchange_rate_service
+
+        for _ in range(3):
+            exchange_rate_service.quotation(Currency.EUR, Currency.PLN)
+        exchange_rate_service.quotation(Currency.USD, Currency.GBP)
+
+        assert self._sut.snapshot().quotations == {("EUR", "PLN"): 3, ("USD", "GBP"): 1}
+
+    def test_counts_quotations_of_conversions(self):
+        from app.cash import Cash
+        from app.cash_array import CashArray
+        from app.currency import Currency
+
+        for _ in range(5):
+            Cash("10", Currency.EUR).to(Currency.PLN)
+        CashArray(["1", "2"], [Currency.USD, Currency.USD]).to(Currency.GBP)
+
+        snapshot = self._sut.snapshot()
+        assert snapshot.quotations == {("EUR", "PLN"): 5, ("USD", "GBP"): 1}
+        assert snapshot.quotations_per_second > 0
+
+    def test_records_conversion_latency(self):
+        from app.cash import Cash
+        from app.currency import Currency
+
+        for _ in range(10):
+            Cash("10", Currency.EUR).to(Currency.PLN)
+        Cash("10", Currency.EUR).to(Currency.EUR)
+
+        snapshot = self._sut.snapshot()
+        latency = snapshot.conversion_latency
+        assert snapshot.conversions == {("EUR", "PLN"): 10}
+        assert latency.count == sum(latency.counts) == 10
+        assert 0 < latency.quantile(0.5) <= latency.quantile(0.99)
+
+    def test_counts_errors(self):
+        from app.cash import Cash
+        from app.currency import Currency
+        from app.exceptions import QuotationError
+        from app.exchange_rate import exchange_rate_service
+
+        with pytest.raises(QuotationError):
+            Cash("10", Currency.ZAR).to(Currency.PLN)
+        with pytest.raises(QuotationError):
+            exchange_rate_service.quotation(Currency.PLN, Currency.ZAR)
+
+        snapshot = self._sut.snapshot()
+        assert snapshot.errors == {"QuotationError": 2}
+        assert snapshot.conversions == {("ZAR", "PLN"): 1}
+        assert snapshot.quotations == {("ZAR", "PLN"): 1, ("PLN", "ZAR"): 1}
+
+    def test_reports_conversion_cache(self):
+        from app.cash import Cash, disable_conversion_cache, enable_conversion_cache
+        from app.currency import Currency
+
+        enable_conversion_cache()
+        self.addCleanup(disable_conversion_cache)
+        for _ in range(4):
+            Cash("10", Currency.EUR).to(Currency.PLN)
+
+        stats = self._sut.snapshot().caches["conversion"]
+        assert (stats.hits, stats.misses) == (3, 1)
+        assert stats.hit_ratio == 0.75
+
+    def test_prometheus_text(self):
+        from app.cash import Cash
+        from app.currency import Currency
+
+        Cash("10", Currency.EUR).to(Currency.PLN)
+
+        text = self._sut.to_prometheus()
+
+        assert "# TYPE cash_conversions_total counter\n" in text
+        assert 'cash_conversions_total{origin="EUR",target="PLN"} 1\n' in text
+        assert 'cash_conversion_latency_seconds_bucket{le="+Inf"} 1\n' in text
+        assert "cash_conversion_latency_seconds_count 1\n" in text
+
+    def test_disabled(self):
+        from app import metrics
+        from app.cash import Cash
+        from app.currency import Currency
+
+        metrics.disable_metrics()
+        Cash("10", Currency.EUR).to(Currency.PLN)
+
+        assert metrics.registry is None
+        assert self._sut.snapshot().conversions == {}
+
+    def setUp(self):
+        from app.metrics import disable_metrics, enable_metrics
+
+        self._sut = enable_metrics()
+        self.addCleanup(disable_metrics)
+
+
+class TestHistogramQuantile(unittest.TestCase):
+    def test_interpolates_within_bucket(self):
+        from app.metrics import Histogram
+
+        histogram = Histogram([1.0, 2.0, 4.0])
+        for value in (0.5, 1.5, 1.5, 3.0):
+            histogram.observe(value)
+        snapshot = histogram.snapshot()
+
+        assert snapshot.counts == (1, 2, 1, 0)
+        assert snapshot.quantile(0.5) == pytest.approx(1.5)
+        assert snapshot.quantile(1.0) == pytest.approx(4.0)
+
+    def test_empty(self):
+        from app.metrics import Histogram
+
+        assert math.isnan(Histogram().snapshot().quantile(0.99))
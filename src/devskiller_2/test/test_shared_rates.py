@@ -0,0 +1,147 @@
+import decimal
+import multiprocessing
+import threading
+import unittest
+
+import pytest
+
+
+def _update_in_child(name, lock, currency, rate):
+    from app.shared_rates import SharedRateTable
+
+    table = SharedRateTable.attach(name, lock)
+    table.update({currency: rate})
+    table.close()
+
+
+class TestSharedRateTable(unittest.TestCase):
+    def test_round_trip(self):
+        from app.currency import Currency
+        from app.rates import RATES
+
+        sequence, rates = self._sut.read()
+
+        assert sequence % 2 == 0
+        assert rates == RATES
+        assert rates[Currency.ZAR] is None
+
+    def test_update(self):
+        from app.currency import Currency
+
+        before = self._sut.sequence
+        after = self._sut.update(
+            {Currency.EUR: decimal.Decimal("4.123456789"), Currency.USD: None}
+        )
+        _, rates = self._sut.read()
+
+        assert after == before + 2 == self._sut.sequence
+        assert rates[Currency.EUR] == decimal.Decimal("4.123456789")
+        assert rates[Currency.USD] is None
+        assert rates[Currency.GBP] == decimal.Decimal("5.25")
+
+    def test_rejects_unrepresentable_rate(self):
+        from app.currency import Currency
+
+        with pytest.raises(ValueError):
+            self._sut.update({Currency.EUR: decimal.Decimal("1.00000000000000000001")})
+        with pytest.raises(ValueError):
+            self._sut.update({Currency.EUR: decimal.Decimal("NaN")})
+
+    def test_update_from_another_process(self):
+        from app.currency import Currency
+
+        context = multiprocessing.get_context()
+        child = context.Process(
+            target=_update_in_child,
+            args=(self._sut.name, self._lock, Currency.EUR, decimal.Decimal("4.75")),
+        )
+        child.start()
+        child.join()
+
+        assert child.exitcode == 0
+        assert self._sut.read()[1][Currency.EUR] == decimal.Decimal("4.75")
+
+    def test_readers_never_see_torn_rates(self):
+        from app.currency import Currency
+
+        pairs = [
+            {Currency.EUR: decimal.Decimal("4"), Currency.USD: decimal.Decimal("2")},
+            {Currency.EUR: decimal.Decimal("6"), Currency.USD: decimal.Decimal("3")},
+        ]
+        done = threading.Event()
+
+        def write():
+            for index in range(2000):
+                self._sut.update(pairs[index % 2])
+            done.set()
+
+        writer = threading.Thread(target=write)
+        writer.start()
+        ratios = set()
+        while not done.is_set():
+            _, rates = self._sut.read()
+            ratios.add(rates[Currency.EUR] / rates[Currency.USD])
+        writer.join()
+
+        assert ratios <= {decimal.Decimal("2"), decimal.Decimal("4.55") / decimal.Decimal("3.8024")}
+
+    def setUp(self):
+        from app.rates import RATES
+        from app.shared_rates import SharedRateTable
+
+        self._lock = multiprocessing.Lock()
+        self._sut = SharedRateTable.create(RATES, lock=self._lock)
+        self.addCleanup(self._sut.unlink)
+        self.addCleanup(self._sut.close)
+
+
+class TestExchangeRateServiceSharedRates(unittest.TestCase):
+    def test_sees_updates_of_other_processes(self):
+        from app.currency import Currency
+
+        before = self._sut.snapshot
+        other_process = self._attach()
+        other_process.update({Currency.EUR: decimal.Decimal("5")})
+        after = self._sut.snapshot
+
+        assert after.version == before.version + 1
+        assert after.quotation(Currency.EUR, Currency.PLN) == decimal.Decimal("5")
+        assert self._sut.snapshot is after
+
+    def test_update_rate_writes_to_table(self):
+        from app.currency import Currency
+
+        self._sut.update_rate(Currency.USD, decimal.Decimal("4"))
+
+        assert self._attach().read()[1][Currency.USD] == decimal.Decimal("4")
+        assert self._sut.quotation(Currency.USD, Currency.PLN) == decimal.Decimal("4")
+
+    def test_cash_conversion_follows_table(self):
+        from app.cash import Cash
+        from app.currency import Currency
+
+        self._attach().update({Currency.EUR: decimal.Decimal("5")})
+
+        assert Cash("100", Currency.EUR).to(Currency.PLN) == Cash("500", Currency.PLN)
+
+    def setUp(self):
+        from app.exchange_rate import ExchangeRateService
+        from app.rates import RATES
+        from app.shared_rates import SharedRateTable
+
+        self._table = SharedRateTable.create(RATES)
+        self.addCleanup(self._table.unlink)
+        self.addCleanup(self._table.close)
+
+        self._sut = ExchangeRateService()
+        original = dict(self._sut.snapshot.rates)
+        self._sut.use_shared_rates(self._table)
+        self.addCleanup(self._sut.update_rates, original)
+        self.addCleanup(self._sut.use_shared_rates, None)
+
+    def _attach(self):
+        from app.shared_rates import SharedRateTable
+
+        table = SharedRateTable.attach(self._table.name)
+        self.addCleanup(table.close)
+        return table
@@ -1,4 +1,6 @@
+import asyncio
 import decimal
+import threading
 import unittest
 
 
@@ -51,6 +53,113 @@ class TestTargetCurrencyContextManager(unittest.TestCase):
         assert value.currency == Currency.EUR
         assert value.amount < 22
 
+    def test_nested_scopes_restore_outer(self):
+        from app.currency import Currency
+
+        with self._sut(Currency.EUR):
+            with self._sut(Currency.USD):
+                assert self._sut.get_target_currency() == Currency.USD
+            assert self._sut.get_target_currency() == Currency.EUR
+        assert self._sut.get_target_currency() is None
+
+    def test_threads_are_isolated(self):
+        from app.currency import Currency
+
+        barrier = threading.Barrier(len(Currency))
+        seen = {}
+
+        def worker(currency):
+            with self._sut(currency):
+                barrier.wait()
+                seen[currency] = self._sut.get_target_currency()
+
+        threads = [threading.Thread(target=worker, args=(currency,)) for currency in Currency]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert seen == {currency: currency for currency in Currency}
+        assert self._sut.get_target_currency() is None
+
+    def test_tasks_are_isolated(self):
+        from app.currency import Currency
+        from app.cash import Cash
+
+        async def convert(currency):
+            with self._sut(currency):
+                await asyncio.sleep(0)
+                result = Cash("10", Currency.PLN) + Cash("15", Currency.PLN)
+                await asyncio.sleep(0)
+                return result.currency, self._sut.get_target_currency()
+
+        async def main():
+            currencies = [Currency.EUR, Currency.USD, Currency.GBP] * 10
+            return currencies, await asyncio.gather(*map(convert, currencies))
+
+        currencies, results = asyncio.run(main())
+
+        assert results == [(currency, currency) for currency in currencies]
+
+    def test_shared_instance_across_tasks(self):
+        from app.currency import Currency
+
+        shared = self._sut(Currency.EUR)
+
+        async def job(delay):
+            with shared:
+                await asyncio.sleep(delay)
+                return self._sut.get_target_currency()
+
+        async def main():
+            # The first task to enter is the first to leave.
+            return await asyncio.gather(job(0.01), job(0.02))
+
+        assert asyncio.run(main()) == [Currency.EUR, Currency.EUR]
+        assert self._sut.get_target_currency() is None
+
+    def test_shared_instance_across_threads(self):
+        from app.currency import Currency
+
+        shared = self._sut(Currency.EUR)
+        first_entered, second_entered, first_left = (
+            threading.Event(),
+            threading.Event(),
+            threading.Event(),
+        )
+        seen = []
+        errors = []
+
+        def first():
+            try:
+                with shared:
+                    first_entered.set()
+                    second_entered.wait(5)
+            except Exception as error:
+                errors.append(error)
+            finally:
+                first_left.set()
+
+        def second():
+            try:
+                first_entered.wait(5)
+                with shared:
+                    second_entered.set()
+                    first_left.wait(5)
+                    seen.append(self._sut.get_target_currency())
+                seen.append(self._sut.get_target_currency())
+            except Exception as error:
+                errors.append(error)
+
+        threads = [threading.Thread(target=first), threading.Thread(target=second)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        assert seen == [Currency.EUR, None]
+
     def setUp(self):
         from app.cash import TargetCurrency
 